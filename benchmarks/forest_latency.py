@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Latency comparison: sklearn predict_proba vs FlatForest (float64/float32)
+for batch sizes 1 .. 100k.
+
+    PYTHONPATH=. python benchmarks/forest_latency.py [--model models/credit_model.pkl]
+
+Without --model (or if it can't be loaded) a model is trained on the
+built-in synthetic data.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.ml.credit_model import CreditScoringModel, create_sample_application
+from src.ml.forest import FlatForest
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+
+def _load(model_path: str | None) -> CreditScoringModel:
+    m = CreditScoringModel()
+    if model_path:
+        try:
+            m.load_model(model_path)
+            return m
+        except Exception as e:
+            print(f"Could not load {model_path} ({e}); training on synthetic data")
+    m.train_with_data()
+    return m
+
+
+def _time(fn, X, min_time: float = 0.5, max_reps: int = 200) -> float:
+    """Median seconds per call."""
+    fn(X)  # warm-up
+    samples, start = [], time.perf_counter()
+    while len(samples) < max_reps and (time.perf_counter() - start < min_time or len(samples) < 3):
+        t0 = time.perf_counter()
+        fn(X)
+        samples.append(time.perf_counter() - t0)
+    return float(np.median(samples))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--model", default=None)
+    ap.add_argument("--max-batch", type=int, default=BATCH_SIZES[-1])
+    args = ap.parse_args()
+
+    m = _load(args.model)
+    rng = np.random.default_rng(0)
+    base = create_sample_application()
+    n_max = args.max_batch
+    rows = [
+        {**base,
+         "grade": "ABCDEFG"[i % 7],
+         "dti": float(rng.uniform(0, 50)),
+         "payment_inc_ratio": float(rng.uniform(0, 20)),
+         "revol_util": float(rng.uniform(0, 100))}
+        for i in range(min(n_max, 10_000))
+    ]
+    X_pool = m.preprocess_many(rows)
+    X_all = np.resize(X_pool, (n_max, X_pool.shape[1]))
+
+    sk = m.model
+    flat64 = FlatForest.from_sklearn(sk, precision="float64")
+    flat32 = FlatForest.from_sklearn(sk, precision="float32")
+    backends = {
+        "sklearn": lambda X: sk.predict_proba(X)[:, 1],
+        "flat64": flat64.predict_positive,
+        "flat32": flat32.predict_positive,
+    }
+
+    print(f"{'batch':>8} " + " ".join(f"{name:>14}" for name in backends) + "   (ms/call)")
+    for n in (b for b in BATCH_SIZES if b <= n_max):
+        X = X_all[:n]
+        timings = [_time(fn, X) * 1e3 for fn in backends.values()]
+        print(f"{n:>8} " + " ".join(f"{t:>14.3f}" for t in timings))
+    err = np.max(np.abs(flat32.predict_positive(X_pool) - sk.predict_proba(X_pool)[:, 1]))
+    print(f"max |flat32 - sklearn| = {err:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Throughput of /predict under the prefork launcher for 1..N workers.
+
+For each worker count the launcher (python -m src.api.prefork) is started on
+a free port, a pool of keep-alive client threads posts distinct applications
+for --seconds, and requests/s plus each worker's private/shared memory (from
+GET /workers) are recorded. Near-linear scaling needs at least as many free
+cores as workers, plus some for the client.
+
+    PYTHONPATH=. python benchmarks/prefork_scaling.py --model models/credit_model.pkl \\
+        --workers 1 2 4 --clients 16 --seconds 10 --out prefork.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from src.ml.credit_model import create_sample_application
+
+
+def _free_port() -> int:
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def _rows(n: int) -> list:
+    rng = np.random.default_rng(0)
+    base = create_sample_application()
+    rows = []
+    for _ in range(n):
+        r = dict(base)
+        r["annual_inc"] = float(rng.uniform(20_000, 250_000))
+        r["loan_amnt"] = float(rng.uniform(1_000, 40_000))
+        r["dti"] = float(rng.uniform(0, 40))
+        rows.append(json.dumps(r).encode())
+    return rows
+
+
+def _wait_ready(port: int, workers: int, timeout: float = 120) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/workers")
+            table = json.loads(conn.getresponse().read())["workers"]
+            conn.close()
+            if len(table) == workers and all(w["state"] == "ready" for w in table):
+                return table
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{workers} workers not ready after {timeout} s")
+
+
+def _drive(port: int, rows: list, clients: int, seconds: float) -> dict:
+    stop = time.monotonic() + seconds
+    counts, errors, lat = [0] * clients, [0] * clients, [[] for _ in range(clients)]
+
+    def client(i: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        headers = {"Content-Type": "application/json"}
+        k = i
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            conn.request("POST", "/predict", rows[k % len(rows)], headers)
+            resp = conn.getresponse()
+            resp.read()
+            lat[i].append(time.perf_counter() - t0)
+            if resp.status == 200:
+                counts[i] += 1
+            else:
+                errors[i] += 1
+            k += clients
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    all_lat = np.concatenate([np.asarray(x) for x in lat if x]) * 1e3
+    return {"requests": sum(counts), "errors": sum(errors), "rps": sum(counts) / elapsed,
+            "p50_ms": float(np.percentile(all_lat, 50)), "p95_ms": float(np.percentile(all_lat, 95))}
+
+
+def run(workers: int, args, rows: list) -> dict:
+    port = _free_port()
+    env = {**os.environ, "PYTHONPATH": ".", "PREDICT_CACHE_SIZE": os.environ.get("PREDICT_CACHE_SIZE", "0")}
+    if args.model:
+        env["MODEL_PATH"] = args.model
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.api.prefork", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, start_new_session=True,
+    )
+    try:
+        _wait_ready(port, workers)
+        _drive(port, rows, args.clients, min(2.0, args.seconds))  # warm-up
+        result = _drive(port, rows, args.clients, args.seconds)
+        table = _wait_ready(port, workers)
+        result["workers"] = workers
+        result["private_kb"] = [w.get("private_kb") for w in table]
+        result["shared_kb"] = [w.get("shared_kb") for w in table]
+        return result
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(60)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Prefork /predict throughput scaling")
+    ap.add_argument("--model", default=os.environ.get("MODEL_PATH"))
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--clients", type=int, default=16)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args(argv)
+
+    rows = _rows(2_000)
+    results = []
+    for n in args.workers:
+        r = run(n, args, rows)
+        base = results[0]["rps"] / results[0]["workers"] if results else r["rps"] / n
+        r["scaling_efficiency"] = r["rps"] / (base * n)
+        results.append(r)
+        print(f"workers={n:<3d} {r['rps']:8.1f} req/s  p50 {r['p50_ms']:6.1f} ms  "
+              f"p95 {r['p95_ms']:6.1f} ms  efficiency {r['scaling_efficiency']:.2f}  "
+              f"private/shared MB per worker "
+              f"{np.mean(r['private_kb']) / 1024:.0f}/{np.mean(r['shared_kb']) / 1024:.0f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"cpu_count": os.cpu_count(), "platform": platform.platform(),
+                       "clients": args.clients, "seconds": args.seconds, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
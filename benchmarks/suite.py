@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Scoring-path benchmark suite with regression gates.
+
+Cases: CreditScoringModel.preprocess, predict and explain_prediction (single
+row, or the *_many variant for batches), load_model, and /predict,
+/predict_fast, /predict_loan and /predict_simple end to end through the ASGI
+app in-process.
+Each case runs over batch sizes and concurrency levels (threads for model
+calls, in-flight requests for the API) and records p50/p95/p99 latency per
+call and throughput in rows/s.
+
+    PYTHONPATH=. python benchmarks/suite.py --out bench.json [--model models/credit_model.pkl]
+    PYTHONPATH=. python benchmarks/suite.py --out new.json --baseline bench.json --tolerance 0.2
+    PYTHONPATH=. python benchmarks/suite.py --compare bench.json new.json
+
+With --baseline (or --compare) a case regresses when its p50 or p95 is more
+than tolerance above the baseline, or its throughput more than tolerance
+below it; the exit status is then 1. Rows are drawn from a pool of distinct
+applications and the API's prediction cache is off (PREDICT_CACHE_SIZE=0
+unless set), so cache hits don't flatter the numbers.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.ml.credit_model import CreditScoringModel, create_sample_application
+
+# case -> (batch sizes, concurrency levels)
+CASES = {
+    "preprocess": ([1, 100, 10_000], [1, 4]),
+    "predict": ([1, 100, 10_000], [1, 4]),
+    "explain": ([1, 10, 100], [1, 4]),
+    "load_model": ([1], [1]),
+    "api_predict": ([1], [1, 8, 32]),
+    "api_predict_fast": ([1], [1, 8, 32]),
+    "api_predict_loan": ([1], [1, 8, 32]),
+    "api_predict_simple": ([1], [1, 8, 32]),
+}
+GATED_METRICS = ("p50_ms", "p95_ms")
+
+
+def make_rows(n: int, seed: int = 0) -> list[dict]:
+    """n distinct, API-valid applications."""
+    rng = np.random.default_rng(seed)
+    base = create_sample_application()
+    return [
+        {**base,
+         "grade": "ABCDEFG"[i % 7],
+         "home_ownership": ("RENT", "OWN", "MORTGAGE")[i % 3],
+         "sub_grade_num": int(rng.integers(1, 6)),
+         "dti": float(rng.uniform(0, 50)),
+         "payment_inc_ratio": float(rng.uniform(0, 20)),
+         "revol_util": float(rng.uniform(0, 100))}
+        for i in range(n)
+    ]
+
+
+def summarize(latencies: list, rows: int, wall: float) -> dict:
+    """Percentiles (ms per call) and throughput (rows/s) for one case."""
+    ms = np.asarray(latencies, dtype=np.float64) * 1e3
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "calls": int(ms.size),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "mean_ms": float(ms.mean()),
+        "throughput_rows_per_s": rows / wall if wall > 0 else 0.0,
+    }
+
+
+# ------------------------------------------------------------------------- #
+# Runners
+# ------------------------------------------------------------------------- #
+def run_sync(fn, args_for, batch: int, concurrency: int, min_time: float,
+             max_calls: int = 10_000) -> dict:
+    """
+    Call fn(args_for(i)) from `concurrency` threads until min_time has passed
+    (at least 3 calls per thread); each call handles `batch` rows.
+    """
+    fn(args_for(0))  # warm-up
+    lock = threading.Lock()
+    latencies: list = []
+    deadline = time.perf_counter() + min_time
+
+    def worker(w: int) -> None:
+        i, local = w, []
+        while (len(local) < 3 or time.perf_counter() < deadline) and len(local) < max_calls:
+            arg = args_for(i)
+            t0 = time.perf_counter()
+            fn(arg)
+            local.append(time.perf_counter() - t0)
+            i += concurrency
+        with lock:
+            latencies.extend(local)
+
+    t0 = time.perf_counter()
+    if concurrency == 1:
+        worker(0)
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - t0
+    return summarize(latencies, len(latencies) * batch, wall)
+
+
+async def _run_api(app, path: str, payloads: list, concurrency: int, min_time: float) -> dict:
+    import httpx
+
+    latencies: list = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post(path, json=payloads[0])  # warm-up
+        r.raise_for_status()
+        deadline = time.perf_counter() + min_time
+
+        async def worker(w: int) -> None:
+            i, done = w, 0
+            while done < 3 or time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                r = await client.post(path, json=payloads[i % len(payloads)])
+                latencies.append(time.perf_counter() - t0)
+                if r.status_code != 200:
+                    raise RuntimeError(f"{path} -> {r.status_code}: {r.text[:200]}")
+                i += concurrency
+                done += 1
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(w) for w in range(concurrency)))
+        wall = time.perf_counter() - t0
+    return summarize(latencies, len(latencies), wall)
+
+
+def _api_payloads(rows: list[dict]) -> dict:
+    rng = np.random.default_rng(1)
+    return {
+        "api_predict": ("/predict", rows),
+        "api_predict_fast": ("/predict_fast", rows),
+        "api_predict_loan": ("/predict_loan", [
+            {**r, "loan_amount": float(rng.uniform(1_000, 40_000)), "term": 36,
+             "monthly_income": float(rng.uniform(2_000, 15_000))} for r in rows
+        ]),
+        "api_predict_simple": ("/predict_simple", [
+            {"age": 35, "income": float(rng.uniform(20_000, 200_000)),
+             "loan_amount": float(rng.uniform(1_000, 40_000)),
+             "credit_score": int(rng.integers(500, 850))} for _ in rows
+        ]),
+    }
+
+
+def run_suite(model_path: str, cases: list | None = None, min_time: float = 1.0,
+              batches: list | None = None, concurrency: list | None = None,
+              progress=None) -> dict:
+    """Run the selected cases; returns {"meta", "results"}."""
+    cases = list(cases or CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown cases: {sorted(unknown)}")
+
+    def grid(case):
+        # load_model is a single call; API routes take one application each
+        b, c = CASES[case]
+        if batches and b != [1]:
+            b = batches
+        if concurrency and case != "load_model":
+            c = concurrency
+        return [(bi, ci) for bi in b for ci in c]
+
+    model = CreditScoringModel()
+    model.load_model(model_path)
+    pool = make_rows(max(max(b for b, _ in grid(c)) for c in cases))
+    results = []
+
+    def record(case, batch, conc, stats):
+        entry = {"case": case, "batch": batch, "concurrency": conc, **stats}
+        results.append(entry)
+        if progress is not None:
+            progress(entry)
+
+    def slices(batch):
+        if batch == 1:
+            return lambda i: pool[i % len(pool)]
+        starts = len(pool) - batch + 1
+        return lambda i: pool[(i * batch) % starts:(i * batch) % starts + batch]
+
+    model_fns = {
+        "preprocess": (model.preprocess, model.preprocess_many),
+        "predict": (model.predict, model.predict_many),
+        "explain": (model.explain_prediction, model.explain_many),
+    }
+    for case in cases:
+        if case in model_fns:
+            single, many = model_fns[case]
+            for batch, conc in grid(case):
+                fn = single if batch == 1 else many
+                record(case, batch, conc, run_sync(fn, slices(batch), batch, conc, min_time))
+        elif case == "load_model":
+            def load(_):
+                CreditScoringModel().load_model(model_path)
+            record(case, 1, 1, run_sync(load, lambda i: None, 1, 1, min_time))
+
+    api_cases = [c for c in cases if c.startswith("api_")]
+    if api_cases:
+        for case, batch, conc, stats in _run_api_cases(model_path, api_cases, grid, pool, min_time):
+            record(case, batch, conc, stats)
+
+    return {"meta": _meta(model_path, min_time), "results": results}
+
+
+def _run_api_cases(model_path: str, cases: list, grid, rows: list, min_time: float):
+    import src.api.server as server
+
+    payloads = _api_payloads(rows)
+    saved = server.MODEL_PATH, server.PREDICT_CACHE_SIZE
+    server.MODEL_PATH = model_path
+    server.PREDICT_CACHE_SIZE = int(os.environ.get("PREDICT_CACHE_SIZE", "0"))
+
+    async def run_all():
+        out = []
+        async with server.app.router.lifespan_context(server.app):
+            for case in cases:
+                path, bodies = payloads[case]
+                for batch, conc in grid(case):
+                    out.append((case, batch, conc,
+                                await _run_api(server.app, path, bodies, conc, min_time)))
+        return out
+
+    try:
+        return asyncio.run(run_all())
+    finally:
+        server.MODEL_PATH, server.PREDICT_CACHE_SIZE = saved
+
+
+def _meta(model_path: str, min_time: float) -> dict:
+    import sklearn
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "model": model_path,
+        "min_time_s": min_time,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# ------------------------------------------------------------------------- #
+# Regression gate
+# ------------------------------------------------------------------------- #
+def compare(baseline: dict, current: dict, tolerance: float = 0.2) -> list[dict]:
+    """
+    Cases in both reports whose gated latencies grew, or throughput fell, by
+    more than tolerance (a fraction). Returns one dict per regressed metric.
+    """
+    key = lambda r: (r["case"], r["batch"], r["concurrency"])  # noqa: E731
+    base = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        checks = [(m, r[m] > b[m] * (1 + tolerance)) for m in GATED_METRICS]
+        checks.append(("throughput_rows_per_s",
+                       r["throughput_rows_per_s"] * (1 + tolerance) < b["throughput_rows_per_s"]))
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append({
+                    "case": r["case"], "batch": r["batch"], "concurrency": r["concurrency"],
+                    "metric": metric, "baseline": b[metric], "current": r[metric],
+                    "change": r[metric] / b[metric] - 1 if b[metric] else float("inf"),
+                })
+    return regressions
+
+
+def format_results(report: dict) -> str:
+    lines = [f"{'case':<20} {'batch':>6} {'conc':>5} {'calls':>7} {'p50 ms':>9} "
+             f"{'p95 ms':>9} {'p99 ms':>9} {'rows/s':>11}"]
+    for r in report["results"]:
+        lines.append(
+            f"{r['case']:<20} {r['batch']:>6} {r['concurrency']:>5} {r['calls']:>7} "
+            f"{r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} "
+            f"{r['throughput_rows_per_s']:>11,.0f}"
+        )
+    return "\n".join(lines)
+
+
+def format_regressions(regressions: list[dict], tolerance: float) -> str:
+    if not regressions:
+        return f"No regressions (tolerance {tolerance:.0%})"
+    lines = [f"{len(regressions)} regression(s) beyond {tolerance:.0%}:"]
+    for g in regressions:
+        lines.append(
+            f"  {g['case']} batch={g['batch']} conc={g['concurrency']} {g['metric']}: "
+            f"{g['baseline']:.4g} -> {g['current']:.4g} ({g['change']:+.0%})"
+        )
+    return "\n".join(lines)
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(x) for x in text.split(",") if x]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--model", default=None,
+                    help="model to benchmark (default: train one on the synthetic data)")
+    ap.add_argument("--out", default=None, help="write results JSON here")
+    ap.add_argument("--baseline", default=None, help="results JSON to gate against")
+    ap.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                    help="only compare two results files")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown (fraction)")
+    ap.add_argument("--only", default="", help=f"comma-separated cases: {', '.join(CASES)}")
+    ap.add_argument("--batches", type=_int_list, default=None, help="override batch sizes")
+    ap.add_argument("--concurrency", type=_int_list, default=None, help="override concurrency")
+    ap.add_argument("--min-time", type=float, default=1.0, help="seconds per case")
+    ap.add_argument("--quick", action="store_true", help="short smoke run (--min-time 0.2)")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.tolerance)
+        print(format_regressions(regressions, args.tolerance))
+        return 1 if regressions else 0
+
+    model_path = args.model
+    if model_path is None:
+        m = CreditScoringModel()
+        m.train_with_data()
+        model_path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "model.pkl")
+        m.save_model(model_path)
+
+    report = run_suite(
+        model_path,
+        cases=[c for c in args.only.split(",") if c] or None,
+        min_time=0.2 if args.quick else args.min_time,
+        batches=args.batches,
+        concurrency=args.concurrency,
+        progress=lambda r: print(f"  {r['case']} batch={r['batch']} conc={r['concurrency']}: "
+                                 f"p50 {r['p50_ms']:.3f} ms", file=sys.stderr),
+    )
+    print(format_results(report))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        print(format_regressions(regressions, args.tolerance))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Latency comparison: shap.TreeExplainer vs native TreeShap (float64/float32)
+for 1 .. 1000 rows, with the max deviation from shap.
+
+    PYTHONPATH=. python benchmarks/treeshap_latency.py [--model models/credit_model.pkl]
+
+Without --model (or if it can't be loaded) a model is trained on the
+built-in synthetic data.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.forest_latency import _load
+from src.ml.credit_model import create_sample_application
+from src.ml.treeshap import TreeShap
+
+BATCH_SIZES = [1, 10, 100, 1_000]
+
+
+def _time(fn, X, min_time: float = 1.0, max_reps: int = 20) -> float:
+    """Median seconds per call (a single timed call for slow cases)."""
+    fn(X[:1])  # warm-up
+    samples, start = [], time.perf_counter()
+    while len(samples) < max_reps and (time.perf_counter() - start < min_time or not samples):
+        t0 = time.perf_counter()
+        fn(X)
+        samples.append(time.perf_counter() - t0)
+    return float(np.median(samples))
+
+
+def main():
+    import shap
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--model", default=None)
+    ap.add_argument("--max-batch", type=int, default=BATCH_SIZES[-1])
+    args = ap.parse_args()
+
+    m = _load(args.model)
+    rng = np.random.default_rng(0)
+    base = create_sample_application()
+    rows = [
+        {**base,
+         "grade": "ABCDEFG"[i % 7],
+         "dti": float(rng.uniform(0, 50)),
+         "payment_inc_ratio": float(rng.uniform(0, 20)),
+         "revol_util": float(rng.uniform(0, 100))}
+        for i in range(args.max_batch)
+    ]
+    X_all = m.preprocess_many(rows)
+
+    t0 = time.perf_counter()
+    native64 = TreeShap.from_sklearn(m.model)
+    build_ms = (time.perf_counter() - t0) * 1e3
+    native32 = TreeShap.from_sklearn(m.model, dtype=np.float32)
+    explainer = shap.TreeExplainer(m.model)
+    backends = {
+        "shap": lambda X: explainer.shap_values(X, check_additivity=False)[1],
+        "treeshap64": native64.shap_values,
+        "treeshap32": native32.shap_values,
+    }
+
+    print(f"TreeShap build: {build_ms:.0f} ms, {native64.n_points} quadrature points")
+    print(f"{'rows':>8} " + " ".join(f"{name:>14}" for name in backends) + "   (ms/call)")
+    for n in (b for b in BATCH_SIZES if b <= args.max_batch):
+        X = X_all[:n]
+        timings = [_time(fn, X) * 1e3 for fn in backends.values()]
+        print(f"{n:>8} " + " ".join(f"{t:>14.1f}" for t in timings))
+
+    X = X_all[:100]
+    ref = backends["shap"](X)
+    for name in ("treeshap64", "treeshap32"):
+        print(f"max |{name} - shap| = {np.max(np.abs(backends[name](X) - ref)):.2e}")
+
+
+if __name__ == "__main__":
+    main()
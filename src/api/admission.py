@@ -0,0 +1,200 @@
+# src/api/admission.py
+"""
+Admission control for the scoring routes.
+
+Each limited route has a gate: at most `limit` requests run at once, up to
+`queue` more wait in FIFO order, and a waiter that can't start within
+`timeout` seconds is dropped. Rejections are immediate and cheap:
+
+  429  the queue is full
+  503  the request would not (or did not) start before its deadline; a
+       request is turned away on arrival when the gate's recent service time
+       says the queue ahead of it won't drain in time
+
+Both carry Retry-After, estimated from the queue length and the gate's
+moving-average service time. Routes without a gate (health checks,
+/metrics) are never queued behind scoring work.
+
+    ADMISSION=1 ADMISSION_MAX_INFLIGHT=8 ADMISSION_MAX_QUEUE=32 \\
+    ADMISSION_QUEUE_TIMEOUT_MS=500 ADMISSION_ROUTE_LIMITS="/predict_batch=2:4" uvicorn ...
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import math
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import perf_counter_ns
+
+from starlette.responses import JSONResponse
+
+from src.api.instrumentation import REGISTRY
+
+ADMITTED_WAIT = REGISTRY.histogram(
+    "admission_queue_wait_seconds", "Time admitted requests waited for a slot.", ("route",),
+)
+SHED = REGISTRY.counter(
+    "admission_rejected_total", "Requests turned away by admission control.", ("route", "reason"),
+)
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    limit: int             # requests running at once
+    queue: int             # requests waiting for a slot
+    timeout: float         # seconds a request may wait
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def parse_route_limits(spec: str, default: RouteLimit) -> dict:
+    """"/predict_batch=2:4,/explain=4" -> {path: RouteLimit}; queue/timeout default."""
+    limits = {}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        path, _, value = item.partition("=")
+        if not path.startswith("/") or not value:
+            raise ValueError(f"Bad route limit {item!r}; expected /path=limit[:queue]")
+        limit, _, queue = value.partition(":")
+        limits[path] = RouteLimit(int(limit), int(queue) if queue else default.queue, default.timeout)
+    return limits
+
+
+class Gate:
+    """In-flight limit and bounded FIFO wait queue for one route (one event loop)."""
+
+    # Weight of the newest sample in the service-time moving average
+    alpha = 0.2
+
+    def __init__(self, route: str, limit: RouteLimit):
+        if limit.limit < 1 or limit.queue < 0:
+            raise ValueError("limit must be >= 1 and queue >= 0")
+        self.route = route
+        self.limit = limit
+        self.in_flight = 0
+        self.service_s = 0.0
+        self._waiters: collections.deque = collections.deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self, position: int) -> float:
+        """Seconds until the request at queue position `position` (0-based) starts."""
+        return (position // self.limit.limit + 1) * self.service_s
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.expected_wait(self.queue_depth)))
+
+    def _reject(self, status_code: int, reason: str) -> Rejected:
+        SHED.inc((self.route, reason))
+        return Rejected(status_code, reason, self.retry_after())
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit.limit and not self._waiters:
+            self.in_flight += 1
+            ADMITTED_WAIT.observe((self.route,), 0)
+            return
+        if len(self._waiters) >= self.limit.queue:
+            raise self._reject(429, "queue_full")
+        if self.expected_wait(len(self._waiters)) > self.limit.timeout:
+            raise self._reject(503, "deadline")
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        t0 = perf_counter_ns()
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), self.limit.timeout)
+        except asyncio.TimeoutError:
+            if fut.done():      # slot handed over just as the deadline passed
+                self.release(0)
+            else:
+                self._waiters.remove(fut)
+                fut.cancel()
+            raise self._reject(503, "deadline")
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(0)
+            elif fut in self._waiters:
+                self._waiters.remove(fut)
+            raise
+        ADMITTED_WAIT.observe((self.route,), perf_counter_ns() - t0)
+
+    def release(self, elapsed_ns: int | None = None) -> None:
+        """Free a slot (handing it to the oldest waiter) and record the service time."""
+        if elapsed_ns:
+            self.service_s += self.alpha * (elapsed_ns / 1e9 - self.service_s)
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # slot passes over; in_flight unchanged
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        t0 = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.release(perf_counter_ns() - t0)
+
+
+class AdmissionController:
+    """Gates by route path; paths without a configured limit pass straight through."""
+
+    def __init__(self, limits: dict):
+        self.gates = {route: Gate(route, limit) for route, limit in limits.items()}
+
+    def gate(self, path: str) -> Gate | None:
+        return self.gates.get(path)
+
+    def stats(self) -> dict:
+        return {route: {"in_flight": g.in_flight, "queue_depth": g.queue_depth,
+                        "limit": g.limit.limit, "max_queue": g.limit.queue,
+                        "service_ms": g.service_s * 1e3}
+                for route, g in self.gates.items()}
+
+    def metric_lines(self) -> list:
+        stats = self.stats()
+        lines = []
+        for name, key in (("admission_in_flight", "in_flight"),
+                          ("admission_queue_depth", "queue_depth")):
+            lines.append(f"# TYPE {name} gauge")
+            lines += [f'{name}{{route="{r}"}} {s[key]}' for r, s in sorted(stats.items())]
+        return lines
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware gating requests through the controller returned by
+    get_controller() (None = admission control off, requests pass through).
+    The slot is held until the response has been sent.
+    """
+
+    def __init__(self, app, get_controller):
+        self.app = app
+        self.get_controller = get_controller
+
+    async def __call__(self, scope, receive, send):
+        controller = self.get_controller() if scope["type"] == "http" else None
+        gate = controller.gate(scope["path"]) if controller is not None else None
+        if gate is None:
+            return await self.app(scope, receive, send)
+        try:
+            async with gate.slot():
+                return await self.app(scope, receive, send)
+        except Rejected as e:
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={"detail": f"Server busy ({e.reason}), retry later"},
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
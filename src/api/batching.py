@@ -0,0 +1,146 @@
+# src/api/batching.py
+"""
+Opt-in micro-batching for scoring routes.
+
+Async handlers submit (model, row) and await a future. A worker task takes
+the first queued request, keeps collecting until it has max_batch requests
+or max_wait_ms has passed, then runs one predict_many() per model in an
+executor thread and resolves every future. While a batch runs, the next
+one accumulates in the queue. If a batch fails, its rows are retried one at
+a time, so a bad row only fails its own request. The batch's preprocess /
+predict_proba stages are recorded for every request in it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter_ns
+
+from src.api.instrumentation import REGISTRY, collect_stages, current_span, record_stages
+
+log = logging.getLogger("credit_api")
+
+BATCH_SIZE = REGISTRY.histogram(
+    "microbatch_size", "Requests per micro-batch.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512), unit_scale=1,
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "microbatch_queue_wait_seconds", "Time a request waited before its batch ran.",
+)
+BATCH_RUN = REGISTRY.histogram(
+    "microbatch_run_seconds", "Time to score one micro-batch.",
+)
+
+
+class MicroBatcher:
+    def __init__(self, max_batch: int = 32, max_wait_ms: float = 2.0, workers: int = 1):
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.max_batch = int(max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.workers = max(1, int(workers))
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list = []
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="microbatch")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            _, _, fut, _, _ = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError("Micro-batcher stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def submit(self, model, row: dict) -> float:
+        """Queue one row for scoring with `model`; returns p(bad=1)."""
+        if self._queue is None:
+            raise RuntimeError("Micro-batcher not started")
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((model, row, fut, perf_counter_ns(), current_span()))
+        return await fut
+
+    # --------------------------------------------------------------------- #
+    # Worker
+    # --------------------------------------------------------------------- #
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            started = perf_counter_ns()
+            BATCH_SIZE.observe((), len(batch))
+            for *_, queued_at, _ in batch:
+                QUEUE_WAIT.observe((), started - queued_at)
+
+            # A hot reload can leave requests for two models in one batch
+            groups: dict = {}
+            for item in batch:
+                groups.setdefault(id(item[0]), []).append(item)
+            for items in groups.values():
+                live = [it for it in items if not it[2].done()]  # skip cancelled requests
+                if not live:
+                    continue
+                model, rows = live[0][0], [it[1] for it in live]
+                try:
+                    probs, stages = await loop.run_in_executor(
+                        self._executor, collect_stages, model.predict_many, rows)
+                    results = [(float(p), stages) for p in probs]
+                except Exception as e:
+                    log.warning("Micro-batch of %d failed: %s", len(live), e)
+                    results = [(e, [])]
+                    if len(live) > 1:  # find the bad row(s); the others still succeed
+                        results = await loop.run_in_executor(self._executor, _score_each, model, rows)
+                for it, (result, stages) in zip(live, results):
+                    record_stages(it[4], stages)
+                    if it[2].done():
+                        continue
+                    if isinstance(result, Exception):
+                        it[2].set_exception(result)
+                    else:
+                        it[2].set_result(result)
+            BATCH_RUN.observe((), perf_counter_ns() - started)
+
+
+def _score_each(model, rows: list) -> list:
+    """[(p(bad=1) or the exception, stages)] per row, each scored on its own."""
+    out = []
+    for row in rows:
+        try:
+            probs, stages = collect_stages(model.predict_many, [row])
+            out.append((float(probs[0]), stages))
+        except Exception as e:
+            out.append((e, []))
+    return out
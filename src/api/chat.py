@@ -0,0 +1,202 @@
+# src/api/chat.py
+"""
+Proxy for the /api/ai-chat route: one httpx.AsyncClient per app lifetime
+(opened on startup, closed on shutdown), so requests reuse pooled
+keep-alive connections to the upstream instead of paying a TCP/TLS
+handshake each.
+
+  complete()     buffered chat completion (upstream JSON as-is)
+  open_stream()  stream=True upstream; server-sent events relayed line by line
+
+With a cache, completions are memoized by the exact message history (and
+model/temperature). A streamed miss is assembled into a completion and
+cached once the upstream sends [DONE]; a hit on a streaming request is
+replayed as a single chunk followed by [DONE].
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import AsyncIterator
+
+import httpx
+
+from src.api.instrumentation import REGISTRY
+from src.utils.cache import LRUCache
+
+log = logging.getLogger("credit_api")
+
+UPSTREAM = REGISTRY.counter(
+    "chat_upstream_requests_total", "ai-chat requests by how they were served.", ("result",),
+)
+
+SYSTEM_PROMPT = (
+    "You are the AI helper for a Credit Scoring demo website. "
+    "Explain grades/subgrades, DTI, credit utilization, delinquencies, "
+    "employment length, open accounts, etc. "
+    "Educational guidance only; no financial advice."
+)
+
+
+class ChatUpstreamError(Exception):
+    """Upstream failure, with the HTTP status the route should answer with."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _sse(data: str) -> bytes:
+    return f"data: {data}\n\n".encode()
+
+
+class ChatProxy:
+    def __init__(self, url: str, model: str = "llama3.1-8b", temperature: float = 0.2,
+                 timeout: float = 30.0, max_connections: int = 20, max_keepalive: int = 10,
+                 cache_size: int = 0, cache_ttl: float | None = None,
+                 transport: httpx.AsyncBaseTransport | None = None):
+        self.url = url
+        self.model = model
+        self.temperature = temperature
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive)
+        self.cache = LRUCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits,
+                                         transport=self._transport)
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("ChatProxy not started")
+        return self._client
+
+    # --------------------------------------------------------------------- #
+    def payload(self, messages: list[dict], stream: bool = False) -> dict:
+        return {
+            "model": self.model,
+            "temperature": self.temperature,
+            "stream": stream,
+            "messages": [{"role": "system", "content": SYSTEM_PROMPT}, *messages],
+        }
+
+    def cache_key(self, messages: list[dict]) -> str:
+        canonical = json.dumps([self.model, self.temperature, messages],
+                               sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _cached(self, messages: list[dict]):
+        if self.cache is None:
+            return None, None
+        key = self.cache_key(messages)
+        return key, self.cache.get(key)
+
+    @staticmethod
+    def _headers(api_key: str) -> dict:
+        return {"Authorization": f"Bearer {api_key}"}
+
+    async def complete(self, messages: list[dict], api_key: str) -> dict:
+        """Buffered completion: cache, else one upstream call over the pool."""
+        key, hit = self._cached(messages)
+        if hit is not None:
+            UPSTREAM.inc(("cache_hit",))
+            return hit
+        try:
+            r = await self.client.post(self.url, headers=self._headers(api_key),
+                                       json=self.payload(messages))
+            r.raise_for_status()
+            completion = r.json()
+        except httpx.HTTPStatusError as e:
+            UPSTREAM.inc(("error",))
+            raise ChatUpstreamError(e.response.status_code, str(e)) from e
+        except (httpx.RequestError, ValueError) as e:
+            UPSTREAM.inc(("error",))
+            raise ChatUpstreamError(502, f"Chat upstream unavailable: {e}") from e
+        UPSTREAM.inc(("ok",))
+        if key is not None:
+            self.cache.put(key, completion)
+        return completion
+
+    async def open_stream(self, messages: list[dict], api_key: str) -> AsyncIterator[bytes]:
+        """
+        Start a streamed completion and return the SSE byte chunks to relay.
+        Upstream errors surface here, before any bytes are sent.
+        """
+        key, hit = self._cached(messages)
+        if hit is not None:
+            UPSTREAM.inc(("cache_hit",))
+            return self._replay(hit)
+
+        request = self.client.build_request(
+            "POST", self.url, json=self.payload(messages, stream=True),
+            headers={**self._headers(api_key), "Accept": "text/event-stream"},
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.RequestError as e:
+            UPSTREAM.inc(("error",))
+            raise ChatUpstreamError(502, f"Chat upstream unavailable: {e}") from e
+        if response.status_code >= 400:
+            body = (await response.aread()).decode(errors="replace")
+            await response.aclose()
+            UPSTREAM.inc(("error",))
+            raise ChatUpstreamError(response.status_code, f"Upstream error: {body[:500]}")
+        UPSTREAM.inc(("ok",))
+        return self._relay(response, key)
+
+    async def _relay(self, response: httpx.Response, key: str | None) -> AsyncIterator[bytes]:
+        parts, finish, meta, done = [], None, {}, False
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue  # blank separators, comments, keep-alives
+                data = line[5:].strip()
+                yield _sse(data)
+                if data == "[DONE]":
+                    done = True
+                    break
+                if key is not None:
+                    try:
+                        chunk = json.loads(data)
+                        choice = chunk["choices"][0]
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        continue
+                    meta = meta or {k: chunk.get(k) for k in ("id", "model", "created")}
+                    parts.append((choice.get("delta") or {}).get("content") or "")
+                    finish = choice.get("finish_reason") or finish
+        except httpx.HTTPError as e:
+            log.warning("ai-chat stream interrupted: %s", e)
+            yield _sse(json.dumps({"error": "upstream stream interrupted"}))
+        finally:
+            await response.aclose()
+        if done and key is not None:
+            self.cache.put(key, {
+                **meta,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "finish_reason": finish,
+                             "message": {"role": "assistant", "content": "".join(parts)}}],
+            })
+
+    @staticmethod
+    async def _replay(completion: dict) -> AsyncIterator[bytes]:
+        choice = (completion.get("choices") or [{}])[0]
+        chunk = {
+            "id": completion.get("id"),
+            "object": "chat.completion.chunk",
+            "model": completion.get("model"),
+            "choices": [{"index": 0, "delta": choice.get("message") or {},
+                         "finish_reason": choice.get("finish_reason")}],
+        }
+        yield _sse(json.dumps(chunk))
+        yield _sse("[DONE]")
@@ -0,0 +1,147 @@
+# src/api/fastpath.py
+"""
+Fast JSON path for single-row scoring (POST /predict_fast).
+
+The request body is parsed with orjson and checked field by field against
+constraints compiled once from the pydantic request model (int/float with
+ge/le bounds, Literal choices, str), then handed to the model's compiled
+encoder as-is: no pydantic model instance, no model_dump() and no
+jsonable_encoder on the way out (responses are orjson bytes).
+
+Only bodies the checks accept outright take the fast path. Anything else
+(wrong content type, invalid JSON, missing or out-of-range fields, values
+pydantic would coerce such as "3" or true, or reject such as 2.5) goes
+through the same parsing and PredictIn validation FastAPI applies to
+/predict, so accepted inputs and 422 bodies are identical between the two
+routes.
+"""
+from __future__ import annotations
+
+import email.message
+import json
+import typing
+
+import orjson
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+_INT, _FLOAT, _CHOICE, _STR = range(4)
+_I64_BOUND = 2**63  # pydantic turns floats into ints only strictly inside +-2**63
+
+
+def compile_fields(model_cls: type[BaseModel]) -> list:
+    """[(name, kind, ge, le, choices)] for the flat int/float/Literal/str fields of a model."""
+    fields = []
+    for name, info in model_cls.model_fields.items():
+        ann = info.annotation
+        ge = next((m.ge for m in info.metadata if hasattr(m, "ge")), None)
+        le = next((m.le for m in info.metadata if hasattr(m, "le")), None)
+        if typing.get_origin(ann) is typing.Literal:
+            fields.append((name, _CHOICE, None, None, frozenset(typing.get_args(ann))))
+        elif ann is int:
+            fields.append((name, _INT, ge, le, None))
+        elif ann is float:
+            fields.append((name, _FLOAT, ge, le, None))
+        elif ann is str:
+            fields.append((name, _STR, None, None, None))
+        else:
+            raise ValueError(f"Field {name!r} ({ann}) is not supported by the fast path")
+        if not info.is_required():
+            raise ValueError(f"Field {name!r} has a default; the fast path needs required fields")
+    return fields
+
+
+def _is_json(content_type: str | None) -> bool:
+    # Same rule FastAPI uses to decide whether a body is JSON
+    if not content_type:
+        return True
+    message = email.message.Message()
+    message["content-type"] = content_type
+    if message.get_content_maintype() != "application":
+        return False
+    subtype = message.get_content_subtype()
+    return subtype == "json" or subtype.endswith("+json")
+
+
+class RowParser:
+    """Request body -> validated row dict, for one pydantic request model."""
+
+    def __init__(self, model_cls: type[BaseModel]):
+        self.model_cls = model_cls
+        self.fields = compile_fields(model_cls)
+        self._adapter = TypeAdapter(model_cls)
+
+    def fast(self, data) -> dict | None:
+        """The row if every field passes as-is, else None (leave it to pydantic)."""
+        if type(data) is not dict:
+            return None
+        for name, kind, ge, le, choices in self.fields:
+            v = data.get(name)
+            t = type(v)
+            if kind == _INT:
+                if t is float and v.is_integer() and -_I64_BOUND < v < _I64_BOUND:
+                    data[name] = v = int(v)
+                elif t is not int:
+                    return None
+            elif kind == _FLOAT:
+                if t is int:
+                    data[name] = v = float(v)
+                elif t is not float:
+                    return None
+            elif kind == _CHOICE:
+                if t is not str or v not in choices:
+                    return None
+                continue
+            else:
+                if t is not str:
+                    return None
+                continue
+            if (ge is not None and not v >= ge) or (le is not None and not v <= le):
+                return None
+        return data
+
+    def parse(self, body: bytes, content_type: str | None = None) -> dict:
+        """
+        Validated row for a request body; raises RequestValidationError with
+        the errors FastAPI would report for a `payload: <model>` body.
+        """
+        if body and _is_json(content_type):
+            try:
+                row = self.fast(orjson.loads(body))
+            except orjson.JSONDecodeError:
+                row = None
+            if row is not None:
+                return row
+        return self.slow(body, content_type)
+
+    def slow(self, body: bytes, content_type: str | None = None) -> dict:
+        """FastAPI's own body handling: json.loads, then model validation under "body"."""
+        data = None
+        if body:
+            if _is_json(content_type):
+                try:
+                    data = json.loads(body)
+                except json.JSONDecodeError as e:
+                    raise RequestValidationError(
+                        [{"type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error",
+                          "input": {}, "ctx": {"error": e.msg}}],
+                        body=e.doc,
+                    ) from e
+            else:
+                data = body
+        if data is None:
+            missing = ValidationError.from_exception_data(
+                "Field required", [{"type": "missing", "loc": ("body",), "input": None}])
+            raise RequestValidationError(missing.errors())
+        try:
+            # from_attributes, as FastAPI validates body fields
+            return self._adapter.validate_python(data, from_attributes=True).model_dump()
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors()],
+                body=data,
+            ) from e
+
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj)
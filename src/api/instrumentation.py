@@ -0,0 +1,184 @@
+# src/api/instrumentation.py
+"""
+Request metrics for the API: per-route request/error counters and latency
+histograms, plus a per-stage breakdown of scoring requests:
+
+  validate       body parsing + pydantic validation (route entry -> endpoint)
+  preprocess     CreditScoringModel encoding
+  predict_proba  model inference (including prediction cache lookups)
+  serialize      response model validation + JSON encoding (endpoint -> response)
+
+Routes use InstrumentedRoute; endpoints that should report validate/serialize
+are wrapped with @timed_endpoint. For streaming responses the route latency
+runs until the last chunk of the body has been sent.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import typing
+from contextvars import ContextVar
+from time import perf_counter_ns
+
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.responses import StreamingResponse
+
+from src.utils.metrics import MetricsRegistry
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route, method and status.",
+    ("route", "method", "status"),
+)
+ERRORS = REGISTRY.counter(
+    "http_request_errors_total", "HTTP requests that ended in a 4xx/5xx, by route.",
+    ("route", "kind"),
+)
+LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "Route handler latency in seconds.", ("route",),
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "scoring_stage_duration_seconds", "Time per scoring stage in seconds.", ("route", "stage"),
+)
+
+
+class _Span:
+    __slots__ = ("route", "start", "enter", "exit")
+
+    def __init__(self, route: str, start: int):
+        self.route, self.start, self.enter, self.exit = route, start, 0, 0
+
+
+_span: ContextVar[_Span | None] = ContextVar("metrics_span", default=None)
+
+
+# Set by collect_stages(): stages are gathered there instead of recorded
+_stage_sink: ContextVar[list | None] = ContextVar("stage_sink", default=None)
+
+
+def observe_stage(stage: str, elapsed_ns: int) -> None:
+    """Record a stage for the current request (no-op outside a request)."""
+    sink = _stage_sink.get()
+    if sink is not None:
+        sink.append((stage, elapsed_ns))
+        return
+    span = _span.get()
+    if span is not None:
+        STAGE_LATENCY.observe((span.route, stage), elapsed_ns)
+
+
+def current_span() -> _Span | None:
+    return _span.get()
+
+
+def collect_stages(fn, *args):
+    """Call fn(*args); returns (result, [(stage, elapsed_ns)]) for the stages it reported."""
+    sink: list = []
+    token = _stage_sink.set(sink)
+    try:
+        return fn(*args), sink
+    finally:
+        _stage_sink.reset(token)
+
+
+def record_stages(span: _Span | None, stages: list) -> None:
+    """Record stages measured outside a request (e.g. in a shared batch) for its span."""
+    if span is not None:
+        for stage, elapsed_ns in stages:
+            STAGE_LATENCY.observe((span.route, stage), elapsed_ns)
+
+
+def _resolved_signature(fn) -> inspect.Signature:
+    """
+    Signature with string annotations evaluated in fn's module, so FastAPI
+    (which resolves them against the wrapper's globals) still sees the real
+    request models when the endpoint module uses postponed annotations.
+    """
+    hints = typing.get_type_hints(fn, include_extras=True)
+    sig = inspect.signature(fn)
+    params = [p.replace(annotation=hints.get(p.name, p.annotation)) for p in sig.parameters.values()]
+    return sig.replace(parameters=params, return_annotation=inspect.Signature.empty)
+
+
+def timed_endpoint(fn):
+    """Mark endpoint entry/exit so the route can split validate/serialize time."""
+    signature = _resolved_signature(fn)
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            span = _span.get()
+            if span is not None:
+                span.enter = perf_counter_ns()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                if span is not None:
+                    span.exit = perf_counter_ns()
+        async_wrapper.__signature__ = signature
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        span = _span.get()
+        if span is not None:
+            span.enter = perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if span is not None:
+                span.exit = perf_counter_ns()
+    wrapper.__signature__ = signature
+    return wrapper
+
+
+async def _observe_when_sent(body, route: str, start: int):
+    """Relay a streaming body and record the route latency once it ends."""
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        LATENCY.observe((route,), perf_counter_ns() - start)
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute that records request count, errors and latency per route."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def instrumented_handler(request):
+            start = perf_counter_ns()
+            span = _Span(route, start)
+            token = _span.set(span)
+            status = 500
+            response = None
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                _span.reset(token)
+                end = perf_counter_ns()
+                if isinstance(response, StreamingResponse):
+                    response.body_iterator = _observe_when_sent(response.body_iterator, route, start)
+                else:
+                    LATENCY.observe((route,), end - start)
+                REQUESTS.inc((route, request.method, str(status)))
+                if status >= 400:
+                    ERRORS.inc((route, "server" if status >= 500 else "client"))
+                if span.enter:
+                    STAGE_LATENCY.observe((route, "validate"), span.enter - start)
+                if span.exit and status < 400:
+                    STAGE_LATENCY.observe((route, "serialize"), end - span.exit)
+
+        return instrumented_handler
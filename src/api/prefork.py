@@ -0,0 +1,355 @@
+# src/api/prefork.py
+"""
+Prefork serving: load the model once in a parent process, then fork N
+uvicorn workers that accept on one shared listening socket.
+
+    PYTHONPATH=. python -m src.api.prefork --workers 4 --port 8000
+
+  - The model is loaded before forking and the parent calls gc.freeze(), so
+    the forest's NumPy buffers (and, for artifacts, the memory-mapped
+    arrays) stay shared copy-on-write: the GC never writes to the frozen
+    objects, and reference-count updates only touch small object headers,
+    not the node arrays.
+  - Every worker writes a heartbeat, its request count and its state into a
+    shared table (anonymous shared mmap). The parent restarts workers that
+    exit or stop heartbeating; GET /workers on any worker shows the table.
+  - SIGHUP: rolling restart. The parent reloads MODEL_PATH, then replaces the
+    workers one at a time. Each replacement must report ready before the old
+    worker gets SIGTERM, which lets it finish in-flight requests.
+    POST /admin/reload on any worker forwards to the parent as a SIGHUP.
+  - SIGTERM/SIGINT: graceful shutdown of all workers.
+  - The default worker count is the number of CPUs the process may use
+    (affinity and cgroup quota), not the host's CPU count.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import logging
+import math
+import mmap
+import os
+import signal
+import socket
+import sys
+import time
+
+import numpy as np
+
+log = logging.getLogger("credit_api")
+
+STATES = ("empty", "starting", "ready", "draining")
+SLOT_DTYPE = np.dtype([
+    ("pid", np.int64),
+    ("generation", np.int64),
+    ("state", np.int8),
+    ("started", np.float64),
+    ("heartbeat", np.float64),
+    ("requests", np.int64),
+])
+
+
+class WorkerTable:
+    """Fixed-size table of worker slots in memory shared across fork()."""
+
+    def __init__(self, n_slots: int):
+        self._buf = mmap.mmap(-1, max(1, n_slots * SLOT_DTYPE.itemsize))
+        self.slots = np.ndarray((n_slots,), SLOT_DTYPE, buffer=self._buf)
+        self.slots[:] = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def claim(self, i: int, generation: int) -> None:
+        now = time.time()
+        self.slots[i] = (os.getpid(), generation, STATES.index("starting"), now, now, 0)
+
+    def set_state(self, i: int, state: str) -> None:
+        self.slots[i]["state"] = STATES.index(state)
+
+    def beat(self, i: int, requests: int) -> None:
+        self.slots[i]["heartbeat"] = time.time()
+        self.slots[i]["requests"] = requests
+
+    def snapshot(self) -> list[dict]:
+        now = time.time()
+        return [
+            {"slot": i, "pid": int(s["pid"]), "generation": int(s["generation"]),
+             "state": STATES[s["state"]], "uptime_s": round(now - s["started"], 3),
+             "heartbeat_age_s": round(now - s["heartbeat"], 3), "requests": int(s["requests"])}
+            for i, s in enumerate(self.slots) if s["state"] != 0
+        ]
+
+
+async def heartbeat(table: WorkerTable, slot: int, interval: float, requests) -> None:
+    """Worker-side task: mark the slot ready, then refresh it every interval."""
+    table.set_state(slot, "ready")
+    while True:
+        table.beat(slot, requests())
+        await asyncio.sleep(interval)
+
+
+def available_cpus(cgroup_root: str = "/sys/fs/cgroup") -> int:
+    """
+    CPUs this process may actually use: its CPU affinity, capped by a cgroup
+    CPU quota (v2 cpu.max or v1 cfs_quota/period), as set by container limits.
+    """
+    try:
+        n = len(os.sched_getaffinity(0))
+    except AttributeError:
+        n = os.cpu_count() or 1
+    quota = period = None
+    try:
+        with open(os.path.join(cgroup_root, "cpu.max")) as f:
+            q, p = f.read().split()[:2]
+            if q != "max":
+                quota, period = int(q), int(p)
+    except (OSError, ValueError):
+        try:
+            with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us")) as f:
+                q = int(f.read())
+            with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us")) as f:
+                p = int(f.read())
+            if q > 0 and p > 0:
+                quota, period = q, p
+        except (OSError, ValueError):
+            pass
+    if quota and period:
+        n = min(n, math.ceil(quota / period))
+    return max(1, n)
+
+
+def private_and_shared_kb(pid: int | str = "self") -> dict:
+    """Private vs shared resident memory of a process (Linux smaps_rollup)."""
+    out = {"private_kb": 0, "shared_kb": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key.startswith("Private_"):
+                    out["private_kb"] += int(value.split()[0])
+                elif key.startswith("Shared_"):
+                    out["shared_kb"] += int(value.split()[0])
+    except OSError:
+        pass
+    return out
+
+
+# ------------------------------------------------------------------------- #
+# Parent
+# ------------------------------------------------------------------------- #
+class Arbiter:
+    def __init__(self, host: str, port: int, workers: int, heartbeat_interval: float = 1.0,
+                 heartbeat_timeout: float = 30.0, graceful_timeout: float = 30.0,
+                 log_level: str = "info"):
+        self.host, self.port = host, port
+        self.n_workers = workers
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        # Twice the worker count, so replacements can start before old workers leave
+        self.table = WorkerTable(2 * workers)
+        self.children: dict[int, int] = {}   # pid -> slot
+        self.generation = 0
+        self.sock: socket.socket | None = None
+        self._stopping = False
+        self._restart_requested = False
+
+    def bind(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self.port = sock.getsockname()[1]
+        self.sock = sock
+
+    def load_model(self) -> None:
+        import src.api.server as server
+
+        server.preload_model()
+        gc.collect()
+        gc.freeze()  # keep the GC from touching (and un-sharing) the model's pages
+
+    # --------------------------------------------------------------------- #
+    def _free_slot(self) -> int:
+        used = set(self.children.values())
+        for i in range(len(self.table)):
+            if i not in used:
+                return i
+        raise RuntimeError("No free worker slot")
+
+    def spawn(self) -> int:
+        slot = self._free_slot()
+        self.table.slots[slot] = 0
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self._run_worker(slot)
+                code = 0
+            except BaseException:
+                log.exception("Worker in slot %d crashed", slot)
+            finally:
+                os._exit(code)
+        self.children[pid] = slot
+        log.info("Started worker %d in slot %d (generation %d)", pid, slot, self.generation)
+        return pid
+
+    def _run_worker(self, slot: int) -> None:
+        import uvicorn
+
+        import src.api.server as server
+
+        # A HUP sent to the whole process group is for the parent only
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        self.table.claim(slot, self.generation)
+        server.enable_worker_reporting(self.table, slot, self.heartbeat_interval)
+        config = uvicorn.Config(server.app, log_level=self.log_level, lifespan="on",
+                                timeout_graceful_shutdown=self.graceful_timeout)
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def wait_ready(self, pid: int, timeout: float) -> bool:
+        slot = self.children[pid]
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.table.slots[slot]["state"] == STATES.index("ready"):
+                return True
+            if self._reap() and pid not in self.children:
+                return False
+            time.sleep(0.05)
+        return False
+
+    def stop_worker(self, pid: int, wait: bool = True) -> None:
+        slot = self.children.get(pid)
+        if slot is None:
+            return
+        self.table.set_state(slot, "draining")
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        if not wait:
+            return
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while pid in self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        if pid in self.children:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self._forget(pid)
+
+    def _forget(self, pid: int) -> None:
+        slot = self.children.pop(pid, None)
+        if slot is not None:
+            self.table.slots[slot] = 0
+
+    def _reap(self) -> list:
+        """Collect exited children; returns their pids."""
+        gone = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in self.children:
+                planned = self._stopping or (
+                    self.table.slots[self.children[pid]]["state"] == STATES.index("draining"))
+                gone.append(pid)
+                self._forget(pid)
+                if not planned:
+                    log.warning("Worker %d exited (status %d)", pid, status)
+        return gone
+
+    def rolling_restart(self) -> None:
+        """Reload the model, then replace workers one at a time."""
+        log.info("Rolling restart: reloading model")
+        gc.unfreeze()
+        try:
+            self.load_model()
+        except Exception:
+            log.exception("Model reload failed; keeping the current workers")
+            gc.freeze()
+            return
+        self.generation += 1
+        for old in list(self.children):
+            new = self.spawn()
+            if not self.wait_ready(new, self.graceful_timeout + 30):
+                log.error("Replacement worker %d never became ready; aborting restart", new)
+                self.stop_worker(new)
+                return
+            self.stop_worker(old)
+        log.info("Rolling restart done (generation %d)", self.generation)
+
+    def _check_heartbeats(self) -> None:
+        now = time.time()
+        for pid, slot in list(self.children.items()):
+            s = self.table.slots[slot]
+            if s["state"] == STATES.index("ready") and now - s["heartbeat"] > self.heartbeat_timeout:
+                log.error("Worker %d missed heartbeats for %.0f s; killing it",
+                          pid, now - s["heartbeat"])
+                os.kill(pid, signal.SIGKILL)
+
+    # --------------------------------------------------------------------- #
+    def run(self) -> int:
+        self.bind()
+        self.load_model()
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, "_restart_requested", True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "_stopping", True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, "_stopping", True))
+        log.info("Prefork: listening on %s:%d with %d workers", self.host, self.port, self.n_workers)
+
+        while not self._stopping:
+            self._reap()
+            if self._restart_requested:
+                self._restart_requested = False
+                self.rolling_restart()
+            live = sum(1 for slot in self.children.values()
+                       if self.table.slots[slot]["state"] != STATES.index("draining"))
+            for _ in range(self.n_workers - live):
+                self.spawn()
+            self._check_heartbeats()
+            time.sleep(0.2)
+
+        log.info("Prefork: shutting down %d workers", len(self.children))
+        for pid in list(self.children):
+            self.stop_worker(pid, wait=False)
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for pid in list(self.children):
+            os.kill(pid, signal.SIGKILL)
+            self._forget(pid)
+        return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.api.prefork",
+                                 description="Serve the API from preforked workers sharing one model")
+    ap.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8000")))
+    ap.add_argument("--workers", type=int, default=int(os.environ.get("WORKERS", 0)),
+                    help="worker processes (default: WORKERS, else the CPUs available to this "
+                         "process/container)")
+    ap.add_argument("--heartbeat-interval", type=float, default=1.0)
+    ap.add_argument("--heartbeat-timeout", type=float, default=30.0)
+    ap.add_argument("--graceful-timeout", type=float, default=30.0)
+    ap.add_argument("--log-level", default="info")
+    args = ap.parse_args(argv)
+    if args.workers == 0:
+        args.workers = available_cpus()
+    if args.workers < 1:
+        ap.error("--workers must be at least 1")
+    return Arbiter(args.host, args.port, args.workers, args.heartbeat_interval,
+                   args.heartbeat_timeout, args.graceful_timeout, args.log_level).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
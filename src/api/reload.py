@@ -0,0 +1,149 @@
+# src/api/reload.py
+"""
+Hot model reload: load a new model off the request path, warm it up, then
+hand it to the server in one reference assignment. Requests that already
+picked up the old model finish on it.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+from src.ml.artifact import is_artifact, read_manifest
+from src.ml.credit_model import CreditScoringModel, create_sample_application
+
+log = logging.getLogger("credit_api")
+
+
+def model_fingerprint(path: str) -> str:
+    """Short content id: the manifest checksum for artifacts, sha256 for files."""
+    if is_artifact(path):
+        return read_manifest(path)["checksum"][:12]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:12]
+
+
+def _stat_key(path: str):
+    """Cheap change detector polled before the (expensive) fingerprint."""
+    target = os.path.join(path, "manifest.json") if os.path.isdir(path) else path
+    try:
+        st = os.stat(target)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def warm_up(m: CreditScoringModel, n: int = 8) -> None:
+    """A few synthetic predictions so the first real request doesn't pay for lazy setup."""
+    base = create_sample_application()
+    rows = [{**base, "grade": "ABCDEFG"[i % 7], "dti": 5.0 * i} for i in range(n)]
+    probs = m.predict_many(rows)
+    if len(probs) != n or not all(0.0 <= p <= 1.0 for p in probs):
+        raise ValueError("Warm-up predictions out of range")
+    m.predict(rows[0])
+
+
+class ModelReloader:
+    """
+    Reloads MODEL_PATH on demand (reload()) or when it changes on disk
+    (optional mtime poller + fingerprint check). One reload runs at a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        load: Callable[[str], CreditScoringModel],
+        on_swap: Callable[[CreditScoringModel], None],
+        poll_seconds: float = 0.0,
+    ):
+        self.path = path
+        self._load = load
+        self._on_swap = on_swap
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_stat = _stat_key(path)
+        self.version: str | None = None
+        self.status = {"state": "idle", "version": None, "error": None, "reloaded_at": None}
+
+    # --------------------------------------------------------------------- #
+    # Reload
+    # --------------------------------------------------------------------- #
+    def reload(self, force: bool = True, wait: bool = False) -> dict:
+        """
+        Start a reload in a background thread. force=False skips the swap when
+        the fingerprint is unchanged. wait=True blocks until it finishes,
+        queueing behind a reload that is already running.
+        """
+        if wait:
+            self._lock.acquire()
+            self._reload_locked(force)
+            return dict(self.status)
+        if not self._lock.acquire(blocking=False):
+            return {**self.status, "state": "busy"}
+        # The lock now belongs to the reload thread, which releases it
+        self.status["state"] = "reloading"
+        threading.Thread(target=self._reload_locked, args=(force,), name="model-reload",
+                         daemon=True).start()
+        return dict(self.status)
+
+    def _reload_locked(self, force: bool) -> None:
+        """Run one reload; the caller holds self._lock, released here."""
+        try:
+            self.status["state"] = "reloading"
+            version = model_fingerprint(self.path)
+            if not force and version == self.version:
+                self.status.update(state="unchanged", error=None)
+                return
+            t0 = time.perf_counter()
+            m = self._load(self.path)
+            m.version = version
+            warm_up(m)
+            self._on_swap(m)
+            self.version = version
+            self.status.update(
+                state="reloaded", version=version, error=None,
+                reloaded_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            )
+            log.info("Model reloaded from %s (version %s) in %.0f ms",
+                     self.path, version, (time.perf_counter() - t0) * 1e3)
+        except Exception as e:
+            self.status.update(state="failed", error=str(e))
+            log.error("Model reload from %s failed, keeping version %s: %s",
+                      self.path, self.version, e)
+        finally:
+            self._lock.release()
+
+    # --------------------------------------------------------------------- #
+    # File polling
+    # --------------------------------------------------------------------- #
+    def start(self) -> None:
+        if self.poll_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name="model-poll", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            stat = _stat_key(self.path)
+            if stat is None or stat == self._last_stat:
+                continue
+            # Busy with another reload: leave the change unseen and retry next tick
+            if self._lock.acquire(blocking=False):
+                self._last_stat = stat
+                self._reload_locked(force=False)
@@ -1,19 +1,50 @@
 # src/api/server.py
 from __future__ import annotations
 
+import time
+_IMPORT_T0 = time.perf_counter()
+
+import asyncio
+import hmac
 import logging
+import math
 import os
-from typing import List, Optional, Literal
+import signal
+from contextvars import ContextVar
+from typing import Any, List, Optional, Literal
 
-import httpx  # pip install httpx
+import numpy as np
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import (
+    JSONResponse, PlainTextResponse, RedirectResponse, Response, StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
 
+_MODEL_IMPORT_T0 = time.perf_counter()
 from src.ml.credit_model import CreditScoringModel
+from src.ml.surface import RatioSurface
+from src.api.reload import ModelReloader, model_fingerprint
+from src.api.instrumentation import REGISTRY, InstrumentedRoute, observe_stage, timed_endpoint
+from src.api.batching import MicroBatcher
+from src.api.chat import ChatProxy, ChatUpstreamError
+from src.api.admission import (
+    AdmissionController, AdmissionMiddleware, RouteLimit, parse_route_limits,
+)
+from src.api.fastpath import RowParser, dumps
+_IMPORT_T1 = time.perf_counter()
+
+# Cold-start report, logged from on_startup and returned by /model_info
+STARTUP_TIMINGS: dict = {
+    "import_ms": (_IMPORT_T1 - _IMPORT_T0) * 1e3,
+    "model_module_import_ms": (_IMPORT_T1 - _MODEL_IMPORT_T0) * 1e3,
+    "model_load_ms": None,
+}
 
 # ------------------------------------------------------------------------------
 # Bootstrap & config
@@ -26,27 +57,189 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(mess
 MODEL_PATH = os.environ.get("MODEL_PATH", "models/credit_model.pkl")
 THRESH_APPROVE = float(os.environ.get("THRESH_APPROVE", "0.33"))
 THRESH_REJECT  = float(os.environ.get("THRESH_REJECT",  "0.67"))
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "10000"))
+MAX_EXPLAIN_BATCH = int(os.environ.get("MAX_EXPLAIN_BATCH", "1000"))
+MODEL_BACKEND = os.environ.get("MODEL_BACKEND", "sklearn")        # sklearn | flat
+MODEL_PRECISION = os.environ.get("MODEL_PRECISION", "float64")    # float64 | float32 (flat only)
+PREDICT_CACHE_SIZE = int(os.environ.get("PREDICT_CACHE_SIZE", "4096"))  # 0 = no cache
+PREDICT_CACHE_TTL = float(os.environ.get("PREDICT_CACHE_TTL", "0"))     # seconds, 0 = no expiry
+EXPLAIN_CACHE_SIZE = int(os.environ.get("EXPLAIN_CACHE_SIZE", "1024"))  # 0 = no cache
+PREDICT_SIMPLE_LUT = os.environ.get("PREDICT_SIMPLE_LUT", "0") == "1"  # precompute /predict_simple
+MODEL_POLL_SECONDS = float(os.environ.get("MODEL_POLL_SECONDS", "0"))  # 0 = no file polling
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")                       # unset = /admin/* disabled
+MICROBATCH = os.environ.get("MICROBATCH", "0") == "1"             # queue single-row scoring
+MICROBATCH_MAX_SIZE = int(os.environ.get("MICROBATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("MICROBATCH_MAX_WAIT_MS", "2"))
+ADMISSION = os.environ.get("ADMISSION", "0") == "1"               # limit/queue scoring routes
+ADMISSION_MAX_INFLIGHT = int(os.environ.get("ADMISSION_MAX_INFLIGHT", "8"))    # per route
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "32"))         # per route
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_MS", "1000"))
+ADMISSION_ROUTE_LIMITS = os.environ.get("ADMISSION_ROUTE_LIMITS", "")  # "/predict_batch=2:4,..."
+CHAT_UPSTREAM_URL = os.environ.get("CHAT_UPSTREAM_URL", "https://api.cerebras.ai/v1/chat/completions")
+CHAT_MODEL = os.environ.get("CHAT_MODEL", "llama3.1-8b")
+CHAT_TIMEOUT = float(os.environ.get("CHAT_TIMEOUT", "30"))
+CHAT_MAX_CONNECTIONS = int(os.environ.get("CHAT_MAX_CONNECTIONS", "20"))  # pooled, keep-alive
+CHAT_CACHE_SIZE = int(os.environ.get("CHAT_CACHE_SIZE", "0"))      # 0 = no response cache
+CHAT_CACHE_TTL = float(os.environ.get("CHAT_CACHE_TTL", "300"))    # seconds, 0 = no expiry
 
 model: CreditScoringModel | None = None
+reloader: ModelReloader | None = None
+batcher: MicroBatcher | None = None
+chat: ChatProxy | None = None
+admission: AdmissionController | None = None
 
-def _load_model() -> None:
-    global model
+# Prefork mode (src/api/prefork.py): model loaded by the parent before fork,
+# and this worker's slot in the shared worker table
+_preloaded = False
+worker_table = None
+worker_slot: int | None = None
+worker_heartbeat_s = 1.0
+_heartbeat_task = None
+
+# Routes gated by admission control; health checks and /metrics never wait
+SCORING_ROUTES = (
+    "/predict", "/predict_fast", "/predict_batch", "/explain", "/explain_batch", "/predict_simple",
+    "/predict_loan", "/predict_loan_grid",
+)
+
+# Per-request slot recording which model version served it (X-Model-Version)
+_served_version: ContextVar[dict | None] = ContextVar("served_version", default=None)
+
+def _apply_artifact_thresholds(m: CreditScoringModel) -> None:
+    """Adopt thresholds recorded in an artifact manifest unless set via env."""
+    global THRESH_APPROVE, THRESH_REJECT
+    thresholds = (m.manifest or {}).get("thresholds") or {}
+    if "approve" in thresholds and "THRESH_APPROVE" not in os.environ:
+        THRESH_APPROVE = float(thresholds["approve"])
+    if "reject" in thresholds and "THRESH_REJECT" not in os.environ:
+        THRESH_REJECT = float(thresholds["reject"])
+
+def _build_model(path: str) -> CreditScoringModel:
     m = CreditScoringModel()
-    m.load_model(MODEL_PATH)
-    model = m
-    log.info("Model loaded from %s", MODEL_PATH)
+    m.load_model(path, backend=MODEL_BACKEND, precision=MODEL_PRECISION)
+    m.enable_cache(PREDICT_CACHE_SIZE, PREDICT_CACHE_TTL)
+    m.enable_explain_cache(EXPLAIN_CACHE_SIZE)
+    m.stage_hook = observe_stage
+    if PREDICT_SIMPLE_LUT:
+        t0 = time.perf_counter()
+        surface = RatioSurface.build(
+            m, _simple_features, SIMPLE_GRADES, ["dti", "payment_inc_ratio"]
+        )
+        m.surfaces["predict_simple"] = surface
+        log.info("Built /predict_simple lookup table: %d entries in %.0f ms",
+                 surface.size, (time.perf_counter() - t0) * 1e3)
+    return m
+
+def _swap_model(m: CreditScoringModel) -> None:
+    """Publish a loaded model. Handlers grab the reference once per request."""
+    global model
+    _apply_artifact_thresholds(m)
+    old, model = model, m
+    if old is not None:
+        # the new model brings its own empty caches
+        for cache in (old.cache, old.explain_cache):
+            if cache is not None:
+                cache.clear()
+
+def _load_model() -> None:
+    t0 = time.perf_counter()
+    m = _build_model(MODEL_PATH)
+    STARTUP_TIMINGS["model_load_ms"] = (time.perf_counter() - t0) * 1e3
+    m.version = model_fingerprint(MODEL_PATH)
+    _swap_model(m)
+    log.info("Model loaded from %s (backend=%s, version=%s)", MODEL_PATH, m.backend, m.version)
+
+def preload_model() -> None:
+    """Load MODEL_PATH now (prefork parent); workers then skip their startup load."""
+    global _preloaded
+    _load_model()
+    _preloaded = True
+
+def enable_worker_reporting(table, slot: int, interval: float) -> None:
+    """Report heartbeats/request counts into a prefork worker table slot."""
+    global worker_table, worker_slot, worker_heartbeat_s
+    worker_table, worker_slot, worker_heartbeat_s = table, slot, interval
+
+def _require_model() -> CreditScoringModel:
+    """The current model for this request (503 if none is loaded)."""
+    m = model
+    if m is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    served = _served_version.get()
+    if served is not None:
+        served["version"] = m.version
+    return m
+
+async def _score(m: CreditScoringModel, row: dict) -> float:
+    """p(bad=1) for one row: via the micro-batcher when enabled, else on the threadpool."""
+    if batcher is not None:
+        prob = await batcher.submit(m, row)
+    else:
+        prob = await run_in_threadpool(m.predict, row)
+    return max(0.0, min(1.0, float(prob)))
 
 # ------------------------------------------------------------------------------
 # Helpers for loan impact
 # ------------------------------------------------------------------------------
-def monthly_payment(principal: float, months: int, apr: float) -> float:  
-    """Amortized monthly payment (APR as a decimal, e.g. 0.18 for 18%)."""
-    if principal <= 0 or months <= 0:
-        return 0.0
-    r = apr / 12.0
-    if r <= 0:
-        return principal / months
-    return principal * (r / (1 - (1 + r) ** (-months)))
+def monthly_payment(principal, months, apr):
+    """
+    Amortized monthly payment (APR as a decimal, e.g. 0.18 for 18%).
+    Broadcasts over NumPy arrays; scalar inputs give a float.
+    """
+    p = np.asarray(principal, dtype=np.float64)
+    n = np.asarray(months, dtype=np.float64)
+    r = np.asarray(apr, dtype=np.float64) / 12.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amortized = np.where(r > 0, p * (r / (1 - (1 + r) ** (-n))), p / n)
+    out = np.where((p <= 0) | (n <= 0), 0.0, amortized)
+    return float(out) if out.ndim == 0 else out
+
+def payment_inc_ratio(payment, monthly_income: float | None, base_ratio: float):
+    """
+    payment_inc_ratio (%) for a new monthly payment; without an income, a rough
+    floor. Capped at the float32 maximum the model can take (tiny incomes).
+    """
+    if monthly_income is not None and monthly_income > 0:
+        return np.minimum(payment / float(monthly_income) * 100.0, F32_MAX)
+    return np.minimum(np.maximum(base_ratio, payment * 0.10), F32_MAX)
+
+def _decision(prob: float) -> str:
+    if prob <= THRESH_APPROVE:
+        return "APPROVE"
+    if prob < THRESH_REJECT:
+        return "CONDITIONAL"
+    return "REJECT"
+
+# /predict_simple: everything except grade and the loan/income ratio is fixed
+SIMPLE_DEFAULTS = {
+    "delinq_2yrs": 0,
+    "delinq_2yrs_zero": 1,
+    "emp_length_num": 5,
+    "home_ownership": "RENT",
+    "inq_last_6mths": 0,
+    "last_delinq_none": 1,
+    "last_major_derog_none": 1,
+    "open_acc": 5,
+    "pub_rec": 0,
+    "pub_rec_zero": 1,
+    "purpose": "credit card",
+    "revol_util": 30,
+    "short_emp": 0,
+    "sub_grade_num": 10,
+}
+SIMPLE_GRADES = ["A", "B", "C", "D", "E", "F", "G"]
+
+def _simple_grade(credit_score: int) -> str:
+    if credit_score >= 760: return "A"
+    if credit_score >= 700: return "B"
+    if credit_score >= 660: return "C"
+    if credit_score >= 620: return "D"
+    if credit_score >= 580: return "E"
+    if credit_score >= 540: return "F"
+    return "G"
+
+def _simple_features(grade: str, dti_pct: float) -> dict:
+    return {**SIMPLE_DEFAULTS, "grade": grade, "dti": dti_pct, "payment_inc_ratio": dti_pct}
 
 # Rough APR anchors by grade
 APR_BY_GRADE = {
@@ -58,6 +251,7 @@ APR_BY_GRADE = {
 # FastAPI app
 # ------------------------------------------------------------------------------
 app = FastAPI(title="Credit Scoring API", version="1.1.0")
+app.router.route_class = InstrumentedRoute  # per-route request/latency metrics
 
 # CORS
 app.add_middleware(
@@ -68,13 +262,65 @@ app.add_middleware(
 # Serve the demo UI
 app.mount("/ui", StaticFiles(directory="web", html=True), name="ui")
 
+class ModelVersionHeader:
+    """
+    Pure ASGI middleware adding X-Model-Version to every HTTP response: the
+    version the request was scored with, else the current model's.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        served = {"version": None}
+
+        async def send_with_version(message):
+            if message["type"] == "http.response.start":
+                version = served["version"] or getattr(model, "version", None)
+                if version:
+                    message["headers"] = [*message.get("headers", ()),
+                                          (b"x-model-version", version.encode("latin-1"))]
+            await send(message)
+
+        token = _served_version.set(served)
+        try:
+            await self.app(scope, receive, send_with_version)
+        finally:
+            _served_version.reset(token)
+
+app.add_middleware(ModelVersionHeader)
+
+app.add_middleware(AdmissionMiddleware, get_controller=lambda: admission)
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    # FastAPI's default handler, except that rejected inf/NaN inputs are echoed
+    # as strings ("inf") instead of failing JSON encoding with a 500
+    errors = jsonable_encoder(
+        exc.errors(), custom_encoder={float: lambda v: v if math.isfinite(v) else str(v)}
+    )
+    return JSONResponse(status_code=422, content={"detail": errors})
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/ui/")
     
 @app.on_event("startup")
 def on_startup() -> None:
-    _load_model()
+    global reloader
+    if not _preloaded:
+        _load_model()
+    reloader = ModelReloader(MODEL_PATH, _build_model, _swap_model, poll_seconds=MODEL_POLL_SECONDS)
+    reloader.version = model.version  # type: ignore
+    reloader.start()
+    log.info(
+        "Startup: imports %.1f ms (model module %.1f ms), model load %.1f ms",
+        STARTUP_TIMINGS["import_ms"],
+        STARTUP_TIMINGS["model_module_import_ms"],
+        STARTUP_TIMINGS["model_load_ms"],
+    )
     try:
         info = model.get_info()  # type: ignore
         top = info.get("top_features", [])[:10]  
@@ -86,35 +332,129 @@ def on_startup() -> None:
     except Exception as e:
         log.warning("Could not log model importances: %s", e)
 
+@app.on_event("startup")
+async def start_batcher() -> None:
+    global batcher
+    if MICROBATCH:
+        b = MicroBatcher(MICROBATCH_MAX_SIZE, MICROBATCH_MAX_WAIT_MS)
+        await b.start()
+        batcher = b
+        log.info("Micro-batching on (max batch %d, max wait %.1f ms)",
+                 MICROBATCH_MAX_SIZE, MICROBATCH_MAX_WAIT_MS)
+
+def _admission_limits() -> dict:
+    default = RouteLimit(ADMISSION_MAX_INFLIGHT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT_MS / 1000)
+    limits = {route: default for route in SCORING_ROUTES}
+    limits.update(parse_route_limits(ADMISSION_ROUTE_LIMITS, default))
+    return limits
+
+@app.on_event("startup")
+async def start_admission() -> None:
+    global admission
+    admission = AdmissionController(_admission_limits()) if ADMISSION else None
+    if admission is not None:
+        log.info("Admission control on: %s", {
+            r: f"{g.limit.limit} in flight, {g.limit.queue} queued" for r, g in admission.gates.items()
+        })
+
+@app.on_event("startup")
+async def start_heartbeat() -> None:
+    global _heartbeat_task
+    if worker_table is not None:
+        from src.api.prefork import heartbeat
+        from src.api.instrumentation import REQUESTS
+        _heartbeat_task = asyncio.create_task(
+            heartbeat(worker_table, worker_slot, worker_heartbeat_s, REQUESTS.total)
+        )
+
+@app.on_event("startup")
+async def start_chat() -> None:
+    global chat
+    c = ChatProxy(
+        CHAT_UPSTREAM_URL, model=CHAT_MODEL, timeout=CHAT_TIMEOUT,
+        max_connections=CHAT_MAX_CONNECTIONS, max_keepalive=CHAT_MAX_CONNECTIONS,
+        cache_size=CHAT_CACHE_SIZE, cache_ttl=CHAT_CACHE_TTL,
+    )
+    await c.start()
+    chat = c
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    global batcher, chat, admission, _heartbeat_task
+    admission = None
+    if _heartbeat_task is not None:
+        t, _heartbeat_task = _heartbeat_task, None
+        t.cancel()
+    if reloader is not None:
+        reloader.stop()
+    if batcher is not None:
+        b, batcher = batcher, None
+        await b.stop()
+    if chat is not None:
+        c, chat = chat, None
+        await c.stop()
+
 # ------------------------------------------------------------------------------
 # Schemas
 # ------------------------------------------------------------------------------
 Grade = Literal["A", "B", "C", "D", "E", "F", "G"]
 Home  = Literal["RENT", "MORTGAGE", "OWN", "OTHER"]
+F32_MAX = float(np.finfo(np.float32).max)  # the model casts features to float32
+I64_MAX = 2**63 - 1
     
 class PredictIn(BaseModel):
-    delinq_2yrs: int = Field(ge=0)
+    # inf/NaN (e.g. 1e999) and numbers that overflow float32/int64 (e.g.
+    # 1e308) can't be scored: reject them as validation errors
+    model_config = ConfigDict(allow_inf_nan=False)
+
+    delinq_2yrs: int = Field(ge=0, le=I64_MAX)
     delinq_2yrs_zero: int = Field(ge=0, le=1)
-    dti: float = Field(ge=0)
-    emp_length_num: int = Field(ge=0)
+    dti: float = Field(ge=0, le=F32_MAX)
+    emp_length_num: int = Field(ge=0, le=I64_MAX)
     grade: Grade
     home_ownership: Home
-    inq_last_6mths: int = Field(ge=0)  
+    inq_last_6mths: int = Field(ge=0, le=I64_MAX)  
     last_delinq_none: int = Field(ge=0, le=1)
     last_major_derog_none: int = Field(ge=0, le=1)
-    open_acc: int = Field(ge=0)
-    payment_inc_ratio: float = Field(ge=0)
-    pub_rec: int = Field(ge=0)
+    open_acc: int = Field(ge=0, le=I64_MAX)
+    payment_inc_ratio: float = Field(ge=0, le=F32_MAX)
+    pub_rec: int = Field(ge=0, le=I64_MAX)
     pub_rec_zero: int = Field(ge=0, le=1)
     purpose: str
-    revol_util: float = Field(ge=0)
+    revol_util: float = Field(ge=0, le=F32_MAX)
     short_emp: int = Field(ge=0, le=1)
-    sub_grade_num: int = Field(ge=0)
+    sub_grade_num: int = Field(ge=0, le=I64_MAX)
             
+PREDICT_PARSER = RowParser(PredictIn)
+
 class PredictOut(BaseModel):
     prob_default: float
     decision: Literal["APPROVE", "CONDITIONAL", "REJECT"]
         
+class PredictBatchItem(BaseModel):
+    index: int
+    prob_default: Optional[float] = None
+    decision: Optional[Literal["APPROVE", "CONDITIONAL", "REJECT"]] = None
+    errors: Optional[List[dict]] = None
+
+class PredictBatchOut(BaseModel):
+    results: List[PredictBatchItem]
+
+class Contribution(BaseModel):
+    feature: str
+    shap_value: float
+
+class ExplainOut(PredictOut):
+    base_value: float
+    contributions: List[Contribution]
+
+class ExplainBatchItem(PredictBatchItem):
+    contributions: Optional[List[Contribution]] = None
+
+class ExplainBatchOut(BaseModel):
+    base_value: float
+    results: List[ExplainBatchItem]
+
 class PredictSimpleIn(BaseModel):
     age: int = Field(..., ge=18)
     income: float = Field(..., ge=0)
@@ -122,84 +462,243 @@ class PredictSimpleIn(BaseModel):
     credit_score: int = Field(..., ge=300, le=850)
 
 class PredictInExtended(PredictIn):
-    loan_amount: Optional[float] = Field(default=None, ge=0)
+    loan_amount: Optional[float] = Field(default=None, ge=0, le=F32_MAX)
     term: Optional[int] = Field(default=36, ge=1)
     monthly_income: Optional[float] = Field(default=None, ge=0)  
     
+class LoanGridIn(PredictIn):
+    loan_amount_min: float = Field(ge=0, le=F32_MAX)
+    loan_amount_max: float = Field(ge=0, le=F32_MAX)
+    loan_amount_steps: int = Field(default=25, ge=1)
+    terms: List[int] = Field(default=[36, 60], min_length=1)
+    monthly_income: Optional[float] = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def _check_ranges(self):
+        if self.loan_amount_max < self.loan_amount_min:
+            raise ValueError("loan_amount_max must be >= loan_amount_min")
+        if any(t < 1 for t in self.terms):
+            raise ValueError("terms must be >= 1")
+        return self
+
+class LoanGridOut(BaseModel):
+    loan_amounts: List[float]
+    terms: List[int]
+    monthly_payment: List[List[float]]
+    prob_default: List[List[float]]
+    decision: List[List[Literal["APPROVE", "CONDITIONAL", "REJECT"]]]
+    max_approvable: List[Optional[float]]
+    max_approvable_amount: Optional[float] = None
+    max_approvable_term: Optional[int] = None
+
 # ------------------------------------------------------------------------------
 # Endpoints
 # ------------------------------------------------------------------------------
 @app.get("/health")
 @app.get("/healthz")
-def health():
+async def health():
+    # async: answered on the event loop, never behind scoring work in the threadpool
     return {"status": "ok", "model_loaded": model is not None}
     
+def _cache_metrics() -> list:
+    m = model
+    stats = m.cache.stats() if m is not None and m.cache is not None else None
+    if stats is None:
+        return []
+    lines = []
+    for key in ("hits", "misses", "evictions", "expirations"):
+        name = f"prediction_cache_{key}_total"
+        lines += [f"# TYPE {name} counter", f"{name} {stats[key]}"]
+    lines += ["# TYPE prediction_cache_size gauge", f"prediction_cache_size {stats['size']}"]
+    return lines
+
+REGISTRY.add_collector(_cache_metrics)
+
+def _batcher_metrics() -> list:
+    b = batcher
+    if b is None:
+        return []
+    return ["# TYPE microbatch_queue_depth gauge", f"microbatch_queue_depth {b.queue_depth}"]
+
+REGISTRY.add_collector(_batcher_metrics)
+
+def _admission_metrics() -> list:
+    a = admission
+    return a.metric_lines() if a is not None else []
+
+REGISTRY.add_collector(_admission_metrics)
+
+@app.get("/workers")
+def workers():
+    """Prefork worker table (heartbeat, state, requests, memory) as seen by this worker."""
+    if worker_table is None:
+        return {"prefork": False, "this_worker": os.getpid(), "workers": []}
+    from src.api.prefork import private_and_shared_kb
+    table = worker_table.snapshot()
+    for w in table:
+        w.update(private_and_shared_kb(w["pid"]))
+    return {"prefork": True, "this_worker": os.getpid(), "workers": table}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of the in-process metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/model_info")
 def model_info():
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    return model.get_info()
+    m = _require_model()
+    info = m.get_info()
+    info["version"] = m.version
+    info["cache"] = m.cache.stats() if m.cache is not None else None
+    info["explain_cache"] = m.explain_cache.stats() if m.explain_cache is not None else None
+    info["startup"] = STARTUP_TIMINGS
+    info["admission"] = admission.stats() if admission is not None else None
+    return info
             
 @app.post("/predict", response_model=PredictOut)
-def predict(payload: PredictIn):
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    prob = float(model.predict(payload.model_dump()))
-    prob = max(0.0, min(1.0, prob))
-    if prob <= THRESH_APPROVE:
-        decision = "APPROVE"
-    elif prob < THRESH_REJECT:
-        decision = "CONDITIONAL"
-    else:
-        decision = "REJECT"
-    return {"prob_default": prob, "decision": decision}
+@timed_endpoint
+async def predict(payload: PredictIn):
+    m = _require_model()
+    prob = await _score(m, payload.model_dump())
+    return {"prob_default": prob, "decision": _decision(prob)}
+
+@app.post(
+    "/predict_fast",
+    response_model=PredictOut,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": PredictIn.model_json_schema()}}}},
+)
+async def predict_fast(request: Request):
+    """
+    /predict without pydantic models or FastAPI's JSON encoding: the body is
+    checked against PredictIn's constraints in place (see src/api/fastpath.py)
+    and the response is written with orjson. Same inputs, outputs and 422s.
+    """
+    m = _require_model()
+    t0 = time.perf_counter_ns()
+    row = PREDICT_PARSER.parse(await request.body(), request.headers.get("content-type"))
+    observe_stage("validate", time.perf_counter_ns() - t0)
+    prob = await _score(m, row)
+    t0 = time.perf_counter_ns()
+    body = dumps({"prob_default": prob, "decision": _decision(prob)})
+    observe_stage("serialize", time.perf_counter_ns() - t0)
+    return Response(body, media_type="application/json")
+
+def _validate_records(payload: list) -> tuple[list[dict], list[int], list[dict]]:
+    """
+    Validate each record against PredictIn on its own. Returns per-record
+    result stubs ({"index"} or {"index", "errors"}), the indices of the valid
+    records and their dumped rows.
+    """
+    results: list[dict] = []
+    valid_idx: list[int] = []
+    valid_rows: list[dict] = []
+    for i, record in enumerate(payload):
+        try:
+            row = PredictIn.model_validate(record).model_dump()
+        except ValidationError as e:
+            errors = [
+                {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+                for err in e.errors()
+            ]
+            results.append({"index": i, "errors": errors})
+            continue
+        results.append({"index": i})
+        valid_idx.append(i)
+        valid_rows.append(row)
+    return results, valid_idx, valid_rows
+
+@app.post("/predict_batch", response_model=PredictBatchOut)
+@timed_endpoint
+def predict_batch(payload: List[Any]):
+    """
+    Score many applicants in one call. Each record is validated against
+    PredictIn on its own; invalid records are reported with their errors
+    and the rest of the batch is still scored. Results keep input order.
+    """
+    m = _require_model()
+    if len(payload) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413, detail=f"Batch too large (max {MAX_BATCH_SIZE} records)"
+        )
+
+    results, valid_idx, valid_rows = _validate_records(payload)
+    probs = m.predict_many(valid_rows)
+    for i, prob in zip(valid_idx, probs):
+        prob = max(0.0, min(1.0, float(prob)))
+        results[i]["prob_default"] = prob
+        results[i]["decision"] = _decision(prob)
+    return {"results": results}
     
-@app.post("/predict_simple", response_model=PredictOut)
-def predict_simple(simple: PredictSimpleIn):
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
+def _contributions(expl: dict) -> list[dict]:
+    return [{"feature": k, "shap_value": v} for k, v in expl.items()]
 
-    monthly_income = simple.income / 12.0 if simple.income > 0 else 0.0
-    grade = "B"
-    if simple.credit_score >= 760: grade = "A"
-    elif simple.credit_score >= 700: grade = "B"
-    elif simple.credit_score >= 660: grade = "C"
-    elif simple.credit_score >= 620: grade = "D"
-    elif simple.credit_score >= 580: grade = "E"
-    elif simple.credit_score >= 540: grade = "F"
-    else: grade = "G"
+@app.post("/explain", response_model=ExplainOut)
+@timed_endpoint
+def explain(payload: PredictIn, top_k: Optional[int] = Query(default=None, ge=1)):
+    """
+    Score one applicant and return its positive-class SHAP contributions
+    (all features in model order, or the top_k by magnitude, largest first).
+    """
+    m = _require_model()
+    row = payload.model_dump()
+    try:
+        expl = m.explain_many([row], top_k=top_k)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    prob = max(0.0, min(1.0, float(m.predict(row))))
+    return {
+        "prob_default": prob,
+        "decision": _decision(prob),
+        "base_value": m.expected_value,
+        "contributions": _contributions(expl),
+    }
 
+@app.post("/explain_batch", response_model=ExplainBatchOut)
+@timed_endpoint
+def explain_batch(payload: List[Any], top_k: Optional[int] = Query(default=None, ge=1)):
+    """
+    /explain for many records: one SHAP call for all valid records. Invalid
+    records are reported with their errors, as in /predict_batch.
+    """
+    m = _require_model()
+    if len(payload) > MAX_EXPLAIN_BATCH:
+        raise HTTPException(
+            status_code=413, detail=f"Batch too large (max {MAX_EXPLAIN_BATCH} records)"
+        )
+    results, valid_idx, valid_rows = _validate_records(payload)
+    try:
+        expls = m.explain_many(valid_rows, top_k=top_k)
+        base_value = m.expected_value
+    except ValueError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    probs = m.predict_many(valid_rows)
+    for i, prob, expl in zip(valid_idx, probs, expls):
+        prob = max(0.0, min(1.0, float(prob)))
+        results[i].update(
+            prob_default=prob, decision=_decision(prob), contributions=_contributions(expl)
+        )
+    return {"base_value": base_value, "results": results}
+
+@app.post("/predict_simple", response_model=PredictOut)
+@timed_endpoint
+async def predict_simple(simple: PredictSimpleIn):
+    m = _require_model()
+
+    grade = _simple_grade(simple.credit_score)
     dti_pct = (simple.loan_amount / simple.income * 100.0) if simple.income > 0 else 0.0
-        
-    features = {
-        "delinq_2yrs": 0,
-        "delinq_2yrs_zero": 1,
-        "dti": dti_pct,
-        "emp_length_num": 5,  
-        "grade": grade,
-        "home_ownership": "RENT",
-        "inq_last_6mths": 0,
-        "last_delinq_none": 1,
-        "last_major_derog_none": 1,
-        "open_acc": 5,
-        "payment_inc_ratio": dti_pct,
-        "pub_rec": 0,
-        "pub_rec_zero": 1,
-        "purpose": "credit card",
-        "revol_util": 30,
-        "short_emp": 0,
-        "sub_grade_num": 10,
-    }
-    
-    prob = float(model.predict(features))
+
+    surface = m.surfaces.get("predict_simple")
+    prob = surface.lookup(grade, dti_pct) if surface is not None else None
+    if prob is None:
+        prob = await _score(m, _simple_features(grade, dti_pct))
     prob = max(0.0, min(1.0, prob))
-    decision = "APPROVE" if prob <= THRESH_APPROVE else ("CONDITIONAL" if prob < THRESH_REJECT else "REJECT")
-    return {"prob_default": prob, "decision": decision}
+    return {"prob_default": prob, "decision": _decision(prob)}
     
 @app.post("/predict_loan", response_model=PredictOut)
-def predict_loan(payload: PredictInExtended):
-    if model is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
+@timed_endpoint
+async def predict_loan(payload: PredictInExtended):
+    m = _require_model()
     
     feats = payload.model_dump()
     loan_amount = feats.pop("loan_amount", None)
@@ -209,61 +708,121 @@ def predict_loan(payload: PredictInExtended):
     if loan_amount is not None:
         apr = APR_BY_GRADE.get(feats.get("grade", "C"), 0.20)
         pmt = monthly_payment(float(loan_amount), term, apr)
-        
         base_pir = float(feats.get("payment_inc_ratio", 0.0))
-        if monthly_income is not None and monthly_income > 0:
-            new_pir = (pmt / float(monthly_income)) * 100.0
-        else:
-            new_pir = max(base_pir, pmt * 0.10)
+        feats["payment_inc_ratio"] = float(payment_inc_ratio(pmt, monthly_income, base_pir))
     
-        feats["payment_inc_ratio"] = new_pir
-    
-    prob = float(model.predict(feats))
-    prob = max(0.0, min(1.0, prob))
-    decision = "APPROVE" if prob <= THRESH_APPROVE else ("CONDITIONAL" if prob < THRESH_REJECT else "REJECT")
-    return {"prob_default": prob, "decision": decision}
+    prob = await _score(m, feats)
+    return {"prob_default": prob, "decision": _decision(prob)}
+
+@app.post("/predict_loan_grid", response_model=LoanGridOut)
+@timed_endpoint
+def predict_loan_grid(payload: LoanGridIn):
+    """
+    /predict_loan over a grid of loan amounts x terms, scored in one batch.
+    Grids are indexed [term][amount]. max_approvable is, per term, the
+    largest amount up to which every grid amount is approved (None if the
+    smallest isn't).
+    """
+    m = _require_model()
+    feats = payload.model_dump()
+    lo, hi = feats.pop("loan_amount_min"), feats.pop("loan_amount_max")
+    steps, terms = feats.pop("loan_amount_steps"), feats.pop("terms")
+    monthly_income = feats.pop("monthly_income")
+    if steps * len(terms) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413, detail=f"Grid too large (max {MAX_BATCH_SIZE} points)"
+        )
+
+    amounts = np.linspace(lo, hi, steps)
+    apr = APR_BY_GRADE.get(feats["grade"], 0.20)
+    pmt = monthly_payment(amounts[None, :], np.asarray(terms)[:, None], apr)
+    ratios = payment_inc_ratio(pmt, monthly_income, float(feats["payment_inc_ratio"]))
+    rows = [{**feats, "payment_inc_ratio": r} for r in ratios.ravel().tolist()]
+    probs = np.clip(m.predict_many(rows), 0.0, 1.0).reshape(pmt.shape)
+
+    approved = np.logical_and.accumulate(probs <= THRESH_APPROVE, axis=1).sum(axis=1)
+    per_term = [float(amounts[k - 1]) if k else None for k in approved.tolist()]
+    best = int(np.argmax(approved))
+    prob_grid = probs.tolist()
+    return {
+        "loan_amounts": amounts.tolist(),
+        "terms": terms,
+        "monthly_payment": pmt.tolist(),
+        "prob_default": prob_grid,
+        "decision": [[_decision(p) for p in row] for row in prob_grid],
+        "max_approvable": per_term,
+        "max_approvable_amount": per_term[best],
+        "max_approvable_term": terms[best] if per_term[best] is not None else None,
+    }
+
+# ------------------------------------------------------------------------------
+# Admin: hot model reload
+# ------------------------------------------------------------------------------
+def _check_admin(token: Optional[str]) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints disabled (ADMIN_TOKEN not set)")
+    if not hmac.compare_digest((token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    if reloader is None:
+        raise HTTPException(status_code=503, detail="Reloader not started")
+
+@app.get("/admin/reload")
+def admin_reload_status(x_admin_token: Optional[str] = Header(default=None)):
+    _check_admin(x_admin_token)
+    return {**reloader.status, "current_version": getattr(model, "version", None)}  # type: ignore
+
+@app.post("/admin/reload")
+def admin_reload(
+    wait: bool = False,
+    force: bool = True,
+    x_admin_token: Optional[str] = Header(default=None),
+):
+    """
+    Load MODEL_PATH again in the background, warm it up and swap it in.
+    In-flight requests finish on the previous model. force=false skips the
+    swap when the file's fingerprint is unchanged. Under prefork this asks
+    the parent for a rolling restart of all workers (202, no wait).
+    """
+    _check_admin(x_admin_token)
+    if worker_table is not None:
+        # Prefork: reloading here would only update this worker; have the
+        # parent reload the model and roll every worker instead
+        os.kill(os.getppid(), signal.SIGHUP)
+        return JSONResponse(status_code=202, content={"state": "rolling_restart"})
+    status = reloader.reload(force=force, wait=wait)  # type: ignore
+    if status["state"] == "failed":
+        return JSONResponse(status_code=500, content=status)
+    if status["state"] in ("reloading", "busy"):
+        return JSONResponse(status_code=202, content=status)
+    return status
 
 # ------------------------------------------------------------------------------
 # Cerebras AI Chat endpoint
 # ------------------------------------------------------------------------------
 class ChatIn(BaseModel):
     messages: list[dict]
+    stream: bool = False
 
 @app.post("/api/ai-chat")
+@timed_endpoint
 async def ai_chat(body: ChatIn):
+    """
+    Chat completion through the shared upstream client. stream=true relays
+    the upstream's server-sent events as they arrive.
+    """
     CEREBRAS_API_KEY = os.getenv("CEREBRAS_API_KEY")
     if not CEREBRAS_API_KEY:
         raise HTTPException(status_code=500, detail="Cerebras API key not set")
-
-    url = "https://api.cerebras.ai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {CEREBRAS_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": "llama3.1-8b",
-        "temperature": 0.2,
-        "stream": False,
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You are the AI helper for a Credit Scoring demo website. "
-                    "Explain grades/subgrades, DTI, credit utilization, delinquencies, "
-                    "employment length, open accounts, etc. "
-                    "Educational guidance only; no financial advice."
-                ),
-            },
-            *body.messages,
-        ],
-    }
+    if chat is None:
+        raise HTTPException(status_code=503, detail="Chat client not started")
 
     try:
-        async with httpx.AsyncClient() as client:
-            r = await client.post(url, headers=headers, json=payload, timeout=30.0)
-            r.raise_for_status()
-            return r.json()
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        if body.stream:
+            events = await chat.open_stream(body.messages, CEREBRAS_API_KEY)
+            return StreamingResponse(
+                events, media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+        return await chat.complete(body.messages, CEREBRAS_API_KEY)
+    except ChatUpstreamError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
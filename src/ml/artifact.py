@@ -0,0 +1,294 @@
+# src/ml/artifact.py
+"""
+Versioned model artifact: a directory with a JSON manifest and the flattened
+forest as raw .npy files.
+
+    credit_model/
+      manifest.json        schema version, features, vocabularies, thresholds,
+                           per-array sha256 and an overall checksum
+      arrays/*.npy         FlatForest node arrays, loaded with mmap_mode="r"
+                           (float64, or float32 with compact indices for
+                           compressed models, see src/ml/compress.py)
+      estimator.joblib     optional sklearn estimator (large batches, explanations,
+                           retraining)
+
+Serving only reads the manifest and memory-maps the arrays, so every worker
+process on a host shares the same pages through the OS page cache instead
+of unpickling its own copy of the forest. The bundled estimator is read on
+the first batch larger than CreditScoringModel.FLAT_MAX_ROWS, where sklearn's
+compiled traversal is faster.
+
+Convert an existing joblib pickle:
+
+    python -m src.ml.artifact convert models/credit_model.pkl models/credit_model
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from src.ml.forest import FlatForest
+
+FORMAT_NAME = "credit-scoring-model"
+SCHEMA_VERSION = 2  # v2: forest.precision, float32 arrays with int32/int16 indices
+MANIFEST = "manifest.json"
+ESTIMATOR_FILE = "estimator.joblib"
+ARRAY_NAMES = ("feature", "threshold", "children", "value", "roots")
+OPTIONAL_ARRAYS = ("cover",)  # node covers for native TreeSHAP; absent in older artifacts
+
+
+def is_artifact(path: str) -> bool:
+    """True for an artifact directory (or its manifest.json)."""
+    if os.path.basename(path) == MANIFEST:
+        return os.path.isfile(path)
+    return os.path.isfile(os.path.join(path, MANIFEST))
+
+
+def _artifact_dir(path: str) -> str:
+    return os.path.dirname(path) if os.path.basename(path) == MANIFEST else path
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _combined_checksum(arrays: dict) -> str:
+    h = hashlib.sha256()
+    for name in sorted(arrays):
+        h.update(f"{name}:{arrays[name]['sha256']};".encode())
+    return h.hexdigest()
+
+
+def _compact_arrays(arrays: dict, n_features: int) -> dict:
+    """Narrow the index arrays of a float32 forest (values are already float32)."""
+    out = dict(arrays)
+    if out["children"].size < np.iinfo(np.int32).max:
+        out["children"] = out["children"].astype(np.int32)
+    if n_features <= np.iinfo(np.int16).max:
+        out["feature"] = out["feature"].astype(np.int16)
+    if "cover" in out:
+        out["cover"] = out["cover"].astype(np.float32)
+    return out
+
+
+# ------------------------------------------------------------------------- #
+# Save / load
+# ------------------------------------------------------------------------- #
+def save_artifact(model, path: str, thresholds: dict | None = None,
+                  include_estimator: bool = True, precision: str = "float64",
+                  compression: dict | None = None) -> dict:
+    """
+    Write a trained CreditScoringModel as an artifact directory.
+    precision="float32" stores float32 thresholds/leaf values and narrower
+    index arrays; such artifacts always load as float32 forests.
+    compression is recorded as-is in the manifest. Returns the manifest.
+    """
+    if not model.is_trained:
+        raise ValueError("No trained model to save")
+    if model.encoder is None:
+        raise ValueError("Model preprocessing can't be compiled; keep the joblib format")
+
+    forest = model.forest
+    if forest is None or forest.precision != precision:
+        forest = FlatForest.from_sklearn(model.model, precision=precision)
+    node_arrays = forest.to_arrays()
+    if precision == "float32":
+        node_arrays = _compact_arrays(node_arrays, forest.n_features)
+
+    os.makedirs(os.path.join(path, "arrays"), exist_ok=True)
+    arrays = {}
+    for name, arr in node_arrays.items():
+        rel = f"arrays/{name}.npy"
+        full = os.path.join(path, rel)
+        np.save(full, np.ascontiguousarray(arr))
+        arrays[name] = {
+            "file": rel,
+            "dtype": str(arr.dtype),
+            "shape": list(arr.shape),
+            "sha256": _sha256(full),
+        }
+
+    est = model.model
+    weights, kind = None, None
+    if hasattr(est, "feature_importances_"):
+        weights, kind = [float(w) for w in est.feature_importances_], "feature_importances_"
+    manifest = {
+        "format": FORMAT_NAME,
+        "schema_version": SCHEMA_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "estimator_cls": type(est).__name__,
+        "features": list(model.features),
+        "numerical_cols": list(model.numerical_cols),
+        "categorical_cols": list(model.categorical_cols),
+        "feature_names": list(model.feature_names or []),
+        "vocabularies": model.encoder.vocabularies(),
+        "thresholds": thresholds or {},
+        "forest": {
+            "n_trees": forest.n_trees,
+            "n_nodes": forest.n_nodes,
+            "max_depth": forest.max_depth,
+            "n_features": forest.n_features,
+            "precision": forest.precision,
+        },
+        "compression": compression,
+        "weights_kind": kind,
+        "weights": weights,
+        "arrays": arrays,
+        "estimator": None,
+    }
+    if include_estimator:
+        import joblib
+        full = os.path.join(path, ESTIMATOR_FILE)
+        joblib.dump(model.model, full)
+        manifest["estimator"] = {"file": ESTIMATOR_FILE, "sha256": _sha256(full)}
+    manifest["checksum"] = _combined_checksum(arrays)
+
+    tmp = os.path.join(path, MANIFEST + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(path, MANIFEST))  # manifest last: readers never see a partial artifact
+    return manifest
+
+
+def read_manifest(path: str) -> dict:
+    with open(os.path.join(_artifact_dir(path), MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_NAME:
+        raise ValueError(f"{path} is not a {FORMAT_NAME} artifact")
+    if manifest.get("schema_version", 0) > SCHEMA_VERSION:
+        raise ValueError(
+            f"Artifact schema v{manifest['schema_version']} is newer than supported v{SCHEMA_VERSION}"
+        )
+    return manifest
+
+
+def verify_artifact(path: str, manifest: dict | None = None) -> None:
+    """Check every array file against the manifest; raises ValueError on mismatch."""
+    root = _artifact_dir(path)
+    manifest = manifest or read_manifest(root)
+    for name, entry in manifest["arrays"].items():
+        if _sha256(os.path.join(root, entry["file"])) != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch for array {name!r} in {root}")
+    if _combined_checksum(manifest["arrays"]) != manifest["checksum"]:
+        raise ValueError(f"Manifest checksum mismatch in {root}")
+
+
+def load_artifact(path: str, mmap_mode: str | None = "r", verify: bool = True) -> dict:
+    """
+    Read the manifest and the forest arrays (memory-mapped by default).
+    Returns {"manifest": {...}, "arrays": {name: ndarray}, "path": dir}.
+    """
+    root = _artifact_dir(path)
+    manifest = read_manifest(root)
+    if verify:
+        verify_artifact(root, manifest)
+
+    arrays = {}
+    for name in ARRAY_NAMES + OPTIONAL_ARRAYS:
+        if name in OPTIONAL_ARRAYS and name not in manifest["arrays"]:
+            continue
+        entry = manifest["arrays"][name]
+        arr = np.load(os.path.join(root, entry["file"]), mmap_mode=mmap_mode, allow_pickle=False)
+        if list(arr.shape) != entry["shape"] or str(arr.dtype) != entry["dtype"]:
+            raise ValueError(f"Array {name!r} in {root} doesn't match the manifest")
+        # Plain ndarray view over the mapping (no memmap subclass overhead)
+        arrays[name] = np.asarray(arr)
+    return {"manifest": manifest, "arrays": arrays, "path": root}
+
+
+def forest_from_artifact(loaded: dict, precision: str = "float64") -> FlatForest:
+    """FlatForest over the loaded arrays; float32 artifacts stay float32."""
+    meta = loaded["manifest"]["forest"]
+    if meta.get("precision", "float64") == "float32":
+        precision = "float32"
+    return FlatForest.from_arrays(
+        **loaded["arrays"],
+        max_depth=meta["max_depth"],
+        n_features=meta["n_features"],
+        precision=precision,
+    )
+
+
+# ------------------------------------------------------------------------- #
+# CLI
+# ------------------------------------------------------------------------- #
+def _cmd_convert(args) -> int:
+    from src.ml.credit_model import CreditScoringModel
+
+    m = CreditScoringModel()
+    m.load_model(args.src)
+    thresholds = {}
+    if args.thresh_approve is not None:
+        thresholds["approve"] = args.thresh_approve
+    if args.thresh_reject is not None:
+        thresholds["reject"] = args.thresh_reject
+    manifest = save_artifact(
+        m, args.dst, thresholds=thresholds, include_estimator=not args.no_estimator
+    )
+    verify_artifact(args.dst, manifest)
+
+    # Round-trip check: the artifact must score exactly like the source model
+    rows = [dict(zip(m.features, r)) for r in probe_rows(m)]
+    converted = CreditScoringModel()
+    converted.load_model(args.dst)
+    if not np.array_equal(m.predict_many(rows), converted.predict_many(rows)):
+        print("ERROR: converted artifact does not reproduce the source predictions", file=sys.stderr)
+        return 1
+    print(f"Wrote {args.dst} (schema v{manifest['schema_version']}, checksum {manifest['checksum'][:12]})")
+    return 0
+
+
+def probe_rows(m, n: int = 64):
+    """Deterministic rows spanning every category, for conversion checks."""
+    rng = np.random.default_rng(0)
+    vocab = m.encoder.vocabularies()
+    for i in range(n):
+        row = []
+        for col in m.features:
+            if col in vocab:
+                row.append(vocab[col][i % len(vocab[col])])
+            else:
+                row.append(float(rng.uniform(0, 50)))
+        yield row
+
+
+def _cmd_inspect(args) -> int:
+    manifest = read_manifest(args.path)
+    if args.verify:
+        verify_artifact(args.path, manifest)
+    print(json.dumps({k: v for k, v in manifest.items() if k not in ("arrays", "weights")}, indent=2))
+    return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.ml.artifact", description="Model artifact tools")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    conv = sub.add_parser("convert", help="convert a joblib pickle into an artifact directory")
+    conv.add_argument("src", help="joblib model, e.g. models/credit_model.pkl")
+    conv.add_argument("dst", help="output directory, e.g. models/credit_model")
+    conv.add_argument("--no-estimator", action="store_true",
+                      help="don't bundle the sklearn estimator (no SHAP/retraining from the artifact)")
+    conv.add_argument("--thresh-approve", type=float, default=None)
+    conv.add_argument("--thresh-reject", type=float, default=None)
+    conv.set_defaults(func=_cmd_convert)
+
+    insp = sub.add_parser("inspect", help="print an artifact manifest")
+    insp.add_argument("path")
+    insp.add_argument("--verify", action="store_true", help="also verify array checksums")
+    insp.set_defaults(func=_cmd_inspect)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
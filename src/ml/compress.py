@@ -0,0 +1,317 @@
+# src/ml/compress.py
+"""
+Post-training compression of the forest for serving: keep fewer trees, cut
+every tree at a depth limit and store the result as a float32 artifact.
+
+    python -m src.ml.compress models/credit_model.pkl models/credit_model_compact \\
+        --trees 50 --max-depth 12 --data data/loans_dataset_30k.csv --out compress.json
+
+  - --trees N keeps the first N trees (bootstrap trees are exchangeable, and
+    the first N don't depend on the evaluation data).
+  - --max-depth D turns every node at depth D into a leaf predicting its own
+    training class mix, i.e. what a max_depth=D tree would have learned there.
+  - The output is an artifact directory (src/ml/artifact.py) with float32
+    thresholds and leaf values and int32/int16 index arrays. Thresholds are
+    rounded down to float32, so split decisions on the (float32) features
+    don't change; only leaf values lose precision (~1e-7).
+    load_model() reads it like any other artifact. A .pkl output keeps the
+    joblib format (fewer/shallower trees, no quantization).
+
+With --data, the holdout split of train_with_data is scored by both models
+and the report has the accuracy/AUC deltas next to the size, load time and
+latency savings. Accuracy uses a 0.5 cutoff; "decisions changed" uses the
+API's approve/reject thresholds (THRESH_APPROVE/THRESH_REJECT, else the
+source manifest, else 0.33/0.67).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.ml.artifact import is_artifact, probe_rows, save_artifact
+from src.utils.profiling import median_seconds
+
+if TYPE_CHECKING:
+    from src.ml.credit_model import CreditScoringModel
+
+PICKLE_SUFFIXES = (".pkl", ".joblib")
+
+
+# ------------------------------------------------------------------------- #
+# Tree surgery
+# ------------------------------------------------------------------------- #
+def cap_depth(tree, max_depth: int):
+    """
+    Copy of a fitted sklearn Tree with every node at max_depth made a leaf.
+    Nodes are renumbered breadth-first; a tree already within the limit is
+    returned unchanged.
+    """
+    from sklearn.tree._tree import TREE_LEAF, TREE_UNDEFINED, Tree
+
+    if tree.max_depth <= max_depth:
+        return tree
+    state = tree.__getstate__()
+    nodes = state["nodes"]
+    left, right = nodes["left_child"], nodes["right_child"]
+
+    levels, frontier = [], np.zeros(1, dtype=np.intp)
+    for _ in range(max_depth + 1):
+        levels.append(frontier)
+        split = frontier[left[frontier] != TREE_LEAF]
+        frontier = np.column_stack((left[split], right[split])).ravel()
+    keep = np.concatenate(levels)
+    new_id = np.full(len(nodes), TREE_LEAF, dtype=np.intp)
+    new_id[keep] = np.arange(keep.size)
+
+    pruned = nodes[keep].copy()
+    cut = np.zeros(keep.size, dtype=bool)
+    cut[keep.size - levels[-1].size:] = True
+    leaf = cut | (pruned["left_child"] == TREE_LEAF)
+    pruned["left_child"] = np.where(leaf, TREE_LEAF, new_id[pruned["left_child"]])
+    pruned["right_child"] = np.where(leaf, TREE_LEAF, new_id[pruned["right_child"]])
+    pruned["feature"][leaf] = TREE_UNDEFINED
+    pruned["threshold"][leaf] = TREE_UNDEFINED
+
+    state.update(nodes=pruned, values=state["values"][keep], node_count=keep.size,
+                 max_depth=max_depth)
+    out = Tree(tree.n_features, np.asarray(tree.n_classes, dtype=np.intp), tree.n_outputs)
+    out.__setstate__(state)
+    return out
+
+
+def compress_estimator(estimator, n_trees: int | None = None, max_depth: int | None = None):
+    """A copy of a fitted forest with the first n_trees trees, each capped at max_depth."""
+    import copy
+
+    if n_trees is not None and n_trees < 1:
+        raise ValueError("n_trees must be at least 1")
+    if max_depth is not None and max_depth < 1:
+        raise ValueError("max_depth must be at least 1")
+    keep = estimator.estimators_[:n_trees]
+    out = copy.copy(estimator)
+    out.estimators_ = []
+    for tree_est in keep:
+        small = copy.copy(tree_est)
+        if max_depth is not None:
+            small.tree_ = cap_depth(tree_est.tree_, max_depth)
+            small.max_depth = max_depth if tree_est.max_depth is None else min(
+                max_depth, tree_est.max_depth)
+        out.estimators_.append(small)
+    out.n_estimators = len(out.estimators_)
+    if max_depth is not None:
+        out.max_depth = max_depth if estimator.max_depth is None else min(
+            max_depth, estimator.max_depth)
+    generations = getattr(estimator, "tree_generation_", None)
+    if generations is not None:
+        out.tree_generation_ = np.asarray(generations)[:out.n_estimators]
+    return out
+
+
+def compress_model(model: "CreditScoringModel", n_trees: int | None = None,
+                   max_depth: int | None = None) -> "CreditScoringModel":
+    """A new CreditScoringModel sharing model's preprocessing, with a compressed forest."""
+    import copy
+
+    if not model.is_trained or model.model is None:
+        raise ValueError("Compression needs a trained model with its sklearn estimator")
+    out = copy.copy(model)
+    out.model = compress_estimator(model.model, n_trees, max_depth)
+    out.manifest = None
+    out.cache = None
+    out.explain_cache = None
+    out._explainer = None
+    out._estimator_path = None
+    out.surfaces = {}
+    out.set_backend("flat", "float32")
+    return out
+
+
+# ------------------------------------------------------------------------- #
+# Evaluation
+# ------------------------------------------------------------------------- #
+def holdout_matrix(model: "CreditScoringModel", data_url: str) -> tuple:
+    """(X, y) for the holdout split of train_with_data, in model's feature layout."""
+    from sklearn.model_selection import train_test_split
+
+    from src.ml.training import SPLIT_SEED, TARGET, TEST_SIZE, build_design_matrix, read_training_csv
+
+    frame = read_training_csv(data_url, model)
+    y = frame[TARGET].to_numpy(dtype=np.int8)
+    _, test_idx = train_test_split(
+        np.arange(len(frame)), test_size=TEST_SIZE, random_state=SPLIT_SEED, stratify=y
+    )
+    return build_design_matrix(frame, model.encoder, test_idx), y[test_idx]
+
+
+def path_bytes(path: str) -> int:
+    """Size of a file, or of every file under a directory."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f))
+               for root, _, files in os.walk(path) for f in files)
+
+
+def profile(path: str, X: np.ndarray, y: np.ndarray | None = None, reps: int = 50) -> dict:
+    """Load the model at path and record its size, load time, latency and holdout quality."""
+    from src.ml.credit_model import CreditScoringModel
+    from src.ml.forest import FlatForest
+
+    t0 = time.perf_counter()
+    m = CreditScoringModel()
+    m.load_model(path)
+    load_ms = (time.perf_counter() - t0) * 1e3
+    forest = m.forest or FlatForest.from_sklearn(m.model)
+
+    row, batch = np.ascontiguousarray(X[:1]), np.ascontiguousarray(X[:1000])
+    out = {
+        "path": path,
+        "bytes": path_bytes(path),
+        "n_trees": forest.n_trees,
+        "n_nodes": forest.n_nodes,
+        "max_depth": forest.max_depth,
+        "load_ms": load_ms,
+        "latency_ms": {
+            "row_1": median_seconds(lambda: m.predict_encoded(row), reps) * 1e3,
+            f"batch_{len(batch)}": median_seconds(lambda: m.predict_encoded(batch),
+                                                  max(3, reps // 10)) * 1e3,
+        },
+    }
+    if y is not None:
+        from sklearn.metrics import roc_auc_score
+
+        prob = np.asarray(m.predict_encoded(X), dtype=np.float64)
+        # Plain 0.5-cutoff accuracy; the API's decision bands are in compare()
+        out["accuracy"] = float(np.mean((prob > 0.5) == y))
+        out["auc"] = float(roc_auc_score(y, prob))
+        out["_prob"] = prob
+    return out
+
+
+def compare(original: dict, compressed: dict,
+            thresholds: tuple[float, float] | None = None) -> dict:
+    """
+    Quality deltas (compressed - original) and size/latency ratios.
+    decisions_changed is the share of holdout rows whose APPROVE/CONDITIONAL/
+    REJECT decision differs, under the (approve, reject) thresholds (default
+    0.33/0.67, as in the API).
+    """
+    from src.ml.score import DEFAULT_APPROVE, DEFAULT_REJECT, decide
+
+    approve, reject = thresholds or (DEFAULT_APPROVE, DEFAULT_REJECT)
+    report = {
+        "bytes_ratio": compressed["bytes"] / original["bytes"],
+        "nodes_ratio": compressed["n_nodes"] / original["n_nodes"],
+        "load_speedup": original["load_ms"] / compressed["load_ms"],
+        "latency_speedup": {k: original["latency_ms"][k] / compressed["latency_ms"][k]
+                            for k in original["latency_ms"]},
+    }
+    if "auc" in original:
+        a, b = original["_prob"], compressed["_prob"]
+        report.update(
+            accuracy_delta=compressed["accuracy"] - original["accuracy"],
+            auc_delta=compressed["auc"] - original["auc"],
+            max_abs_prob_diff=float(np.max(np.abs(a - b))),
+            decision_thresholds={"approve": approve, "reject": reject},
+            decisions_changed=float(np.mean(decide(a, approve, reject) != decide(b, approve, reject))),
+        )
+    return report
+
+
+def format_report(report: dict) -> str:
+    o, c, d = report["original"], report["compressed"], report["delta"]
+    lines = [f"{'':<18}{'original':>14}{'compressed':>14}"]
+    rows = [("size (bytes)", "bytes", "{:,}"), ("trees", "n_trees", "{}"),
+            ("nodes", "n_nodes", "{:,}"), ("max depth", "max_depth", "{}"),
+            ("load (ms)", "load_ms", "{:.1f}"), ("accuracy (p>0.5)", "accuracy", "{:.4f}"),
+            ("auc", "auc", "{:.4f}")]
+    for label, key, fmt in rows:
+        if key in o:
+            lines.append(f"{label:<18}{fmt.format(o[key]):>14}{fmt.format(c[key]):>14}")
+    for k in o["latency_ms"]:
+        lines.append(f"{k + ' (ms)':<18}{o['latency_ms'][k]:>14.3f}{c['latency_ms'][k]:>14.3f}")
+    lines.append(f"size x{d['bytes_ratio']:.3f}, load x{d['load_speedup']:.1f} faster, "
+                 + ", ".join(f"{k} x{v:.1f} faster" for k, v in d["latency_speedup"].items()))
+    if "auc_delta" in d:
+        t = d["decision_thresholds"]
+        lines.append(f"accuracy (p>0.5) {d['accuracy_delta']:+.4f}, auc {d['auc_delta']:+.4f}, "
+                     f"max |dp| {d['max_abs_prob_diff']:.4f}, "
+                     f"decisions changed {d['decisions_changed']:.2%} "
+                     f"(approve <= {t['approve']:.2f}, reject >= {t['reject']:.2f})")
+    return "\n".join(lines)
+
+
+# ------------------------------------------------------------------------- #
+# Driver
+# ------------------------------------------------------------------------- #
+def compress(src: str, dst: str, n_trees: int | None = None, max_depth: int | None = None,
+             data_url: str | None = None, include_estimator: bool = False,
+             reps: int = 50) -> dict:
+    """
+    Compress the model at src into dst (artifact directory, or joblib pickle
+    for a .pkl/.joblib path) and profile both. Returns the report.
+    """
+    from src.ml.credit_model import CreditScoringModel
+    from src.ml.score import resolve_thresholds
+
+    model = CreditScoringModel()
+    model.load_model(src)
+    small = compress_model(model, n_trees, max_depth)
+    settings = {"source": os.path.abspath(src), "n_trees": n_trees, "max_depth": max_depth}
+    if dst.endswith(PICKLE_SUFFIXES):
+        small.save_model(dst)
+        settings["quantized"] = False
+    else:
+        settings["quantized"] = True
+        save_artifact(small, dst, thresholds=(model.manifest or {}).get("thresholds"),
+                      include_estimator=include_estimator, precision="float32",
+                      compression=settings)
+
+    if data_url is not None:
+        X, y = holdout_matrix(model, data_url)
+    else:
+        X, y = model.preprocess_many([dict(zip(model.features, r)) for r in probe_rows(model)]), None
+    original = profile(src, X, y, reps)
+    compressed = profile(dst, X, y, reps)
+    report = {"settings": settings, "original": original, "compressed": compressed,
+              "delta": compare(original, compressed, resolve_thresholds(model))}
+    for side in (original, compressed):
+        side.pop("_prob", None)
+    return report
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.ml.compress",
+                                 description="Compress a trained forest for serving")
+    ap.add_argument("src", help="model to compress (joblib pickle or artifact with its estimator)")
+    ap.add_argument("dst", help="output artifact directory (or .pkl for an unquantized pickle)")
+    ap.add_argument("--trees", type=int, default=None, help="keep the first N trees")
+    ap.add_argument("--max-depth", type=int, default=None, help="cut every tree at this depth")
+    ap.add_argument("--data", default=None, help="CSV whose holdout split scores both models")
+    ap.add_argument("--with-estimator", action="store_true",
+                    help="bundle the compressed sklearn estimator in the artifact")
+    ap.add_argument("--reps", type=int, default=50, help="timing repetitions")
+    ap.add_argument("--out", default=None, help="write the JSON report here")
+    args = ap.parse_args(argv)
+
+    if args.trees is None and args.max_depth is None:
+        ap.error("nothing to do: pass --trees and/or --max-depth")
+    if os.path.abspath(args.src) == os.path.abspath(args.dst):
+        ap.error("dst must differ from src")
+    if is_artifact(args.dst):
+        ap.error(f"{args.dst} already holds an artifact")
+
+    report = compress(args.src, args.dst, args.trees, args.max_depth, args.data,
+                      include_estimator=args.with_estimator, reps=args.reps)
+    print(format_report(report))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
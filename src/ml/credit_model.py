@@ -2,15 +2,65 @@
 import warnings
 warnings.filterwarnings("ignore")
 
+import os
+from time import perf_counter_ns
+from typing import TYPE_CHECKING
+
 import joblib
 import numpy as np
-import pandas as pd
-import shap
-import sklearn
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
-from sklearn_pandas import DataFrameMapper
+
+from src.ml.artifact import forest_from_artifact, is_artifact, load_artifact
+from src.ml.encoder import CompiledEncoder
+from src.ml.forest import FlatForest
+from src.ml.treeshap import TreeShap
+from src.utils.cache import LRUCache
+
+# pandas, sklearn, sklearn_pandas and shap are imported where they are used:
+# serving only needs joblib + numpy up front (unpickling the model pulls in
+# whatever sklearn pieces it references). Explanations use the native
+# TreeShap; shap is only loaded for estimators TreeShap can't handle.
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class _Dropped:
+    """Stand-in for objects of skipped modules in old pickles; their state is discarded."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __setstate__(self, state):
+        pass
+
+
+def _load_pickle(path: str) -> dict:
+    """
+    joblib.load, except that shap objects (the explainer older pickles store)
+    unpickle as _Dropped placeholders, so loading never imports shap. This
+    goes through joblib's internal NumpyUnpickler (joblib is pinned in
+    requirements.txt); if its constructor doesn't fit, plain joblib.load is
+    used and shap is imported as before.
+    """
+    try:
+        from joblib.numpy_pickle import NumpyUnpickler, _read_fileobject
+    except ImportError:
+        return joblib.load(path)
+
+    class Unpickler(NumpyUnpickler):
+        def find_class(self, module, name):
+            if module == "shap" or module.startswith("shap."):
+                return _Dropped
+            return super().find_class(module, name)
+
+    with open(path, "rb") as f:
+        with _read_fileobject(f, path, None) as fobj:
+            if isinstance(fobj, str):  # pre-0.10 joblib format
+                return joblib.load(path)
+            try:
+                unpickler = Unpickler(path, fobj)
+            except TypeError:  # e.g. joblib 1.4's ensure_native_byte_order argument
+                return joblib.load(path)
+            return unpickler.load()
 
 
 class CreditScoringModel:
@@ -21,12 +71,38 @@ class CreditScoringModel:
       - feature_names captured from the DataFrameMapper expansion
       - get_info() for feature importances/coefficients
       - explain_prediction() that returns {feature: shap_value}
+      - a CompiledEncoder built from the fitted mapper for DataFrame-free
+        inference (preprocess_frame() keeps the original path)
+      - an optional "flat" inference backend (FlatForest) selected at load time
+      - a SHAP explainer built lazily on first use (not stored in the artifact):
+        native TreeShap over the flattened forest, shap.TreeExplainer otherwise
+      - load_model() also reads versioned artifact directories (src/ml/artifact.py),
+        serving from memory-mapped tree arrays without unpickling the forest
+      - an optional LRU/TTL prediction cache keyed on the encoded feature vector
+      - explain_many() for batched SHAP with top-k and an explanation cache
+      - train_from_csv(): compact-dtype, parallel training for large CSVs
+      - update_with_data(): warm-start growth from new batches with tree retirement
+      - compressed float32 artifacts (src/ml/compress.py) load like any other
     """
 
+    BACKENDS = ("sklearn", "flat")
+    # Batch size above which the flat backend hands off to sklearn
+    FLAT_MAX_ROWS = 256
+
     def __init__(self):
-        self.model = None
+        self._model = None
+        self._estimator_path = None  # artifact-bundled estimator, loaded on demand
+        self.manifest = None         # artifact manifest when loaded from one
+        self.version = None          # content fingerprint, set by whoever loads it
+        self.cache = None            # LRUCache of p(bad) by encoded row, see enable_cache()
+        self.explain_cache = None    # LRUCache of SHAP rows by encoded row, see enable_explain_cache()
+        self.surfaces = {}           # name -> precomputed response surface (src/ml/surface.py)
+        self.stage_hook = None       # optional callable(stage, elapsed_ns) for latency metrics
         self.mapper = None
-        self.explainer = None
+        self.encoder = None
+        self.forest = None
+        self.backend = "sklearn"
+        self._explainer = None
         self.feature_names = None
         self.is_trained = False
 
@@ -54,13 +130,16 @@ class CreditScoringModel:
     # --------------------------------------------------------------------- #
     def make_mapper(self):
         """Create the same mapper as the original train.py"""
+        import sklearn.preprocessing
+        from sklearn_pandas import DataFrameMapper
+
         return DataFrameMapper([
             ("grade", sklearn.preprocessing.LabelBinarizer()),
             ("home_ownership", sklearn.preprocessing.LabelBinarizer()),
             ("purpose", sklearn.preprocessing.LabelBinarizer()),
         ])
 
-    def _lb_column_names(self, colname, lb: sklearn.preprocessing.LabelBinarizer):
+    def _lb_column_names(self, colname, lb):
         """
         Names for columns created by LabelBinarizer.
         Binary → one column named with the positive class.
@@ -71,11 +150,13 @@ class CreditScoringModel:
             return [f"{colname}={classes[1]}"]
         return [f"{colname}={c}" for c in classes]
 
-    def _expanded_feature_names_from_mapper(self, df_example: pd.DataFrame):
+    def _expanded_feature_names_from_mapper(self, df_example):
         """
         Full list of feature names produced by DataFrameMapper (binarized
         categoricals) + the numeric columns appended in their original order.
         """
+        import sklearn.preprocessing
+
         names = []
         for (col, transformer) in self.mapper.features:
             if isinstance(transformer, sklearn.preprocessing.LabelBinarizer):
@@ -88,11 +169,37 @@ class CreditScoringModel:
     # --------------------------------------------------------------------- #
     # Preprocess & predict
     # --------------------------------------------------------------------- #
+    def _compile_encoder(self):
+        """Compile the fitted mapper; falls back to the DataFrame path if unsupported."""
+        try:
+            self.encoder = CompiledEncoder.from_mapper(self.mapper, self.numerical_cols)
+        except (ValueError, AttributeError):
+            self.encoder = None
+
     def preprocess(self, row: dict):
         """Exact preprocessing from original train.py."""
-        data = list(row.values())
-        colz = list(row.keys())
-        dfx = pd.DataFrame(data=[data], columns=colz)
+        if self.encoder is not None:
+            return self.encoder.encode(row)
+        return self.preprocess_frame([row])
+
+    def preprocess_many(self, rows: list[dict]):
+        """Batch preprocess(): one pass over all rows."""
+        if self.encoder is not None:
+            return self.encoder.encode_many(rows)
+        return self.preprocess_frame(rows)
+
+    def preprocess_columns(self, frame: "pd.DataFrame"):
+        """Encode a DataFrame chunk column by column (no per-row dicts)."""
+        if self.encoder is not None:
+            return self.encoder.encode_columns(frame)
+        XX1 = self.mapper.transform(frame)
+        return np.hstack((XX1, frame[self.numerical_cols]))
+
+    def preprocess_frame(self, rows: list[dict]):
+        """Reference DataFrame + DataFrameMapper path, as in the original train.py."""
+        import pandas as pd
+
+        dfx = pd.DataFrame.from_records(rows)
 
         XX1 = self.mapper.transform(dfx)
         XX2 = dfx[self.numerical_cols]
@@ -103,14 +210,121 @@ class CreditScoringModel:
         """Probability of default (p(bad=1))."""
         if not self.is_trained:
             raise ValueError("Model must be trained first")
+        t0 = perf_counter_ns()
         processed_row = self.preprocess(row)
-        return float(self.model.predict_proba(processed_row)[:, 1][0])
+        t1 = perf_counter_ns()
+
+        cache = self.cache
+        key = processed_row.tobytes() if cache is not None else None
+        prob = cache.get(key) if cache is not None else None
+        if prob is None:
+            prob = float(self.predict_encoded(processed_row)[0])
+            if cache is not None:
+                cache.put(key, prob)
+
+        hook = self.stage_hook
+        if hook is not None:
+            hook("preprocess", t1 - t0)
+            hook("predict_proba", perf_counter_ns() - t1)
+        return prob
+
+    def predict_many(self, rows: list[dict]) -> np.ndarray:
+        """
+        Probabilities of default for many rows, in input order.
+        Preprocesses the whole batch at once and calls predict_proba once.
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained first")
+        if not rows:
+            return np.empty(0, dtype=np.float64)
+        t0 = perf_counter_ns()
+        processed = self.preprocess_many(rows)
+        t1 = perf_counter_ns()
+
+        cache = self.cache
+        if cache is None:
+            probs = self.predict_encoded(processed).astype(np.float64)
+        else:
+            keys = [x.tobytes() for x in processed]
+            probs = np.empty(len(rows), dtype=np.float64)
+            missing = []
+            for i, key in enumerate(keys):
+                prob = cache.get(key)
+                if prob is None:
+                    missing.append(i)
+                else:
+                    probs[i] = prob
+            if missing:
+                probs[missing] = self.predict_encoded(processed[missing])
+                for i in missing:
+                    cache.put(keys[i], float(probs[i]))
+
+        hook = self.stage_hook
+        if hook is not None:
+            hook("preprocess", t1 - t0)
+            hook("predict_proba", perf_counter_ns() - t1)
+        return probs
+
+    def enable_cache(self, maxsize: int = 4096, ttl: float | None = None):
+        """
+        Memoize predict()/predict_many() by encoded feature vector
+        (maxsize=0 disables). A reloaded model starts with an empty cache.
+        """
+        self.cache = LRUCache(maxsize, ttl) if maxsize > 0 else None
+
+    @property
+    def model(self):
+        """
+        Fitted sklearn estimator. Models loaded from an artifact serve without
+        it and only read the bundled copy from disk on first access.
+        """
+        if self._model is None and self._estimator_path is not None:
+            self._model = joblib.load(self._estimator_path)
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+
+    def predict_encoded(self, X) -> np.ndarray:
+        """p(bad=1) for an already-encoded matrix, through the selected backend (uncached)."""
+        if self.forest is not None:
+            # float64 FlatForest is bit-identical to sklearn, so large batches
+            # go to sklearn's faster compiled traversal when an estimator is
+            # available (an artifact's bundled copy is loaded on first use)
+            if (X.shape[0] <= self.FLAT_MAX_ROWS or self.forest.precision != "float64"
+                    or (self._model is None and self._estimator_path is None)):
+                return self.forest.predict_positive(X)
+        return self.model.predict_proba(X)[:, 1]
+
+    def set_backend(self, backend: str = "sklearn", precision: str = "float64"):
+        """
+        Choose the inference backend: "sklearn" (predict_proba) or "flat"
+        (FlatForest over contiguous node arrays, precision float64/float32).
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {self.BACKENDS}")
+        if backend == "flat":
+            self.forest = FlatForest.from_sklearn(self.model, precision=precision)
+        else:
+            self.forest = None
+        self.backend = backend
 
     # --------------------------------------------------------------------- #
     # Train (with synthetic fallback) & explainability
     # --------------------------------------------------------------------- #
-    def train_with_data(self, data_url: str | None = None) -> float:
-        """Train model; returns holdout accuracy."""
+    def train_with_data(self, data_url: str | None = None, cache_dir: str | None = None) -> float:
+        """
+        Train model; returns holdout accuracy. With cache_dir, the encoded
+        training data is read from (or written to) the feature cache there.
+        """
+        import pandas as pd
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+
+        if data_url is not None and cache_dir is not None:
+            # Same split, encoding and forest as below; single-threaded fit
+            return self.train_from_csv(data_url, n_jobs=None, cache_dir=cache_dir)
         if data_url is None:
             clean_data = self._create_synthetic_data()
         else:
@@ -122,6 +336,7 @@ class CreditScoringModel:
         # Fit mapper and capture expanded feature names
         X1 = self.mapper.fit_transform(clean_data)
         self.feature_names = self._expanded_feature_names_from_mapper(clean_data)
+        self._compile_encoder()
 
         X2 = np.array(clean_data[self.numerical_cols])
         X = np.hstack((X1, X2))
@@ -138,52 +353,49 @@ class CreditScoringModel:
         self.model.fit(X_train, y_train)
 
         test_score = float(self.model.score(X_test, y_test))
+        self._after_fit()
+        return test_score
 
-        # SHAP explainer (optional in API; handy locally)
-        try:
-            self.explainer = shap.TreeExplainer(self.model)
-        except Exception:
-            self.explainer = None
+    def train_from_csv(self, data_url: str, n_jobs: int | None = -1, timer=None,
+                       cache_dir: str | None = None) -> float:
+        """
+        Compact-dtype, parallel variant of train_with_data(data_url) for large
+        files (src/ml/training.py); timer is an optional PhaseTimer. With
+        cache_dir the encoded matrix is reused across runs (src/ml/feature_cache.py).
+        """
+        from src.ml.training import train_from_csv
+
+        return train_from_csv(self, data_url, n_jobs=n_jobs, timer=timer, cache_dir=cache_dir)
 
+    def update_with_data(self, data, n_trees: int = 20, max_trees: int | None = None,
+                         max_age: int | None = None, **kwargs) -> dict:
+        """
+        Warm-start update: append n_trees trees fit on a new batch (CSV path or
+        DataFrame) and retire old ones (src/ml/incremental.py).
+        """
+        from src.ml.incremental import update_with_batch
+
+        return update_with_batch(self, data, n_trees=n_trees, max_trees=max_trees,
+                                 max_age=max_age, **kwargs)
+
+    def _after_fit(self):
+        """Reset state derived from the previous estimator."""
+        # SHAP explainer is rebuilt lazily for the new estimator
+        self._explainer = None
+        if self.cache is not None:
+            self.cache.clear()
+        if self.explain_cache is not None:
+            self.explain_cache.clear()
+
+        # Re-flatten if a non-default backend was selected before (re)training
+        self.set_backend(self.backend, getattr(self.forest, "precision", "float64"))
         self.is_trained = True
-        return test_score
 
-    def _create_synthetic_data(self) -> pd.DataFrame:
-        """Create synthetic lending-like data for demo purposes."""
-        np.random.seed(42)
-        n = 5000
-        df = pd.DataFrame({
-            "grade": np.random.choice(list("ABCDEFG"), n),
-            "sub_grade_num": np.random.uniform(0, 1, n),
-            "short_emp": np.random.choice([0, 1], n, p=[0.7, 0.3]),
-            "emp_length_num": np.random.randint(0, 10, n),
-            "home_ownership": np.random.choice(["RENT", "OWN", "MORTGAGE"], n),
-            "dti": np.random.uniform(0, 50, n),
-            "purpose": np.random.choice(
-                ["vacation", "debt_consolidation", "home_improvement", "major_purchase"], n
-            ),
-            "payment_inc_ratio": np.random.uniform(0, 20, n),
-            "delinq_2yrs": np.random.poisson(0.5, n),
-            "delinq_2yrs_zero": np.random.choice([0, 1], n, p=[0.3, 0.7]),
-            "inq_last_6mths": np.random.poisson(2, n),
-            "last_delinq_none": np.random.choice([0, 1], n, p=[0.2, 0.8]),
-            "last_major_derog_none": np.random.choice([0, 1], n, p=[0.1, 0.9]),
-            "open_acc": np.random.poisson(8, n),
-            "pub_rec": np.random.poisson(0.2, n),
-            "pub_rec_zero": np.random.choice([0, 1], n, p=[0.2, 0.8]),
-            "revol_util": np.random.uniform(0, 100, n),
-        })
-
-        # Heuristic risk → bad_loans
-        risk = (
-            (df["dti"] > 30) * 0.3
-            + (df["delinq_2yrs"] > 0) * 0.4
-            + (df["revol_util"] > 80) * 0.2
-            + (df["grade"].isin(["F", "G"])) * 0.3
-            + np.random.normal(0, 0.1, n)
-        )
-        df["bad_loans"] = (risk > 0.4).astype(int)
-        return df
+    def _create_synthetic_data(self) -> "pd.DataFrame":
+        """Create synthetic lending-like data for demo purposes (src/ml/synthetic.py)."""
+        from src.ml.synthetic import generate
+
+        return generate(5000, seed=42, profile="demo", compact=False)
 
     def get_info(self) -> dict:
         """
@@ -197,20 +409,25 @@ class CreditScoringModel:
           }
         """
         info = {}
-        est = self.model
-        info["estimator_cls"] = type(est).__name__
-
+        est = self._model
         feats = self.feature_names
         weights, kind = None, None
 
-        if hasattr(est, "feature_importances_"):
-            weights = est.feature_importances_.tolist()
-            kind = "feature_importances_"
-        elif hasattr(est, "coef_"):
-            coef = est.coef_
-            coef = coef[0] if getattr(coef, "ndim", 1) > 1 else coef
-            weights = [float(x) for x in coef]
-            kind = "coef_"
+        if est is None and self.manifest is not None:
+            # Artifact: importances were recorded in the manifest at save time
+            info["estimator_cls"] = self.manifest.get("estimator_cls")
+            weights = self.manifest.get("weights")
+            kind = self.manifest.get("weights_kind") if weights is not None else None
+        else:
+            info["estimator_cls"] = type(est).__name__
+            if hasattr(est, "feature_importances_"):
+                weights = est.feature_importances_.tolist()
+                kind = "feature_importances_"
+            elif hasattr(est, "coef_"):
+                coef = est.coef_
+                coef = coef[0] if getattr(coef, "ndim", 1) > 1 else coef
+                weights = [float(x) for x in coef]
+                kind = "coef_"
 
         info["weights_kind"] = kind
 
@@ -226,24 +443,107 @@ class CreditScoringModel:
 
         return info
 
-    def explain_prediction(self, row: dict) -> dict:
+    @property
+    def explainer(self):
         """
-        SHAP values for a single example as {feature: shap_value}.
-        (For RandomForest TreeExplainer, we take the positive-class SHAP.)
+        SHAP explainer for the fitted model, built on first access: TreeShap
+        (src/ml/treeshap.py) when the forest can be flattened with node covers,
+        else shap.TreeExplainer. None if neither can explain the model.
+        """
+        if self._explainer is None:
+            forest = self.forest
+            try:
+                if forest is None or forest.cover is None:
+                    forest = FlatForest.from_sklearn(self.model)
+                self._explainer = TreeShap(forest)
+            except Exception:
+                self._explainer = None
+        if self._explainer is None and self.model is not None:
+            try:
+                import shap
+                self._explainer = shap.TreeExplainer(self.model)
+            except Exception:
+                self._explainer = None
+        return self._explainer
+
+    @explainer.setter
+    def explainer(self, value):
+        self._explainer = value
+
+    @staticmethod
+    def _positive_class(values):
+        """Positive-class slice of TreeExplainer output (list per class or (..., n_classes))."""
+        if isinstance(values, list):
+            return values[1] if len(values) == 2 else values[0]
+        values = np.asarray(values)
+        return values[..., 1] if values.ndim == 3 else values
+
+    def _shap_values(self, X) -> np.ndarray:
+        explainer = self.explainer
+        if isinstance(explainer, TreeShap):
+            return explainer.shap_values(X)
+        return self._positive_class(explainer.shap_values(X, check_additivity=False))
+
+    def explain_encoded(self, X) -> np.ndarray:
         """
+        Positive-class SHAP values for an encoded matrix, shape (n_rows, n_features),
+        in one explainer call. Rows already in the explanation cache are not recomputed.
+        """
+        if self.explainer is None:
+            raise ValueError("Model must be trained first (no explainer)")
+        X = np.asarray(X)
+        cache = self.explain_cache
+        if cache is None:
+            return self._shap_values(X)
+
+        keys = [x.tobytes() for x in X]
+        out = np.empty(X.shape, dtype=np.float64)
+        missing = []
+        for i, key in enumerate(keys):
+            sv = cache.get(key)
+            if sv is None:
+                missing.append(i)
+            else:
+                out[i] = sv
+        if missing:
+            sv = self._shap_values(X[missing])
+            out[missing] = sv
+            for i, row in zip(missing, sv):
+                cache.put(keys[i], row)
+        return out
+
+    @property
+    def expected_value(self) -> float:
+        """SHAP base value (mean positive-class probability over the training data)."""
         if self.explainer is None:
             raise ValueError("Model must be trained first (no explainer)")
+        base = np.atleast_1d(self.explainer.expected_value)
+        return float(base[1] if base.shape[0] == 2 else base[0])
 
-        processed_row = self.preprocess(row)  # shape (1, n_features)
-        shap_values = self.explainer.shap_values(processed_row)
+    def explain_many(self, rows: list[dict], top_k: int | None = None) -> list[dict]:
+        """
+        explain_prediction() for many rows with one SHAP call. With top_k, each
+        dict keeps only the k largest |contributions|, largest first.
+        """
+        if not rows:
+            return []
+        sv = self.explain_encoded(self.preprocess_many(rows))
+        feats = self.feature_names or [f"feat_{i}" for i in range(sv.shape[1])]
+        if top_k is None or top_k >= sv.shape[1]:
+            return [dict(zip(feats, map(float, row))) for row in sv]
+        top = np.argsort(-np.abs(sv), axis=1, kind="stable")[:, :top_k]
+        return [{feats[j]: float(row[j]) for j in idx} for row, idx in zip(sv, top)]
 
-        if isinstance(shap_values, list) and len(shap_values) == 2:
-            sv = shap_values[1][0]
-        else:
-            sv = shap_values[0] if getattr(shap_values, "ndim", 1) > 1 else shap_values
+    def explain_prediction(self, row: dict) -> dict:
+        """
+        SHAP values for a single example as {feature: shap_value}.
+        (For RandomForest TreeExplainer, we take the positive-class SHAP.)
+        """
+        return self.explain_many([row])[0]
 
-        feats = self.feature_names or [f"feat_{i}" for i in range(len(sv))]
-        return {feat: float(val) for feat, val in zip(feats, sv)}
+    def enable_explain_cache(self, maxsize: int = 1024, ttl: float | None = None):
+        """Memoize explain_encoded() by encoded feature vector (maxsize=0 disables)."""
+        self.explain_cache = LRUCache(maxsize, ttl) if maxsize > 0 else None
 
     # --------------------------------------------------------------------- #
     # Persist
@@ -254,22 +554,56 @@ class CreditScoringModel:
         joblib.dump({
             "model": self.model,
             "mapper": self.mapper,
-            "explainer": self.explainer,
             "features": self.features,
             "numerical_cols": self.numerical_cols,
             "categorical_cols": self.categorical_cols,
             "feature_names": self.feature_names,
         }, model_path)
 
-    def load_model(self, model_path: str):
-        data = joblib.load(model_path)
+    def load_model(self, model_path: str, backend: str = "sklearn", precision: str = "float64"):
+        """
+        Load a joblib pickle or an artifact directory. Artifacts always serve
+        through the flat backend (bit-identical to sklearn at float64);
+        compressed float32 artifacts serve at float32 whatever precision says.
+        """
+        if is_artifact(model_path):
+            self._load_artifact(model_path, precision)
+            return
+
+        data = _load_pickle(model_path)
         self.model = data["model"]
         self.mapper = data["mapper"]
-        self.explainer = data.get("explainer")
+        # Older pickles carry a shap explainer; it is read as a placeholder
+        # (without importing shap) and dropped in favour of the native one
+        self._explainer = None
         self.features = data.get("features", self.features)
         self.numerical_cols = data.get("numerical_cols", self.numerical_cols)
         self.categorical_cols = data.get("categorical_cols", self.categorical_cols)
         self.feature_names = data.get("feature_names")
+        self._compile_encoder()
+        self.set_backend(backend, precision)
+        self.is_trained = True
+
+    def _load_artifact(self, path: str, precision: str = "float64"):
+        loaded = load_artifact(path, mmap_mode="r")
+        manifest = loaded["manifest"]
+        self.features = manifest["features"]
+        self.numerical_cols = manifest["numerical_cols"]
+        self.categorical_cols = manifest["categorical_cols"]
+        self.feature_names = manifest["feature_names"] or None
+        self.encoder = CompiledEncoder.from_vocabularies(
+            manifest["vocabularies"], self.numerical_cols
+        )
+        self.mapper = None
+        self._model = None
+        self._explainer = None
+        estimator = manifest.get("estimator")
+        self._estimator_path = (
+            os.path.join(loaded["path"], estimator["file"]) if estimator else None
+        )
+        self.forest = forest_from_artifact(loaded, precision=precision)
+        self.backend = "flat"
+        self.manifest = manifest
         self.is_trained = True
 
 
@@ -0,0 +1,142 @@
+# src/ml/encoder.py
+import operator
+
+import numpy as np
+
+
+class CompiledEncoder:
+    """
+    DataFrame-free equivalent of the train.py preprocessing
+    (DataFrameMapper of LabelBinarizers, then the numeric columns appended).
+
+    Built once from a fitted mapper: every category gets a precomputed
+    output column index and the numeric columns a fixed order, so a row
+    dict is written straight into a float64 buffer. Output is bit-identical
+    to np.hstack((mapper.transform(df), df[numerical_cols])).
+    """
+
+    def __init__(self, categorical: list, numerical_cols: list, vocabularies: dict):
+        # categorical: [(column, width, {category: output column index}), ...]
+        self.categorical = categorical
+        self._vocabularies = vocabularies
+        self.numerical_cols = list(numerical_cols)
+        self.n_categorical = sum(width for _, width, _ in categorical)
+        self.n_features = self.n_categorical + len(self.numerical_cols)
+        self._get_numeric = operator.itemgetter(*self.numerical_cols)
+        self._single_numeric = len(self.numerical_cols) == 1
+
+    @classmethod
+    def from_vocabularies(cls, vocabularies: dict, numerical_cols: list):
+        """
+        Build from {column: sorted LabelBinarizer classes}, in mapper order.
+        Mirrors LabelBinarizer: one column per class, a single column for the
+        second class when there are two, and an all-zero column for one class.
+        Unknown categories encode as all zeros.
+        """
+        categorical, vocab, offset = [], {}, 0
+        for col, classes in vocabularies.items():
+            classes = [c.item() if hasattr(c, "item") else c for c in classes]
+            vocab[col] = classes
+            if len(classes) <= 2:
+                lookup = {classes[1]: offset} if len(classes) == 2 else {}
+                width = 1
+            else:
+                lookup = {c: offset + i for i, c in enumerate(classes)}
+                width = len(classes)
+            categorical.append((col, width, lookup))
+            offset += width
+        return cls(categorical, numerical_cols, vocab)
+
+    @classmethod
+    def from_mapper(cls, mapper, numerical_cols: list):
+        """Compile a fitted DataFrameMapper; raises ValueError if it can't be compiled."""
+        import sklearn.preprocessing
+
+        if mapper.default is not False or getattr(mapper, "df_out", False):
+            raise ValueError("Only plain DataFrameMapper(default=False) can be compiled")
+
+        vocabularies = {}
+        for feature in mapper.features:
+            col, transformer = feature[0], feature[1]
+            if not isinstance(col, str) or not isinstance(
+                transformer, sklearn.preprocessing.LabelBinarizer
+            ):
+                raise ValueError(f"Unsupported mapper feature: {col!r}")
+            if transformer.neg_label != 0 or transformer.pos_label != 1 or transformer.sparse_output:
+                raise ValueError(f"Unsupported LabelBinarizer settings for {col!r}")
+            vocabularies[col] = list(transformer.classes_)
+        return cls.from_vocabularies(vocabularies, numerical_cols)
+
+    def vocabularies(self) -> dict:
+        """{column: classes} in mapper order (inverse of from_vocabularies)."""
+        return {col: list(classes) for col, classes in self._vocabularies.items()}
+
+    # --------------------------------------------------------------------- #
+    # Encoding
+    # --------------------------------------------------------------------- #
+    def encode_into(self, row: dict, out: np.ndarray) -> np.ndarray:
+        """Write one row into a preallocated 1-D float64 buffer of length n_features."""
+        out[: self.n_categorical] = 0.0
+        for col, _, lookup in self.categorical:
+            j = lookup.get(row[col])
+            if j is not None:
+                out[j] = 1.0
+        out[self.n_categorical:] = self._get_numeric(row)
+        return out
+
+    def encode(self, row: dict, out: np.ndarray | None = None) -> np.ndarray:
+        """Encode one row; returns shape (1, n_features)."""
+        if out is None:
+            out = np.empty((1, self.n_features), dtype=np.float64)
+        self.encode_into(row, out.reshape(-1))
+        return out
+
+    def encode_many(self, rows: list[dict], out: np.ndarray | None = None) -> np.ndarray:
+        """Encode many rows into shape (len(rows), n_features)."""
+        n = len(rows)
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=np.float64)
+        out[:, : self.n_categorical] = 0.0
+        if n == 0:
+            return out
+
+        positions = np.arange(n)
+        for col, _, lookup in self.categorical:
+            idx = np.fromiter((lookup.get(r[col], -1) for r in rows), dtype=np.intp, count=n)
+            hit = idx >= 0
+            out[positions[hit], idx[hit]] = 1.0
+
+        numeric = [self._get_numeric(r) for r in rows]
+        if self._single_numeric:
+            out[:, self.n_categorical] = numeric
+        else:
+            out[:, self.n_categorical:] = numeric
+        return out
+
+    def encode_columns(self, columns, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Encode column-oriented data ({column: 1-D array}, or a DataFrame) into
+        shape (n_rows, n_features); same output as encode_many on the rows.
+        """
+        first = self.numerical_cols[0] if self.numerical_cols else self.categorical[0][0]
+        n = len(columns[first])
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=np.float64)
+        out[:, : self.n_categorical] = 0.0
+        if n == 0:
+            return out
+
+        positions = np.arange(n)
+        for col, _, lookup in self.categorical:
+            # Look up each distinct value once (as strings, so NaN/None are just unknown)
+            values = np.asarray(columns[col], dtype=object).astype(str)
+            uniques, inverse = np.unique(values, return_inverse=True)
+            by_str = {str(k): v for k, v in lookup.items()}
+            table = np.array([by_str.get(u, -1) for u in uniques], dtype=np.intp)
+            idx = table[inverse]
+            hit = idx >= 0
+            out[positions[hit], idx[hit]] = 1.0
+
+        for j, col in enumerate(self.numerical_cols):
+            out[:, self.n_categorical + j] = np.asarray(columns[col], dtype=np.float64)
+        return out
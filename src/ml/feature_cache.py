@@ -0,0 +1,127 @@
+# src/ml/feature_cache.py
+"""
+Feature cache: the encoded training split of a source CSV, stored once and
+memory-mapped by later training runs and sweeps instead of re-parsing and
+re-encoding the file.
+
+    <cache_dir>/<key>/
+      manifest.json            source path/size/sha256, feature config,
+                               vocabularies, array shapes and dtypes
+      X_train.npy, X_test.npy  float32 design matrices, column-major
+      y_train.npy, y_test.npy  int8 labels
+
+The key hashes the source file's contents together with the feature config
+(columns, read dtypes, split, cache schema), so changing either starts a new
+entry. read_cache() maps the arrays read-only; being column-major float32,
+sklearn fits on them without a copy.
+
+    python -m src.ml.training data/loans_dataset_30k.csv model.pkl --cache-dir .cache/features
+"""
+import hashlib
+import json
+import os
+import shutil
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.ml.artifact import _sha256
+
+if TYPE_CHECKING:
+    from src.ml.credit_model import CreditScoringModel
+
+FORMAT_NAME = "credit-feature-cache"
+SCHEMA_VERSION = 1
+MANIFEST = "manifest.json"
+ARRAYS = {"X_train": np.float32, "X_test": np.float32, "y_train": np.int8, "y_test": np.int8}
+
+
+def describe_source(path: str) -> dict:
+    """{"path", "size", "sha256"} of a source file (reads it once)."""
+    return {"path": os.path.abspath(path), "size": os.path.getsize(path), "sha256": _sha256(path)}
+
+
+def cache_config(model: "CreditScoringModel") -> dict:
+    """Everything besides the source bytes that determines the cached arrays."""
+    from src.ml.training import SPLIT_SEED, TARGET, TEST_SIZE, compact_dtypes
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "features": list(model.features),
+        "numerical_cols": list(model.numerical_cols),
+        "categorical_cols": list(model.categorical_cols),
+        "target": TARGET,
+        "read_dtypes": compact_dtypes(model),
+        "split": {"test_size": TEST_SIZE, "random_state": SPLIT_SEED, "stratify": True},
+    }
+
+
+def cache_path(cache_dir: str, source: dict, model: "CreditScoringModel") -> str:
+    """Entry directory under cache_dir for a describe_source() result."""
+    h = hashlib.sha256(source["sha256"].encode())
+    h.update(json.dumps(cache_config(model), sort_keys=True).encode())
+    return os.path.join(cache_dir, h.hexdigest()[:32])
+
+
+def write_cache(path: str, data: dict, model: "CreditScoringModel", source: dict) -> dict:
+    """
+    Store encode_training_data() output at path. Written to a temporary
+    directory and renamed into place, so readers never see a partial entry;
+    if another process got there first, its entry is kept. Returns the manifest.
+    """
+    manifest = {
+        "format": FORMAT_NAME,
+        "schema_version": SCHEMA_VERSION,
+        "source": source,
+        "config": cache_config(model),
+        "vocabularies": {c: list(v) for c, v in data["vocabularies"].items()},
+        "arrays": {},
+    }
+    tmp = f"{path}.tmp-{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+    try:
+        for name, dtype in ARRAYS.items():
+            arr = data[name]
+            arr = np.asfortranarray(arr, dtype) if arr.ndim == 2 else np.ascontiguousarray(arr, dtype)
+            np.save(os.path.join(tmp, f"{name}.npy"), arr)
+            manifest["arrays"][name] = {"file": f"{name}.npy", "dtype": str(arr.dtype),
+                                        "shape": list(arr.shape)}
+        with open(os.path.join(tmp, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            if not os.path.isfile(os.path.join(path, MANIFEST)):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return manifest
+
+
+def read_cache(path: str, mmap_mode: str | None = "r") -> dict | None:
+    """
+    Cached {"X_train", "X_test", "y_train", "y_test", "vocabularies",
+    "manifest"}, or None when there is no readable entry at path.
+    """
+    try:
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != FORMAT_NAME or manifest.get("schema_version") != SCHEMA_VERSION:
+        return None
+
+    data = {"vocabularies": manifest["vocabularies"], "manifest": manifest}
+    for name in ARRAYS:
+        entry = manifest["arrays"].get(name)
+        if entry is None:
+            return None
+        try:
+            arr = np.load(os.path.join(path, entry["file"]), mmap_mode=mmap_mode, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if list(arr.shape) != entry["shape"] or str(arr.dtype) != entry["dtype"]:
+            return None
+        # Plain ndarray view over the mapping (no memmap subclass overhead)
+        data[name] = np.asarray(arr)
+    return data
@@ -0,0 +1,181 @@
+# src/ml/forest.py
+import numpy as np
+
+
+class FlatForest:
+    """
+    Inference-only copy of a fitted RandomForestClassifier (binary).
+
+    All trees are flattened into contiguous NumPy arrays indexed by a global
+    node id: split feature, threshold, children (interleaved as
+    children[2*i] = left, children[2*i + 1] = right) and the positive-class
+    probability of every node. Leaves point at themselves, so rows can be
+    pushed through every tree at once, one level per step, without any
+    per-tree Python loop. This wins on small batches, where sklearn's
+    per-call overhead dominates; sklearn's compiled traversal is faster from
+    a few hundred rows up (see benchmarks/forest_latency.py).
+
+    precision="float64" reproduces sklearn's predict_proba exactly (inputs are
+    cast to float32 like sklearn does and trees are summed in the same order).
+    precision="float32" stores thresholds rounded down to float32, which keeps
+    every split decision identical, and accumulates leaf values in float32.
+
+    cover (weighted training samples per node) is optional; it is only needed
+    for explanations (src/ml/treeshap.py).
+    """
+
+    # Rows per traversal chunk; bounds the (n_trees, rows) work arrays.
+    chunk_size = 4096
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth: int,
+                 n_features: int, precision: str = "float64", cover=None):
+        if precision not in ("float64", "float32"):
+            raise ValueError("precision must be 'float64' or 'float32'")
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.precision = precision
+        self.cover = cover
+        self._is_leaf = children[0::2] == np.arange(len(feature))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, estimator, precision: str = "float64"):
+        """Flatten a fitted sklearn RandomForestClassifier / ExtraTreesClassifier."""
+        if getattr(estimator, "n_outputs_", 1) != 1 or len(estimator.classes_) != 2:
+            raise ValueError("FlatForest supports single-output binary classifiers only")
+
+        features, thresholds, children, values, covers, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for tree in (e.tree_ for e in estimator.estimators_):
+            n = tree.node_count
+            ids = np.arange(n, dtype=np.int64) + offset
+            left = tree.children_left.astype(np.int64)
+            right = tree.children_right.astype(np.int64)
+            is_leaf = left == -1
+
+            feat = np.where(is_leaf, 0, tree.feature).astype(np.int32)
+            thr = np.where(is_leaf, np.inf, tree.threshold)
+            child = np.empty(2 * n, dtype=np.int64)
+            child[0::2] = np.where(is_leaf, ids, left + offset)
+            child[1::2] = np.where(is_leaf, ids, right + offset)
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            counts = tree.value[:, 0, :]
+            normalizer = counts.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+
+            features.append(feat)
+            thresholds.append(thr)
+            children.append(child)
+            values.append(counts[:, 1] / normalizer)
+            covers.append(tree.weighted_n_node_samples.astype(np.float64))
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls.from_arrays(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            children=np.concatenate(children),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max_depth,
+            n_features=estimator.n_features_in_,
+            precision=precision,
+            cover=np.concatenate(covers),
+        )
+
+    @classmethod
+    def from_arrays(cls, feature, threshold, children, value, roots, max_depth,
+                    n_features, precision: str = "float64", cover=None):
+        """
+        Build from float64 arrays (as produced by from_sklearn or a saved
+        artifact), or from the float32 arrays of a float32 forest's
+        to_arrays(). Arrays already in the target dtype are used without copying.
+        """
+        if precision == "float32" and threshold.dtype != np.float32:
+            thr32 = threshold.astype(np.float32)
+            # Round down so that float32(x) <= thr32 <=> float32(x) <= threshold
+            over = thr32.astype(np.float64) > threshold
+            thr32[over] = np.nextafter(thr32[over], np.float32(-np.inf))
+            threshold = thr32
+        if precision == "float32":
+            value = value.astype(np.float32, copy=False)
+        return cls(feature, threshold, children, value, roots, max_depth, n_features,
+                   precision, cover)
+
+    def to_arrays(self) -> dict:
+        """The node arrays (inverse of from_arrays at the same precision)."""
+        arrays = {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "children": self.children,
+            "value": self.value,
+            "roots": self.roots,
+        }
+        if self.cover is not None:
+            arrays["cover"] = self.cover
+        return arrays
+
+    # --------------------------------------------------------------------- #
+    # Inference
+    # --------------------------------------------------------------------- #
+    def apply(self, X) -> np.ndarray:
+        """Leaf node ids, shape (n_trees, n_rows)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected X with {self.n_features} features, got {X.shape}")
+        if self.precision == "float64":
+            X = X.astype(np.float64)
+
+        n, n_trees = X.shape[0], self.n_trees
+        flat_x = X.reshape(-1)
+        # One work item per (tree, row); finished items are compacted away
+        # every other level so deep trees don't drag shallow paths along.
+        base = np.tile(np.arange(n, dtype=np.int64) * self.n_features, n_trees)
+        nodes = np.repeat(self.roots, n)
+        pos = np.arange(n_trees * n, dtype=np.int64)
+        out = np.empty(n_trees * n, dtype=np.int64)
+        for depth in range(1, self.max_depth + 1):
+            x = flat_x[base + self.feature[nodes]]
+            go_right = ~(x <= self.threshold[nodes])
+            nodes = self.children[2 * nodes + go_right]
+            if depth % 2 == 0 or depth == self.max_depth:
+                done = self._is_leaf[nodes]
+                out[pos[done]] = nodes[done]
+                keep = ~done
+                nodes, pos, base = nodes[keep], pos[keep], base[keep]
+                if nodes.size == 0:
+                    break
+        if nodes.size:
+            out[pos] = nodes
+        return out.reshape(n_trees, n)
+
+    def predict_positive(self, X) -> np.ndarray:
+        """Positive-class probability per row (predict_proba(X)[:, 1])."""
+        X = np.asarray(X)
+        n = X.shape[0]
+        out = np.empty(n, dtype=self.value.dtype)
+        for start in range(0, n, self.chunk_size):
+            leaves = self.apply(X[start:start + self.chunk_size])
+            # cumsum keeps sklearn's tree-by-tree accumulation order
+            total = np.cumsum(self.value[leaves], axis=0)[-1]
+            out[start:start + self.chunk_size] = total / self.n_trees
+        return out
+
+    def predict_proba(self, X) -> np.ndarray:
+        """sklearn-compatible (n_rows, 2) probabilities."""
+        p = self.predict_positive(X)
+        return np.column_stack((1.0 - p, p))
@@ -0,0 +1,251 @@
+# src/ml/score.py
+"""
+Out-of-core bulk scoring: stream a loan file (CSV or Parquet, shaped like
+data/loans_dataset_30k.csv) through the model in fixed-size chunks and write
+prob_default + decision per row, in input order.
+
+    python -m src.ml.score data/loans_dataset_30k.csv scores.csv
+    python -m src.ml.score portfolio.parquet scores.parquet --chunk-size 200000 --workers 4
+
+Memory is bounded by chunk size x (in-flight chunks): at most 2 x workers
+chunks are read ahead. Rows with a missing feature value get an empty
+prob_default/decision instead of failing the run. Thresholds follow the
+API: --thresh-* flags, else THRESH_APPROVE/THRESH_REJECT, else the
+artifact manifest, else 0.33/0.67. Parquet needs pyarrow.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from src.ml.credit_model import CreditScoringModel
+
+DEFAULT_APPROVE = 0.33
+DEFAULT_REJECT = 0.67
+
+
+def decide(probs: np.ndarray, approve: float, reject: float) -> np.ndarray:
+    """Vectorized decision rule of the API (prob <= approve, < reject, else reject)."""
+    return np.where(
+        probs <= approve, "APPROVE", np.where(probs < reject, "CONDITIONAL", "REJECT")
+    ).astype(object)
+
+
+def resolve_thresholds(model: CreditScoringModel, approve: float | None = None,
+                       reject: float | None = None) -> tuple[float, float]:
+    recorded = (model.manifest or {}).get("thresholds") or {}
+    if approve is None:
+        approve = float(os.environ.get("THRESH_APPROVE", recorded.get("approve", DEFAULT_APPROVE)))
+    if reject is None:
+        reject = float(os.environ.get("THRESH_REJECT", recorded.get("reject", DEFAULT_REJECT)))
+    return approve, reject
+
+
+# ------------------------------------------------------------------------- #
+# Chunk scoring (runs in the main process or in pool workers)
+# ------------------------------------------------------------------------- #
+_worker_model: CreditScoringModel | None = None
+
+
+def _load_model(model_path: str, backend: str) -> CreditScoringModel:
+    m = CreditScoringModel()
+    m.load_model(model_path, backend=backend)
+    return m
+
+
+def _init_worker(model_path: str, backend: str) -> None:
+    global _worker_model
+    _worker_model = _load_model(model_path, backend)
+
+
+def score_frame(model: CreditScoringModel, frame, approve: float, reject: float):
+    """(prob_default, decision) arrays for a DataFrame chunk; NaN/None for incomplete rows."""
+    complete = frame[model.features].notna().all(axis=1).to_numpy()
+    probs = np.full(len(frame), np.nan)
+    if complete.any():
+        X = model.preprocess_columns(frame[complete] if not complete.all() else frame)
+        probs[complete] = np.clip(model.predict_encoded(X), 0.0, 1.0)
+    decisions = decide(probs, approve, reject)
+    decisions[~complete] = None
+    return probs, decisions
+
+
+def _score_in_worker(frame, approve: float, reject: float):
+    return score_frame(_worker_model, frame, approve, reject)
+
+
+# ------------------------------------------------------------------------- #
+# Readers / writers
+# ------------------------------------------------------------------------- #
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet input/output needs pyarrow (pip install pyarrow)") from None
+
+
+def iter_chunks(path: str, columns: list, chunk_size: int, numeric: list):
+    """DataFrame chunks of at most chunk_size rows with only the needed columns."""
+    import pandas as pd
+
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+        return
+    dtype = {c: ("float64" if c in numeric else "object") for c in columns}
+    yield from pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=chunk_size)
+
+
+class _Writer:
+    """Appends scored chunks to CSV (header once) or Parquet (one row group per chunk)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._parquet = _is_parquet(path)
+        self._writer = None
+        self._first = True
+
+    def write(self, frame) -> None:
+        if self._parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._first else "a",
+                         header=self._first, index=False)
+        self._first = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+# ------------------------------------------------------------------------- #
+# Driver
+# ------------------------------------------------------------------------- #
+def score_file(
+    input_path: str,
+    output_path: str,
+    model_path: str,
+    chunk_size: int = 100_000,
+    workers: int = 1,
+    backend: str = "sklearn",
+    passthrough: list | None = None,
+    approve: float | None = None,
+    reject: float | None = None,
+    progress=None,
+) -> dict:
+    """
+    Score input_path into output_path. Returns {"rows", "scored", "seconds",
+    "rows_per_sec", "chunks"}. progress(report) is called after every chunk.
+    """
+    import pandas as pd
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if _is_parquet(input_path) or _is_parquet(output_path):
+        _require_pyarrow()
+    model = _load_model(model_path, backend)
+    approve, reject = resolve_thresholds(model, approve, reject)
+    passthrough = list(passthrough or [])
+    columns = list(dict.fromkeys(passthrough + list(model.features)))
+
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path, backend))
+
+    writer = _Writer(output_path)
+    report = {"rows": 0, "scored": 0, "chunks": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+    t0 = time.perf_counter()
+
+    def emit(frame, probs, decisions):
+        out = frame[passthrough].reset_index(drop=True) if passthrough else pd.DataFrame()
+        out["prob_default"] = probs
+        out["decision"] = decisions
+        writer.write(out)
+        report["rows"] += len(frame)
+        report["scored"] += int(np.count_nonzero(~np.isnan(probs)))
+        report["chunks"] += 1
+        report["seconds"] = time.perf_counter() - t0
+        report["rows_per_sec"] = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+        if progress is not None:
+            progress(report)
+
+    try:
+        chunks = iter_chunks(input_path, columns, chunk_size, model.numerical_cols)
+        if pool is None:
+            for frame in chunks:
+                emit(frame, *score_frame(model, frame, approve, reject))
+        else:
+            pending: deque = deque()
+            for frame in chunks:
+                pending.append((frame, pool.submit(_score_in_worker, frame, approve, reject)))
+                if len(pending) >= 2 * workers:
+                    frame, fut = pending.popleft()
+                    emit(frame, *fut.result())
+            while pending:
+                frame, fut = pending.popleft()
+                emit(frame, *fut.result())
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    report["seconds"] = time.perf_counter() - t0
+    report["rows_per_sec"] = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+    return report
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.ml.score", description="Bulk-score a loan file")
+    ap.add_argument("input", help="CSV or Parquet file with the model's feature columns")
+    ap.add_argument("output", help="output .csv or .parquet")
+    ap.add_argument("--model", default=os.environ.get("MODEL_PATH", "models/credit_model.pkl"))
+    ap.add_argument("--chunk-size", type=int, default=100_000)
+    ap.add_argument("--workers", type=int, default=1, help="scoring processes (1 = in-process)")
+    ap.add_argument("--backend", choices=CreditScoringModel.BACKENDS, default="sklearn")
+    ap.add_argument("--passthrough", default="",
+                    help="comma-separated input columns copied to the output (e.g. an id)")
+    ap.add_argument("--thresh-approve", type=float, default=None)
+    ap.add_argument("--thresh-reject", type=float, default=None)
+    ap.add_argument("--quiet", action="store_true", help="no per-chunk progress")
+    args = ap.parse_args(argv)
+
+    def progress(r):
+        print(f"chunk {r['chunks']}: {r['rows']:,} rows, {r['rows_per_sec']:,.0f} rows/s",
+              file=sys.stderr)
+
+    try:
+        report = score_file(
+            args.input, args.output, args.model,
+            chunk_size=args.chunk_size, workers=args.workers, backend=args.backend,
+            passthrough=[c for c in args.passthrough.split(",") if c],
+            approve=args.thresh_approve, reject=args.thresh_reject,
+            progress=None if args.quiet else progress,
+        )
+    except ImportError as e:
+        ap.error(str(e))
+    skipped = report["rows"] - report["scored"]
+    print(
+        f"Scored {report['scored']:,} of {report['rows']:,} rows"
+        + (f" ({skipped:,} incomplete)" if skipped else "")
+        + f" in {report['seconds']:.2f}s ({report['rows_per_sec']:,.0f} rows/s) -> {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# src/ml/surface.py
+import bisect
+from typing import Callable
+
+import numpy as np
+
+from src.ml.forest import FlatForest
+
+
+def _float32_down(t: float) -> float:
+    """Largest float32 value <= t."""
+    r = np.float32(t)
+    if float(r) > t:
+        r = np.nextafter(r, np.float32(-np.inf))
+    return float(r)
+
+
+def _float32_up_strict(t: float) -> float:
+    """Smallest float32 value > t."""
+    r = np.float32(t)
+    if float(r) <= t:
+        r = np.nextafter(r, np.float32(np.inf))
+    return float(r)
+
+
+class RatioSurface:
+    """
+    Exact response of a tree ensemble along one continuous input, per category.
+
+    When every feature is fixed except a category (e.g. grade) and one value
+    fed into some numeric columns (e.g. dti and payment_inc_ratio both set to
+    the same ratio), the forest output is piecewise constant in that value,
+    with breakpoints at the split thresholds on those columns. The surface
+    stores one probability per interval per category, so a lookup is a binary
+    search instead of a forest evaluation.
+
+    Trees compare float32(x) <= threshold, so intervals are defined on the
+    float32-rounded input and each is evaluated at a float32 value inside it:
+    lookups are bit-identical to model.predict() on the same row.
+    """
+
+    def __init__(self, breakpoints: list, values: dict):
+        self.breakpoints = breakpoints   # sorted thresholds, floats
+        self.values = values             # category -> list of len(breakpoints) + 1 floats
+
+    @classmethod
+    def build(cls, model, make_row: Callable[[str, float], dict], categories: list,
+              ratio_columns: list):
+        """
+        model:         trained CreditScoringModel (any backend)
+        make_row:      (category, ratio) -> raw feature dict, exactly as served
+        categories:    the category values to precompute
+        ratio_columns: numeric feature names that receive the ratio
+        """
+        enc = model.encoder
+        if enc is None:
+            raise ValueError("Response surfaces need a compiled encoder")
+        cols = [enc.n_categorical + enc.numerical_cols.index(c) for c in ratio_columns]
+
+        forest = model.forest or FlatForest.from_sklearn(model.model)
+        split = np.isin(forest.feature, cols) & ~forest._is_leaf
+        thresholds = np.unique(forest.threshold[split].astype(np.float64))
+        breakpoints = [float(t) for t in thresholds]
+
+        # One float32-representable point inside each interval (T[k-1], T[k]]
+        points = [_float32_down(t) for t in breakpoints]
+        points.append(_float32_up_strict(breakpoints[-1]) if breakpoints else 0.0)
+
+        values = {}
+        for cat in categories:
+            X = model.preprocess_many([make_row(cat, p) for p in points])
+            values[cat] = [float(v) for v in model.predict_encoded(X)]
+        return cls(breakpoints, values)
+
+    def lookup(self, category, ratio: float) -> float | None:
+        """Model output for (category, ratio); None if the category wasn't precomputed."""
+        values = self.values.get(category)
+        if values is None:
+            return None
+        x = float(np.float32(ratio))
+        if x != x:  # NaN: let the caller fall back to the model
+            return None
+        return values[bisect.bisect_left(self.breakpoints, x)]
+
+    @property
+    def size(self) -> int:
+        return sum(len(v) for v in self.values.values())
@@ -0,0 +1,440 @@
+# src/ml/sweep.py
+"""
+Hyperparameter sweep for the forest: grid or random search, cross-validated
+across a process pool, pruned with successive halving, with accuracy/AUC,
+inference latency and model size recorded for the survivors.
+
+    python -m src.ml.sweep data/loans_dataset_30k.csv \\
+        --grid max_depth=8,16,None min_samples_leaf=1,2,5 max_features=sqrt,0.5 \\
+        --workers 4 --resource trees --min-resource 10 --max-resource 100 --out sweep.json
+
+The training split (same as train_with_data, optionally from the feature
+cache) is encoded once and placed in shared memory; workers map it instead
+of receiving a copy per task. Successive halving scores every configuration
+on a small budget (trees, or a fraction of the training rows), keeps the
+best 1/eta and multiplies the budget by eta until max_resource. The
+finalists (survivors, then the configs that got furthest) are refit on the
+whole training split at the full budget, scored on the holdout and timed in
+the parent process (one at a time, so the pool doesn't skew latencies).
+The report's frontier lists the configurations no other one beats on AUC,
+single-row latency and size at once.
+"""
+import argparse
+import itertools
+import json
+import math
+import pickle
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.ml.training import FOREST_PARAMS, load_training_data
+from src.utils.profiling import median_seconds
+
+if TYPE_CHECKING:
+    from src.ml.credit_model import CreditScoringModel
+
+RESOURCES = ("trees", "data")
+METRICS = ("auc", "accuracy")
+
+
+# ------------------------------------------------------------------------- #
+# Search space
+# ------------------------------------------------------------------------- #
+def parse_value(text: str):
+    """'8' -> 8, '0.5' -> 0.5, 'None' -> None, 'sqrt' -> 'sqrt'."""
+    if text == "None":
+        return None
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_grid(specs: list[str]) -> dict:
+    """['max_depth=8,16,None', ...] -> {"max_depth": [8, 16, None], ...}."""
+    grid = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"Expected name=v1,v2,... got {spec!r}")
+        grid[name.strip()] = [parse_value(v.strip()) for v in values.split(",")]
+    return grid
+
+
+def candidates(grid: dict, n_random: int | None = None, seed: int = 0) -> list[dict]:
+    """Every grid combination, or n_random distinct ones drawn from it."""
+    from sklearn.ensemble import RandomForestClassifier
+
+    allowed = set(RandomForestClassifier().get_params())
+    unknown = set(grid) - allowed
+    if unknown:
+        raise ValueError(f"Unknown forest parameters: {sorted(unknown)}")
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    if n_random is not None and n_random < len(combos):
+        rng = np.random.default_rng(seed)
+        combos = [combos[i] for i in sorted(rng.choice(len(combos), n_random, replace=False))]
+    return combos
+
+
+def halving_schedule(n_configs: int, min_resource: float, max_resource: float,
+                     eta: int = 3) -> list[tuple[float, int]]:
+    """[(resource, configs evaluated at it), ...], ending at max_resource."""
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    rungs, resource, n = [], min_resource, n_configs
+    while resource < max_resource and n > 1:
+        rungs.append((resource, n))
+        resource, n = resource * eta, max(1, math.ceil(n / eta))
+    rungs.append((max_resource, n))
+    return rungs
+
+
+# ------------------------------------------------------------------------- #
+# Shared training data
+# ------------------------------------------------------------------------- #
+class SharedArrays:
+    """
+    Numpy arrays copied once into named shared-memory blocks. spec() is what
+    a worker needs to map the same memory (attach()).
+    """
+
+    def __init__(self, arrays: dict):
+        from multiprocessing import shared_memory
+
+        self._blocks = []
+        self._spec = {}
+        for name, arr in arrays.items():
+            order = "F" if arr.ndim == 2 and arr.flags.f_contiguous else "C"
+            shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+            view = np.ndarray(arr.shape, arr.dtype, buffer=shm.buf, order=order)
+            view[...] = arr
+            self._blocks.append(shm)
+            self._spec[name] = (shm.name, arr.shape, arr.dtype.str, order)
+
+    def spec(self) -> dict:
+        return dict(self._spec)
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def attach(spec: dict) -> tuple[dict, list]:
+        """Map the blocks of spec; returns ({name: ndarray}, handles to keep alive)."""
+        from multiprocessing import shared_memory
+
+        arrays, handles = {}, []
+        for name, (block, shape, dtype, order) in spec.items():
+            # Pool workers share the parent's resource tracker, so the block
+            # stays registered once and is unlinked by its creator
+            shm = shared_memory.SharedMemory(name=block)
+            arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf, order=order)
+            handles.append(shm)
+        return arrays, handles
+
+
+# ------------------------------------------------------------------------- #
+# Work units (run in the pool, or in-process with workers=1)
+# ------------------------------------------------------------------------- #
+_state: dict = {}
+
+
+def _init(arrays: dict, cv: int, seed: int, metric: str, base_params: dict) -> None:
+    from sklearn.model_selection import StratifiedKFold
+
+    y = arrays["y_train"]
+    _state.update(arrays=arrays, metric=metric, base_params=base_params)
+    _state["folds"] = list(StratifiedKFold(cv, shuffle=True, random_state=seed)
+                           .split(np.zeros(y.size), y))
+
+
+def _init_worker(spec: dict, cv: int, seed: int, metric: str, base_params: dict) -> None:
+    arrays, handles = SharedArrays.attach(spec)
+    _state["handles"] = handles
+    _init(arrays, cv, seed, metric, base_params)
+
+
+def _forest(params: dict, n_estimators: int | None = None):
+    from sklearn.ensemble import RandomForestClassifier
+
+    merged = {**_state["base_params"], **params, "n_jobs": 1}
+    if n_estimators is not None:
+        merged["n_estimators"] = n_estimators
+    return RandomForestClassifier(**merged)
+
+
+def _score(estimator, X, y, metric: str) -> float:
+    from sklearn.metrics import roc_auc_score
+
+    if metric == "accuracy":
+        return float(estimator.score(X, y))
+    return float(roc_auc_score(y, estimator.predict_proba(X)[:, 1]))
+
+
+def _evaluate(task) -> tuple[int, int, float]:
+    """(config index, fold, validation score) for one config on one fold at one budget."""
+    index, params, resource_kind, resource, fold = task
+    X, y = _state["arrays"]["X_train"], _state["arrays"]["y_train"]
+    train_idx, val_idx = _state["folds"][fold]
+    if resource_kind == "data":
+        train_idx = train_idx[:max(2, int(round(resource * train_idx.size)))]
+        estimator = _forest(params)
+    else:
+        estimator = _forest(params, n_estimators=int(resource))
+    estimator.fit(np.asfortranarray(X[train_idx]), y[train_idx])
+    return index, fold, _score(estimator, X[val_idx], y[val_idx], _state["metric"])
+
+
+def _fit_final(task) -> tuple[int, bytes, float]:
+    """Refit on the whole training split: (index, pickled estimator, fit seconds)."""
+    index, params = task
+    a = _state["arrays"]
+    t0 = time.perf_counter()
+    estimator = _forest(params).fit(a["X_train"], a["y_train"])
+    fit_s = time.perf_counter() - t0
+    return index, pickle.dumps(estimator, protocol=pickle.HIGHEST_PROTOCOL), fit_s
+
+
+# ------------------------------------------------------------------------- #
+# Cost measurements (parent process)
+# ------------------------------------------------------------------------- #
+def measure(estimator, X_test, y_test, reps: int = 50) -> dict:
+    """Holdout quality, latency and size of a fitted forest."""
+    from sklearn.metrics import roc_auc_score
+
+    from src.ml.forest import FlatForest
+
+    prob = estimator.predict_proba(X_test)[:, 1]
+    flat = FlatForest.from_sklearn(estimator)
+    row = np.ascontiguousarray(X_test[:1], dtype=np.float64)
+    batch = np.ascontiguousarray(X_test[:1000], dtype=np.float64)
+    return {
+        "accuracy": float(np.mean((prob > 0.5) == y_test)),
+        "auc": float(roc_auc_score(y_test, prob)),
+        "latency_ms": {
+            "sklearn_1": median_seconds(lambda: estimator.predict_proba(row), reps) * 1e3,
+            "flat_1": median_seconds(lambda: flat.predict_positive(row), reps) * 1e3,
+            "sklearn_1000": median_seconds(lambda: estimator.predict_proba(batch),
+                                            max(3, reps // 10)) * 1e3,
+        },
+        "size": {
+            "pickle_bytes": len(pickle.dumps(estimator, protocol=pickle.HIGHEST_PROTOCOL)),
+            "n_trees": flat.n_trees,
+            "n_nodes": flat.n_nodes,
+            "max_depth": flat.max_depth,
+        },
+    }
+
+
+def pareto_front(results: list[dict]) -> list[int]:
+    """Indices of results not dominated on (higher auc, lower flat_1 latency, fewer bytes)."""
+    points = [(-r["auc"], r["latency_ms"]["flat_1"], r["size"]["pickle_bytes"]) for r in results]
+    front = []
+    for i, p in enumerate(points):
+        dominated = any(
+            all(a <= b for a, b in zip(q, p)) and any(a < b for a, b in zip(q, p))
+            for j, q in enumerate(points) if j != i
+        )
+        if not dominated:
+            front.append(i)
+    return front
+
+
+# ------------------------------------------------------------------------- #
+# Driver
+# ------------------------------------------------------------------------- #
+def run_sweep(
+    model: "CreditScoringModel",
+    data_url: str,
+    configs: list[dict],
+    workers: int = 1,
+    resource: str = "trees",
+    min_resource: float | None = None,
+    max_resource: float | None = None,
+    eta: int = 3,
+    cv: int = 3,
+    metric: str = "auc",
+    finalists: int | None = None,
+    seed: int = 0,
+    cache_dir: str | None = None,
+    progress=None,
+) -> dict:
+    """
+    Successive-halving sweep over configs; returns the report (see module
+    docstring). finalists is how many configs are refit and measured, best
+    first (default: the last rung's survivors, at least 3).
+    """
+    if resource not in RESOURCES:
+        raise ValueError(f"resource must be one of {RESOURCES}")
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}")
+    if not configs:
+        raise ValueError("No configurations to evaluate")
+    base_params = dict(FOREST_PARAMS)
+    if resource == "trees":
+        max_resource = max_resource or base_params["n_estimators"]
+        min_resource = min_resource or max(1, max_resource // eta ** 2)
+        if any("n_estimators" in c for c in configs):
+            raise ValueError("n_estimators is the halving resource; don't sweep it")
+    else:
+        max_resource = max_resource or 1.0
+        min_resource = min_resource or max_resource / eta ** 2
+    schedule = halving_schedule(len(configs), min_resource, max_resource, eta)
+
+    t0 = time.perf_counter()
+    data = load_training_data(model, data_url, cache_dir=cache_dir)
+    arrays = {k: data[k] for k in ("X_train", "y_train")}
+
+    shared = pool = None
+    try:
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            shared = SharedArrays(arrays)
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                       initargs=(shared.spec(), cv, seed, metric, base_params))
+            run = lambda fn, tasks: list(pool.map(fn, tasks))  # noqa: E731
+        else:
+            _init(arrays, cv, seed, metric, base_params)
+            run = lambda fn, tasks: [fn(t) for t in tasks]  # noqa: E731
+
+        records = [{"params": c, "rungs": [], "pruned_at": None} for c in configs]
+        alive = list(range(len(configs)))
+        for rung, (budget, _) in enumerate(schedule):
+            tasks = [(i, configs[i], resource, budget, fold) for i in alive for fold in range(cv)]
+            scores: dict = {}
+            for index, _, score in run(_evaluate, tasks):
+                scores.setdefault(index, []).append(score)
+            for i in alive:
+                records[i]["rungs"].append({"resource": budget, "score": float(np.mean(scores[i]))})
+            if rung + 1 < len(schedule):
+                keep = schedule[rung + 1][1]
+                ranked = sorted(alive, key=lambda i: -records[i]["rungs"][-1]["score"])
+                for i in ranked[keep:]:
+                    records[i]["pruned_at"] = budget
+                alive = sorted(ranked[:keep])
+            if progress is not None:
+                progress(rung, budget, len(alive))
+
+        # Survivors first, then the configs that got furthest, by their last score
+        ranked = sorted(range(len(configs)), key=lambda i: (-len(records[i]["rungs"]),
+                                                             -records[i]["rungs"][-1]["score"]))
+        final = ranked[:finalists or max(len(alive), min(3, len(configs)))]
+        # Finalists are refit at the full budget
+        final_params = {i: {**configs[i], "n_estimators": int(max_resource)}
+                        if resource == "trees" else configs[i] for i in final}
+        fitted = run(_fit_final, [(i, final_params[i]) for i in final])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if shared is not None:
+            shared.close()
+
+    measured = []
+    for index, blob, fit_s in fitted:
+        estimator = pickle.loads(blob)
+        result = {"index": index, "params": final_params[index], "fit_seconds": fit_s,
+                  **measure(estimator, data["X_test"], data["y_test"])}
+        records[index]["final"] = result
+        measured.append(result)
+    front = [measured[i]["index"] for i in pareto_front(measured)]
+
+    return {
+        "data": data_url,
+        "base_params": base_params,
+        "resource": resource,
+        "schedule": [{"resource": r, "configs": n} for r, n in schedule],
+        "cv": cv,
+        "metric": metric,
+        "seconds": time.perf_counter() - t0,
+        "configs": records,
+        "best": max(measured, key=lambda r: r[metric]),
+        "frontier": sorted(front, key=lambda i: -records[i]["final"]["auc"]),
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'#':>3} {'auc':>7} {'acc':>7} {'flat 1 ms':>10} {'sk 1 ms':>8} "
+             f"{'nodes':>9} {'KB':>8}  params"]
+    finals = [r["final"] for r in report["configs"] if "final" in r]
+    for r in sorted(finals, key=lambda r: -r["auc"]):
+        mark = "*" if r["index"] in report["frontier"] else " "
+        lines.append(
+            f"{r['index']:>3}{mark}{r['auc']:>7.4f} {r['accuracy']:>7.4f} "
+            f"{r['latency_ms']['flat_1']:>10.3f} {r['latency_ms']['sklearn_1']:>8.2f} "
+            f"{r['size']['n_nodes']:>9,} {r['size']['pickle_bytes'] / 1024:>8,.0f}  "
+            f"{json.dumps(r['params'])}"
+        )
+    pruned = sum(1 for r in report["configs"] if r["pruned_at"] is not None)
+    lines.append(f"{len(report['configs'])} configs, {pruned} pruned early; "
+                 f"* = cost/quality frontier; {report['seconds']:.1f}s")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    from src.ml.credit_model import CreditScoringModel
+    from src.ml.training import train_from_csv
+
+    ap = argparse.ArgumentParser(prog="python -m src.ml.sweep",
+                                 description="Hyperparameter sweep with successive halving")
+    ap.add_argument("data", help="training CSV (same format as train_with_data)")
+    ap.add_argument("--grid", nargs="+", required=True, metavar="PARAM=V1,V2",
+                    help="RandomForestClassifier parameter values, e.g. max_depth=8,16,None")
+    ap.add_argument("--random", type=int, default=None, help="sample this many grid points")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--resource", choices=RESOURCES, default="trees",
+                    help="halving budget: tree count or training-data fraction")
+    ap.add_argument("--min-resource", type=float, default=None)
+    ap.add_argument("--max-resource", type=float, default=None)
+    ap.add_argument("--eta", type=int, default=3)
+    ap.add_argument("--cv", type=int, default=3)
+    ap.add_argument("--metric", choices=METRICS, default="auc")
+    ap.add_argument("--finalists", type=int, default=None)
+    ap.add_argument("--cache-dir", default=None, help="feature cache for the encoded data")
+    ap.add_argument("--out", default=None, help="write the JSON report here")
+    ap.add_argument("--save-best", default=None, help="train and save the best config here")
+    args = ap.parse_args(argv)
+
+    configs = candidates(parse_grid(args.grid), args.random, args.seed)
+    model = CreditScoringModel()
+    trees = args.resource == "trees"
+    report = run_sweep(
+        model, args.data, configs, workers=args.workers, resource=args.resource,
+        min_resource=int(args.min_resource) if trees and args.min_resource else args.min_resource,
+        max_resource=int(args.max_resource) if trees and args.max_resource else args.max_resource,
+        eta=args.eta, cv=args.cv, metric=args.metric, finalists=args.finalists,
+        seed=args.seed, cache_dir=args.cache_dir,
+        progress=lambda rung, budget, alive: print(
+            f"rung {rung}: budget {budget:g}, {alive} config(s) continue", file=sys.stderr),
+    )
+    print(format_report(report))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+    if args.save_best:
+        acc = train_from_csv(model, args.data, cache_dir=args.cache_dir,
+                             params=report["best"]["params"])
+        model.save_model(args.save_best)
+        print(f"Best config {json.dumps(report['best']['params'])}: "
+              f"holdout accuracy {acc:.4f} -> {args.save_best}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+# src/ml/synthetic.py
+"""
+Synthetic loan data, generated in vectorized chunks.
+
+Chunk i draws from its own np.random.Generator seeded with
+SeedSequence(seed, spawn_key=(i,)), so a (seed, chunk size) pair always gives
+the same rows no matter how many processes produce them or in which order.
+
+    python -m src.ml.synthetic data/loans_dataset.csv --rows 60000
+    python -m src.ml.synthetic corpus/ --rows 200_000_000 --chunk-size 2_000_000 --workers 8
+
+An output ending in .csv / .parquet is one file (chunks appended in order);
+anything else is a directory of part-NNNNN partitions (--format csv|parquet,
+default csv) that workers write independently. Parquet needs pyarrow.
+Frames use compact dtypes: category for the string columns, int8 flags,
+int16 counts and float32 values.
+
+Profiles:
+  lending  the data/loans_dataset*.csv corpus: six loan purposes with their
+           own risk multipliers, skewed grade/home/employment mixes
+  demo     CreditScoringModel's built-in training data (uniform grades,
+           four purposes)
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+GRADES = ["A", "B", "C", "D", "E", "F", "G"]
+HOME_OWNERSHIP = ["RENT", "OWN", "MORTGAGE"]
+
+PROFILES = {
+    "lending": {
+        "purpose": {"car": 0.95, "credit_card": 1.10, "debt_consolidation": 0.90,
+                    "home_improvement": 1.00, "medical": 0.95, "small_business": 1.20},
+        "grade_p": [0.15, 0.20, 0.25, 0.20, 0.10, 0.07, 0.03],
+        "home_p": [0.4, 0.2, 0.4],
+        "emp_length_p": [0.05, 0.05, 0.10, 0.10, 0.10, 0.15, 0.15, 0.10, 0.10, 0.05, 0.05],
+        "dti": (5.0, 40.0),
+        "payment_inc_ratio": (1.0, 15.0),
+    },
+    "demo": {
+        "purpose": {"vacation": 1.0, "debt_consolidation": 1.0,
+                    "home_improvement": 1.0, "major_purchase": 1.0},
+        "grade_p": None,
+        "home_p": None,
+        "emp_length_p": [0.1] * 10,
+        "dti": (0.0, 50.0),
+        "payment_inc_ratio": (0.0, 20.0),
+    },
+}
+
+# P(flag = 1) and Poisson means, shared by the profiles
+FLAGS = {"short_emp": 0.3, "delinq_2yrs_zero": 0.7, "last_delinq_none": 0.8,
+         "last_major_derog_none": 0.9, "pub_rec_zero": 0.8}
+COUNTS = {"delinq_2yrs": 0.5, "inq_last_6mths": 2.0, "open_acc": 8.0, "pub_rec": 0.2}
+
+COLUMNS = [
+    "grade", "sub_grade_num", "short_emp", "emp_length_num", "home_ownership", "dti",
+    "purpose", "payment_inc_ratio", "delinq_2yrs", "delinq_2yrs_zero", "inq_last_6mths",
+    "last_delinq_none", "last_major_derog_none", "open_acc", "pub_rec", "pub_rec_zero",
+    "revol_util", "bad_loans",
+]
+
+
+def chunk_rng(seed: int, index: int) -> np.random.Generator:
+    """Independent stream for chunk `index` of a run seeded with `seed`."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+
+def generate_chunk(n: int, rng: np.random.Generator, profile: str = "lending",
+                   compact: bool = True) -> "pd.DataFrame":
+    """
+    n rows in COLUMNS order. compact=False gives plain object/int64/float64
+    columns (same values) for in-memory use.
+    """
+    import pandas as pd
+
+    p = PROFILES[profile]
+    purposes = list(p["purpose"])
+    grade = rng.choice(len(GRADES), n, p=p["grade_p"]).astype(np.int8)
+    home = rng.choice(len(HOME_OWNERSHIP), n, p=p["home_p"]).astype(np.int8)
+    purpose = rng.integers(0, len(purposes), n, dtype=np.int8)
+    cols = {
+        "sub_grade_num": rng.random(n, dtype=np.float32),
+        "emp_length_num": rng.choice(len(p["emp_length_p"]), n, p=p["emp_length_p"]).astype(np.int16),
+        "dti": rng.uniform(*p["dti"], n).astype(np.float32),
+        "payment_inc_ratio": rng.uniform(*p["payment_inc_ratio"], n).astype(np.float32),
+        "revol_util": rng.uniform(0.0, 100.0, n).astype(np.float32),
+    }
+    for name, p1 in FLAGS.items():
+        cols[name] = (rng.random(n) < p1).astype(np.int8)
+    for name, lam in COUNTS.items():
+        cols[name] = rng.poisson(lam, n).astype(np.int16)
+
+    # Heuristic risk -> bad_loans, scaled by the purpose's strictness
+    risk = (
+        (cols["dti"] > 30) * 0.3
+        + (cols["delinq_2yrs"] > 0) * 0.4
+        + (cols["revol_util"] > 80) * 0.2
+        + (grade >= GRADES.index("F")) * 0.3
+        + rng.normal(0.0, 0.1, n)
+    ) * np.array(list(p["purpose"].values()))[purpose]
+    cols["bad_loans"] = (risk > 0.4).astype(np.int8)
+
+    for name, codes, categories in (("grade", grade, GRADES),
+                                    ("home_ownership", home, HOME_OWNERSHIP),
+                                    ("purpose", purpose, purposes)):
+        cols[name] = (pd.Categorical.from_codes(codes, categories) if compact
+                      else np.asarray(categories, dtype=object)[codes])
+    frame = pd.DataFrame({c: cols[c] for c in COLUMNS})
+    if not compact:
+        frame = frame.astype({c: np.int64 if frame[c].dtype.kind == "i" else np.float64
+                              for c in COLUMNS if frame[c].dtype.kind in "if"})
+    return frame
+
+
+def generate(n_rows: int, seed: int = 42, profile: str = "lending", chunk_size: int = 1_000_000,
+             compact: bool = True) -> "pd.DataFrame":
+    """All n_rows in memory (for small corpora; the CLI streams)."""
+    import pandas as pd
+
+    frames = [generate_chunk(n, chunk_rng(seed, i), profile, compact)
+              for i, n in enumerate(chunk_sizes(n_rows, chunk_size))]
+    if not frames:
+        return generate_chunk(0, chunk_rng(seed, 0), profile, compact)
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def chunk_sizes(n_rows: int, chunk_size: int) -> list[int]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    full, rest = divmod(n_rows, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+# ------------------------------------------------------------------------- #
+# Writers
+# ------------------------------------------------------------------------- #
+def _format_of(path: str) -> str | None:
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".parquet", ".pq")):
+        return "parquet"
+    return None
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "Parquet output needs pyarrow (pip install pyarrow); write .csv or use --format csv"
+        ) from None
+
+
+def _write_part(frame: "pd.DataFrame", path: str, fmt: str) -> None:
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def _make_part(args) -> int:
+    """Worker task: generate chunk `index` and write it as its own partition."""
+    index, n, seed, profile, path, fmt = args
+    _write_part(generate_chunk(n, chunk_rng(seed, index), profile), path, fmt)
+    return n
+
+
+def _make_chunk(args) -> "pd.DataFrame":
+    index, n, seed, profile = args
+    return generate_chunk(n, chunk_rng(seed, index), profile)
+
+
+class _SingleFile:
+    """Appends chunks to one CSV (header once) or Parquet file (a row group per chunk)."""
+
+    def __init__(self, path: str, fmt: str):
+        self.path, self.fmt = path, fmt
+        self._writer = None
+        self._first = True
+
+    def write(self, frame: "pd.DataFrame") -> None:
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._first else "a",
+                         header=self._first, index=False)
+        self._first = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def write_dataset(
+    output: str,
+    n_rows: int,
+    seed: int = 42,
+    profile: str = "lending",
+    chunk_size: int = 1_000_000,
+    workers: int = 1,
+    fmt: str = "csv",
+    progress=None,
+) -> dict:
+    """
+    Generate n_rows into output (single .csv/.parquet file, else a directory
+    of partitions in fmt). Returns {"rows", "chunks", "seconds", "rows_per_sec"}.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile {profile!r}; expected one of {list(PROFILES)}")
+    sizes = chunk_sizes(n_rows, chunk_size)
+    single = _format_of(output)
+    if single is None and fmt not in ("csv", "parquet"):
+        raise ValueError(f"Unknown format {fmt!r}")
+    if (single or fmt) == "parquet":
+        _require_pyarrow()
+    if single is None:
+        os.makedirs(output, exist_ok=True)
+
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(workers)
+
+    report = {"rows": 0, "chunks": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+    t0 = time.perf_counter()
+
+    def done(n):
+        report["rows"] += n
+        report["chunks"] += 1
+        report["seconds"] = time.perf_counter() - t0
+        report["rows_per_sec"] = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+        if progress is not None:
+            progress(report)
+
+    try:
+        if single is None:
+            tasks = [(i, n, seed, profile, os.path.join(output, f"part-{i:05d}.{fmt}"), fmt)
+                     for i, n in enumerate(sizes)]
+            if pool is None:
+                for task in tasks:
+                    done(_make_part(task))
+            else:
+                for n in pool.map(_make_part, tasks):
+                    done(n)
+        else:
+            writer = _SingleFile(output, single)
+            try:
+                tasks = ((i, n, seed, profile) for i, n in enumerate(sizes))
+                if pool is None:
+                    for task in tasks:
+                        frame = _make_chunk(task)
+                        writer.write(frame)
+                        done(len(frame))
+                else:
+                    # Bounded read-ahead; chunks are written in order
+                    pending: deque = deque()
+                    for task in tasks:
+                        pending.append(pool.submit(_make_chunk, task))
+                        if len(pending) >= 2 * workers:
+                            frame = pending.popleft().result()
+                            writer.write(frame)
+                            done(len(frame))
+                    while pending:
+                        frame = pending.popleft().result()
+                        writer.write(frame)
+                        done(len(frame))
+            finally:
+                writer.close()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    report["seconds"] = time.perf_counter() - t0
+    report["rows_per_sec"] = report["rows"] / report["seconds"] if report["seconds"] else 0.0
+    return report
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.ml.synthetic",
+                                 description="Generate a synthetic loan dataset")
+    ap.add_argument("output", help="a .csv/.parquet file, or a directory for partitions")
+    ap.add_argument("--rows", type=lambda s: int(s.replace("_", "")), default=60_000)
+    ap.add_argument("--chunk-size", type=lambda s: int(s.replace("_", "")), default=1_000_000)
+    ap.add_argument("--workers", type=int, default=1, help="generator processes")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--profile", choices=list(PROFILES), default="lending")
+    ap.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                    help="partition format when output is a directory (parquet needs pyarrow)")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args(argv)
+
+    def progress(r):
+        print(f"chunk {r['chunks']}: {r['rows']:,} rows, {r['rows_per_sec']:,.0f} rows/s",
+              file=sys.stderr)
+
+    try:
+        report = write_dataset(args.output, args.rows, seed=args.seed, profile=args.profile,
+                               chunk_size=args.chunk_size, workers=args.workers, fmt=args.format,
+                               progress=None if args.quiet else progress)
+    except ImportError as e:
+        ap.error(str(e))
+    print(f"Wrote {report['rows']:,} rows in {report['chunks']} chunk(s) to {args.output} "
+          f"in {report['seconds']:.2f}s ({report['rows_per_sec']:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
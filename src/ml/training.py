@@ -0,0 +1,211 @@
+# src/ml/training.py
+"""
+Memory-lean training from a loans CSV, equivalent to
+CreditScoringModel.train_with_data(data_url) but built for large files:
+
+  - the CSV is read with explicit compact dtypes (category for the string
+    columns, float32 for continuous values, Int8/Int16 for flags and counts)
+    and only the columns the model uses;
+  - the train/test split is drawn on row indices, and X_train / X_test are
+    written once, column by column, into preallocated column-major float32
+    arrays (the layout sklearn's tree builder would otherwise copy into);
+  - the forest is fit (and scored) with n_jobs workers.
+
+sklearn's trees work in float32 internally, so the fitted forest is the same
+as the legacy path's for the same data. Wall time and peak RSS are recorded
+per phase (read, encode, fit, evaluate):
+
+    python -m src.ml.training data/loans_dataset_30k.csv models/credit_model.pkl --n-jobs -1
+"""
+import argparse
+import sys
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.ml.encoder import CompiledEncoder
+from src.utils.profiling import PhaseTimer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.ml.credit_model import CreditScoringModel
+
+TARGET = "bad_loans"
+# Columns read as nullable integers (missing values survive parsing and are
+# dropped with the rest); anything else numeric is float32
+FLAG_COLS = ("short_emp", "delinq_2yrs_zero", "last_delinq_none",
+             "last_major_derog_none", "pub_rec_zero")
+COUNT_COLS = ("emp_length_num", "delinq_2yrs", "inq_last_6mths", "open_acc", "pub_rec")
+# Holdout split and forest of train_with_data
+TEST_SIZE = 0.33
+SPLIT_SEED = 100
+FOREST_PARAMS = {"n_estimators": 100, "random_state": 42, "class_weight": "balanced"}
+
+
+def compact_dtypes(model: "CreditScoringModel") -> dict:
+    """read_csv dtype map for the model's columns and the target."""
+    dtypes = {c: "category" for c in model.categorical_cols}
+    for c in model.numerical_cols:
+        dtypes[c] = "Int8" if c in FLAG_COLS else "Int16" if c in COUNT_COLS else "float32"
+    dtypes[TARGET] = "Int8"
+    return dtypes
+
+
+def read_training_csv(path: str, model: "CreditScoringModel") -> "pd.DataFrame":
+    """The model's feature columns + target with compact dtypes, incomplete rows dropped."""
+    import pandas as pd
+
+    columns = list(model.features) + [TARGET]
+    frame = pd.read_csv(path, usecols=columns, dtype=compact_dtypes(model))[columns].dropna()
+    for c in model.categorical_cols:
+        frame[c] = frame[c].cat.remove_unused_categories()
+    return frame
+
+
+def fit_mapper(model: "CreditScoringModel", vocabularies: dict):
+    """
+    A fitted train.py mapper with the given classes, fit on a frame holding
+    each class once instead of on the full data.
+    """
+    import pandas as pd
+
+    mapper = model.make_mapper()
+    size = max(len(v) for v in vocabularies.values())
+    mapper.fit(pd.DataFrame({c: np.resize(np.asarray(v, dtype=object), size)
+                             for c, v in vocabularies.items()}))
+    return mapper
+
+
+def set_vocabularies(model: "CreditScoringModel", vocabularies: dict) -> None:
+    """Fit model.mapper to the given classes and refresh feature_names/encoder."""
+    model.mapper = fit_mapper(model, vocabularies)
+    model.feature_names = model._expanded_feature_names_from_mapper(None)
+    model._compile_encoder()
+
+
+def build_design_matrix(frame: "pd.DataFrame", encoder: CompiledEncoder,
+                        rows: np.ndarray) -> np.ndarray:
+    """
+    float32 matrix of frame.iloc[rows] in the encoder's layout, filled one
+    column at a time (no intermediate full-size copies). Column-major, so
+    each fill is a contiguous write.
+    """
+    n = rows.size
+    X = np.zeros((n, encoder.n_features), dtype=np.float32, order="F")
+    positions = np.arange(n)
+    for col, _, lookup in encoder.categorical:
+        cat = frame[col].cat
+        table = np.array([lookup.get(c, -1) for c in cat.categories] + [-1], dtype=np.intp)
+        idx = table[cat.codes.to_numpy()[rows]]   # code -1 (missing) -> table[-1] = -1
+        hit = idx >= 0
+        X[positions[hit], idx[hit]] = 1.0
+    for j, col in enumerate(encoder.numerical_cols):
+        X[:, encoder.n_categorical + j] = frame[col].to_numpy(dtype=np.float32)[rows]
+    return X
+
+
+def encode_training_data(model: "CreditScoringModel", frame: "pd.DataFrame") -> dict:
+    """
+    Split and encode a read_training_csv frame. Returns {"X_train", "X_test",
+    "y_train", "y_test", "vocabularies"}; the matrices are separate
+    column-major arrays, the layout sklearn's tree builder uses as-is.
+    """
+    from sklearn.model_selection import train_test_split
+
+    y = frame[TARGET].to_numpy(dtype=np.int8)
+    vocabularies = {c: sorted(frame[c].cat.categories) for c in model.categorical_cols}
+    encoder = CompiledEncoder.from_vocabularies(vocabularies, model.numerical_cols)
+    # Same split as train_test_split(X, y, ...) in train_with_data
+    train_idx, test_idx = train_test_split(
+        np.arange(len(frame)), test_size=TEST_SIZE, random_state=SPLIT_SEED, stratify=y
+    )
+    return {
+        "X_train": build_design_matrix(frame, encoder, train_idx),
+        "X_test": build_design_matrix(frame, encoder, test_idx),
+        "y_train": y[train_idx],
+        "y_test": y[test_idx],
+        "vocabularies": vocabularies,
+    }
+
+
+def load_training_data(model: "CreditScoringModel", data_url: str,
+                       timer: PhaseTimer | None = None, cache_dir: str | None = None) -> dict:
+    """
+    encode_training_data(read_training_csv(data_url)), served from the
+    feature cache in cache_dir when present (and written there on a miss).
+    """
+    from src.ml import feature_cache
+
+    timer = timer or PhaseTimer()
+    if cache_dir is not None:
+        with timer.phase("cache_load"):
+            source = feature_cache.describe_source(data_url)
+            path = feature_cache.cache_path(cache_dir, source, model)
+            data = feature_cache.read_cache(path)
+        if data is not None:
+            return data
+
+    with timer.phase("read"):
+        frame = read_training_csv(data_url, model)
+    with timer.phase("encode"):
+        data = encode_training_data(model, frame)
+        del frame
+    if cache_dir is not None:
+        with timer.phase("cache_write"):
+            feature_cache.write_cache(path, data, model, source)
+    return data
+
+
+def train_from_csv(model: "CreditScoringModel", data_url: str, n_jobs: int | None = -1,
+                   timer: PhaseTimer | None = None, cache_dir: str | None = None,
+                   params: dict | None = None) -> float:
+    """
+    Train model in place from data_url; returns holdout accuracy. With
+    cache_dir, the encoded matrix is reused across runs (src/ml/feature_cache.py).
+    params override FOREST_PARAMS (e.g. a sweep's best configuration).
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    timer = timer or PhaseTimer()
+    data = load_training_data(model, data_url, timer, cache_dir)
+    set_vocabularies(model, data["vocabularies"])
+
+    with timer.phase("fit"):
+        estimator = RandomForestClassifier(**{**FOREST_PARAMS, **(params or {}), "n_jobs": n_jobs})
+        estimator.fit(data["X_train"], data["y_train"])
+        model.model = estimator
+
+    with timer.phase("evaluate"):
+        test_score = float(estimator.score(data["X_test"], data["y_test"]))
+    # Serving scores one row at a time; don't fan every predict out to a pool
+    estimator.set_params(n_jobs=None)
+
+    model._after_fit()
+    return test_score
+
+
+def main(argv=None) -> int:
+    from src.ml.credit_model import CreditScoringModel
+
+    ap = argparse.ArgumentParser(prog="python -m src.ml.training",
+                                 description="Train the credit model from a loans CSV")
+    ap.add_argument("data", help="CSV with the model's feature columns and bad_loans")
+    ap.add_argument("output", help="where to save the joblib model")
+    ap.add_argument("--n-jobs", type=int, default=-1, help="fit/score workers (-1 = all cores)")
+    ap.add_argument("--cache-dir", default=None,
+                    help="reuse/write the encoded training matrix here (feature cache)")
+    args = ap.parse_args(argv)
+
+    model = CreditScoringModel()
+    timer = PhaseTimer()
+    acc = train_from_csv(model, args.data, n_jobs=args.n_jobs, timer=timer,
+                         cache_dir=args.cache_dir)
+    model.save_model(args.output)
+    print(timer.format())
+    print(f"Holdout accuracy: {acc:.4f} -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
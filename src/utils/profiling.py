@@ -0,0 +1,98 @@
+# src/utils/profiling.py
+import resource
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+
+def _status_kb(field: str) -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak() -> bool:
+    """Reset the kernel's peak-RSS counter (Linux); False if unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size since the last reset (or process start), in MB."""
+    kb = _status_kb("VmHWM")
+    if kb is None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        kb = maxrss / 1024 if sys.platform == "darwin" else maxrss  # bytes on macOS
+    return kb / 1024
+
+
+def rss_mb() -> float | None:
+    kb = _status_kb("VmRSS")
+    return kb / 1024 if kb is not None else None
+
+
+def median_seconds(fn, reps: int) -> float:
+    """Median wall time of fn() over reps calls, after one warm-up call."""
+    fn()
+    samples = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+class PhaseTimer:
+    """
+    Wall time and peak RSS per named phase:
+
+        timer = PhaseTimer()
+        with timer.phase("read"):
+            ...
+        timer.report  ->  [{"phase", "seconds", "peak_rss_mb", "rss_mb"}, ...]
+
+    Where the kernel allows it the peak is reset at the start of each phase,
+    so peak_rss_mb is that phase's own high-water mark; otherwise it is the
+    process peak so far.
+    """
+
+    def __init__(self):
+        self.report: list[dict] = []
+        self.per_phase_peak = _reset_peak()
+
+    @contextmanager
+    def phase(self, name: str):
+        self.per_phase_peak = _reset_peak() and self.per_phase_peak
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.report.append({
+                "phase": name,
+                "seconds": time.perf_counter() - t0,
+                "peak_rss_mb": peak_rss_mb(),
+                "rss_mb": rss_mb(),
+            })
+
+    def format(self) -> str:
+        lines = [f"{'phase':<12} {'wall s':>9} {'peak RSS MB':>12} {'RSS MB':>9}"]
+        for r in self.report:
+            rss = f"{r['rss_mb']:.0f}" if r["rss_mb"] is not None else "-"
+            lines.append(f"{r['phase']:<12} {r['seconds']:>9.2f} {r['peak_rss_mb']:>12.0f} {rss:>9}")
+        total = sum(r["seconds"] for r in self.report)
+        peak = max((r["peak_rss_mb"] for r in self.report), default=0.0)
+        lines.append(f"{'total':<12} {total:>9.2f} {peak:>12.0f}")
+        return "\n".join(lines)
+
+
+__all__ = ["PhaseTimer", "median_seconds", "peak_rss_mb", "rss_mb"]
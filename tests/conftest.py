@@ -13,3 +13,12 @@ def client():
     # Context manager triggers FastAPI startup/shutdown (loads model)
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture(scope="session")
+def trained_model():
+    # Small model trained on the built-in synthetic data; independent of MODEL_PATH
+    from src.ml.credit_model import CreditScoringModel
+    m = CreditScoringModel()
+    m.train_with_data()
+    return m
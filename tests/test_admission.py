@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from starlette.testclient import TestClient
+
+import src.api.server as server
+from src.api.admission import Gate, Rejected, RouteLimit, parse_route_limits
+from src.ml.credit_model import create_sample_application
+
+
+def test_gate_queues_then_sheds():
+    async def run():
+        gate = Gate("/r", RouteLimit(limit=1, queue=1, timeout=0.2))
+        await gate.acquire()                      # runs
+        waiter = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        assert gate.queue_depth == 1
+        with pytest.raises(Rejected) as full:
+            await gate.acquire()                  # queue full
+        assert full.value.status_code == 429 and full.value.retry_after >= 1
+
+        gate.release(10_000_000)                  # slot handed to the waiter
+        await waiter
+        assert gate.in_flight == 1 and gate.queue_depth == 0 and gate.service_s > 0
+
+        with pytest.raises(Rejected) as late:     # nobody releases within the deadline
+            await gate.acquire()
+        assert late.value.status_code == 503 and gate.queue_depth == 0
+        gate.release()
+        assert gate.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_gate_rejects_on_arrival_when_deadline_cant_be_met():
+    async def run():
+        gate = Gate("/r", RouteLimit(limit=2, queue=10, timeout=0.5))
+        gate.service_s = 1.0
+        await gate.acquire()
+        await gate.acquire()
+        t0 = time.perf_counter()
+        with pytest.raises(Rejected) as e:
+            await gate.acquire()
+        assert e.value.reason == "deadline" and time.perf_counter() - t0 < 0.1
+
+    asyncio.run(run())
+
+
+def test_parse_route_limits():
+    default = RouteLimit(8, 32, 1.0)
+    assert parse_route_limits("/predict_batch=2:4, /explain=3", default) == {
+        "/predict_batch": RouteLimit(2, 4, 1.0), "/explain": RouteLimit(3, 32, 1.0),
+    }
+    with pytest.raises(ValueError):
+        parse_route_limits("predict=2", default)
+
+
+def test_api_sheds_scoring_but_not_health(monkeypatch):
+    monkeypatch.setattr(server, "ADMISSION", True)
+    monkeypatch.setattr(server, "ADMISSION_ROUTE_LIMITS", "/predict=1:1")
+    monkeypatch.setattr(server, "ADMISSION_QUEUE_TIMEOUT_MS", 5000)
+    row = create_sample_application()
+    started, gate_open = threading.Event(), threading.Event()
+
+    with TestClient(server.app) as c:
+        real = server.model.predict
+
+        def slow_predict(r):
+            started.set()
+            gate_open.wait(10)
+            return real(r)
+
+        monkeypatch.setattr(server.model, "predict", slow_predict)
+        with ThreadPoolExecutor(4) as pool:
+            first = pool.submit(c.post, "/predict", json=row)
+            assert started.wait(10)
+            queued = pool.submit(c.post, "/predict", json=row)
+            while server.admission.gate("/predict").queue_depth < 1:
+                time.sleep(0.005)
+            shed = c.post("/predict", json=row)
+            assert shed.status_code == 429 and int(shed.headers["Retry-After"]) >= 1
+
+            t0 = time.perf_counter()
+            assert c.get("/healthz").status_code == 200
+            assert time.perf_counter() - t0 < 1.0
+            metrics = c.get("/metrics").text
+            assert 'admission_queue_depth{route="/predict"} 1' in metrics
+            assert 'admission_rejected_total{route="/predict",reason="queue_full"}' in metrics
+
+            gate_open.set()
+            assert first.result().status_code == 200 and queued.result().status_code == 200
+        assert c.get("/model_info").json()["admission"]["/predict"]["in_flight"] == 0
+    assert server.admission is None
+
+
+def test_admission_off_by_default():
+    with TestClient(server.app) as c:
+        assert server.admission is None
+        assert c.post("/predict", json=create_sample_application()).status_code == 200
@@ -0,0 +1,91 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.ml import artifact
+from src.ml.credit_model import CreditScoringModel, create_sample_application
+
+
+@pytest.fixture(scope="module")
+def artifact_dir(trained_model, tmp_path_factory):
+    path = tmp_path_factory.mktemp("artifact") / "credit_model"
+    artifact.save_artifact(trained_model, str(path), thresholds={"approve": 0.3, "reject": 0.7})
+    return path
+
+
+def _rows(n=300):
+    rng = np.random.default_rng(3)
+    base = create_sample_application()
+    return [
+        {**base, "grade": "ABCDEFG"[i % 7], "dti": float(rng.uniform(0, 50)),
+         "revol_util": float(rng.uniform(0, 100))}
+        for i in range(n)
+    ]
+
+
+def test_artifact_roundtrip_is_exact_and_mmapped(trained_model, artifact_dir):
+    m = CreditScoringModel()
+    m.load_model(str(artifact_dir))
+    assert m.backend == "flat" and m._model is None
+    assert isinstance(m.forest.threshold.base, np.memmap)
+
+    rows = _rows()
+    small = rows[:CreditScoringModel.FLAT_MAX_ROWS]
+    assert np.array_equal(m.predict_many(small), trained_model.predict_many(small))
+    assert m.predict(rows[0]) == trained_model.predict(rows[0])
+
+    info = m.get_info()
+    assert info["top_features"] == trained_model.get_info()["top_features"]
+    assert m.manifest["thresholds"] == {"approve": 0.3, "reject": 0.7}
+
+    # Explanations run on the mapped covers with the native TreeSHAP
+    row = create_sample_application()
+    expected = trained_model.explain_prediction(row)
+    np.testing.assert_allclose(
+        list(m.explain_prediction(row).values()), list(expected.values()), atol=1e-12
+    )
+    assert m._model is None  # single rows and small batches never touch the estimator
+
+    # Larger batches go to the bundled estimator's compiled traversal
+    assert np.array_equal(m.predict_many(rows), trained_model.predict_many(rows))
+    assert m._model is not None
+
+
+def test_artifact_loads_estimator_on_demand(artifact_dir):
+    m = CreditScoringModel()
+    m.load_model(str(artifact_dir / "manifest.json"))
+    assert m.model is not None
+    assert set(m.explain_prediction(create_sample_application())) == set(m.feature_names)
+
+
+def test_artifact_checksum_mismatch(artifact_dir, tmp_path):
+    import shutil
+    bad = tmp_path / "bad"
+    shutil.copytree(artifact_dir, bad)
+    value = np.load(bad / "arrays" / "value.npy")
+    value[0] += 1.0
+    np.save(bad / "arrays" / "value.npy", value)
+    with pytest.raises(ValueError, match="Checksum"):
+        artifact.load_artifact(str(bad))
+
+
+def test_artifact_rejects_newer_schema(artifact_dir, tmp_path):
+    import shutil
+    newer = tmp_path / "newer"
+    shutil.copytree(artifact_dir, newer)
+    manifest = json.loads((newer / "manifest.json").read_text())
+    manifest["schema_version"] = artifact.SCHEMA_VERSION + 1
+    (newer / "manifest.json").write_text(json.dumps(manifest))
+    with pytest.raises(ValueError, match="newer"):
+        artifact.load_artifact(str(newer))
+
+
+def test_convert_cli(trained_model, tmp_path):
+    src = tmp_path / "credit_model.pkl"
+    trained_model.save_model(str(src))
+    dst = tmp_path / "converted"
+    assert artifact.main(["convert", str(src), str(dst), "--no-estimator"]) == 0
+    manifest = artifact.read_manifest(str(dst))
+    assert manifest["estimator"] is None
+    assert manifest["vocabularies"]["grade"] == list("ABCDEFG")
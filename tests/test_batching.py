@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from starlette.testclient import TestClient
+
+import src.api.server as server
+from src.api.batching import BATCH_SIZE, MicroBatcher
+from src.api.instrumentation import STAGE_LATENCY
+from src.ml.credit_model import create_sample_application
+
+
+class RecordingModel:
+    """Scores rows as row["x"] / 100 and records each batch size."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_many(self, rows):
+        self.batches.append(len(rows))
+        return [r["x"] / 100.0 for r in rows]
+
+
+def test_microbatcher_groups_requests_and_keeps_order():
+    m = RecordingModel()
+
+    async def run():
+        b = MicroBatcher(max_batch=4, max_wait_ms=50)
+        await b.start()
+        try:
+            return await asyncio.gather(*(b.submit(m, {"x": i}) for i in range(10)))
+        finally:
+            await b.stop()
+
+    probs = asyncio.run(run())
+    assert probs == [i / 100.0 for i in range(10)]
+    assert sum(m.batches) == 10 and max(m.batches) <= 4
+    assert len(m.batches) < 10
+
+
+def test_microbatcher_propagates_errors():
+    class Broken:
+        def predict_many(self, rows):
+            raise ValueError("boom")
+
+    async def run():
+        b = MicroBatcher(max_batch=8, max_wait_ms=1)
+        await b.start()
+        try:
+            await b.submit(Broken(), {"x": 1})
+        finally:
+            await b.stop()
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run())
+
+
+def test_microbatcher_isolates_a_bad_row():
+    class RejectsNegative(RecordingModel):
+        def predict_many(self, rows):
+            if any(r["x"] < 0 for r in rows):
+                raise ValueError("negative")
+            return super().predict_many(rows)
+
+    m = RejectsNegative()
+
+    async def run():
+        b = MicroBatcher(max_batch=8, max_wait_ms=50)
+        await b.start()
+        try:
+            return await asyncio.gather(*(b.submit(m, {"x": x}) for x in (1, -1, 2, 3)),
+                                        return_exceptions=True)
+        finally:
+            await b.stop()
+
+    ok1, bad, ok2, ok3 = asyncio.run(run())
+    assert (ok1, ok2, ok3) == (0.01, 0.02, 0.03)
+    assert isinstance(bad, ValueError)
+
+
+def _stage_count(stage):
+    return (STAGE_LATENCY.snapshot(("/predict", stage)) or {"count": 0})["count"]
+
+
+def test_api_with_microbatching_matches_direct(monkeypatch):
+    monkeypatch.setattr(server, "MICROBATCH", True)
+    before = (BATCH_SIZE.snapshot() or {"count": 0})["count"]
+    stages_before = _stage_count("predict_proba")
+    row = create_sample_application()
+    with TestClient(server.app) as c:
+        assert server.batcher is not None
+        r = c.post("/predict", json=row)
+        assert r.status_code == 200, r.text
+        expected = max(0.0, min(1.0, float(server.model.predict(row))))
+        assert r.json()["prob_default"] == pytest.approx(expected, abs=1e-12)
+        assert "microbatch_size_bucket" in c.get("/metrics").text
+    assert server.batcher is None
+    assert BATCH_SIZE.snapshot()["count"] > before
+    assert _stage_count("predict_proba") == stages_before + 1
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from benchmarks import suite
+
+
+def _result(case, p50, p95, tput, batch=1, conc=1):
+    return {"case": case, "batch": batch, "concurrency": conc, "calls": 10,
+            "p50_ms": p50, "p95_ms": p95, "p99_ms": p95, "mean_ms": p50,
+            "throughput_rows_per_s": tput}
+
+
+def test_summarize_percentiles():
+    stats = suite.summarize([i / 1000 for i in range(1, 101)], rows=200, wall=2.0)
+    assert stats["calls"] == 100
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["p99_ms"] == pytest.approx(99.01)
+    assert stats["throughput_rows_per_s"] == 100.0
+
+
+def test_compare_flags_regressions(tmp_path):
+    base = {"results": [_result("predict", 1.0, 2.0, 1000.0), _result("explain", 10.0, 20.0, 50.0)]}
+    cur = {"results": [_result("predict", 1.1, 2.9, 990.0), _result("explain", 10.0, 20.0, 30.0),
+                       _result("load_model", 99.0, 99.0, 1.0)]}
+    regressions = suite.compare(base, cur, tolerance=0.2)
+    assert {(g["case"], g["metric"]) for g in regressions} == {
+        ("predict", "p95_ms"), ("explain", "throughput_rows_per_s")
+    }
+    assert suite.compare(base, base) == []
+
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    a.write_text(json.dumps(base))
+    b.write_text(json.dumps(cur))
+    assert suite.main(["--compare", str(a), str(a)]) == 0
+    assert suite.main(["--compare", str(a), str(b)]) == 1
+
+
+def test_run_suite_smoke(trained_model, tmp_path):
+    path = tmp_path / "model.pkl"
+    trained_model.save_model(str(path))
+    report = suite.run_suite(str(path), cases=["predict", "load_model", "api_predict_loan"],
+                             min_time=0.01, batches=[1, 5], concurrency=[1, 2])
+    keys = [(r["case"], r["batch"], r["concurrency"]) for r in report["results"]]
+    assert keys == [("predict", 1, 1), ("predict", 1, 2), ("predict", 5, 1), ("predict", 5, 2),
+                    ("load_model", 1, 1), ("api_predict_loan", 1, 1), ("api_predict_loan", 1, 2)]
+    for r in report["results"]:
+        assert r["calls"] >= 3 and 0 < r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"]
+        assert r["throughput_rows_per_s"] > 0
+    assert report["meta"]["model"] == str(path)
+    with pytest.raises(ValueError, match="Unknown"):
+        suite.run_suite(str(path), cases=["nope"])
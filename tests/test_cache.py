@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+
+from src.ml.credit_model import create_sample_application
+from src.utils.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_counters():
+    c = LRUCache(maxsize=2)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1          # a becomes most recent
+    c.put("c", 3)                   # evicts b
+    assert c.get("b") is None
+    assert c.get("c") == 3
+    stats = c.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 1, 1, 2)
+
+
+def test_lru_ttl_expiry():
+    clock = FakeClock()
+    c = LRUCache(maxsize=10, ttl=5, clock=clock)
+    c.put("k", 1.0)
+    clock.now = 4.9
+    assert c.get("k") == 1.0
+    clock.now = 5.0
+    assert c.get("k") is None
+    assert c.stats()["expirations"] == 1 and len(c) == 0
+
+
+def test_lru_concurrent_access():
+    c = LRUCache(maxsize=50)
+
+    def worker(seed):
+        for i in range(2000):
+            key = (seed * 7 + i) % 80
+            if c.get(key) is None:
+                c.put(key, key)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = c.stats()
+    assert stats["size"] <= 50
+    assert stats["hits"] + stats["misses"] == 8 * 2000
+
+
+def test_model_prediction_cache(trained_model):
+    rows = [{**create_sample_application(), "dti": float(d)} for d in (5, 10, 5, 20)]
+    expected = [trained_model.predict(r) for r in rows]
+    try:
+        trained_model.enable_cache(maxsize=16)
+        assert [trained_model.predict(r) for r in rows] == expected
+        assert trained_model.cache.stats()["hits"] == 1
+
+        probs = trained_model.predict_many(rows)
+        assert np.array_equal(probs, expected)
+        assert trained_model.cache.stats()["hits"] == 5
+    finally:
+        trained_model.enable_cache(0)
+    assert trained_model.cache is None
+
+
+def test_model_info_reports_cache(client):
+    info = client.get("/model_info").json()
+    assert set(info["cache"]) >= {"hits", "misses", "evictions", "size"}
@@ -0,0 +1,134 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import src.api.server as server
+from src.api.chat import SYSTEM_PROMPT, UPSTREAM
+
+
+class StandIn:
+    """Local OpenAI-style chat completions server recording what it receives."""
+
+    def __init__(self):
+        self.calls = []
+        self.app = Starlette(routes=[Route("/v1/chat/completions", self.handle, methods=["POST"])])
+
+    async def handle(self, request):
+        body = await request.json()
+        self.calls.append({"body": body, "auth": request.headers.get("authorization"),
+                           "port": request.scope["client"][1]})
+        text = body["messages"][-1]["content"]
+        if text == "fail":
+            return JSONResponse({"error": "overloaded"}, status_code=503)
+        words = ["echo:", *text.split()]
+        if not body["stream"]:
+            return JSONResponse({"id": "c1", "object": "chat.completion", "model": body["model"],
+                                 "choices": [{"index": 0, "finish_reason": "stop",
+                                              "message": {"role": "assistant",
+                                                          "content": " ".join(words)}}]})
+
+        async def events():
+            for i, w in enumerate(words):
+                chunk = {"id": "c1", "model": body["model"], "choices": [{
+                    "index": 0, "delta": {"content": w if i == 0 else " " + w},
+                    "finish_reason": "stop" if i == len(words) - 1 else None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    stand_in = StandIn()
+    srv = uvicorn.Server(uvicorn.Config(stand_in.app, log_level="warning"))
+    thread = threading.Thread(target=srv.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not srv.started:
+        time.sleep(0.01)
+    stand_in.url = f"http://127.0.0.1:{sock.getsockname()[1]}/v1/chat/completions"
+    yield stand_in
+    srv.should_exit = True
+    thread.join(5)
+
+
+@pytest.fixture()
+def chat_client(upstream, monkeypatch):
+    monkeypatch.setenv("CEREBRAS_API_KEY", "test-key")
+    monkeypatch.setattr(server, "CHAT_UPSTREAM_URL", upstream.url)
+    upstream.calls.clear()
+    return lambda: TestClient(server.app)
+
+
+def _ask(text, stream=False):
+    return {"messages": [{"role": "user", "content": text}], "stream": stream}
+
+
+def test_buffered_calls_share_one_pooled_connection(upstream, chat_client):
+    with chat_client() as c:
+        for i in range(5):
+            r = c.post("/api/ai-chat", json=_ask(f"hello {i}"))
+            assert r.status_code == 200
+            assert r.json()["choices"][0]["message"]["content"] == f"echo: hello {i}"
+    assert len(upstream.calls) == 5
+    assert len({call["port"] for call in upstream.calls}) == 1  # keep-alive reuse
+    first = upstream.calls[0]
+    assert first["auth"] == "Bearer test-key" and first["body"]["stream"] is False
+    assert first["body"]["messages"][0] == {"role": "system", "content": SYSTEM_PROMPT}
+
+
+def test_streaming_relays_server_sent_events(upstream, chat_client):
+    with chat_client() as c:
+        with c.stream("POST", "/api/ai-chat", json=_ask("a b c", stream=True)) as r:
+            assert r.status_code == 200
+            assert r.headers["content-type"].startswith("text/event-stream")
+            events = [line[6:] for line in r.iter_lines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    text = "".join(json.loads(e)["choices"][0]["delta"]["content"] for e in events[:-1])
+    assert text == "echo: a b c"
+    assert upstream.calls[-1]["body"]["stream"] is True
+
+
+def test_cache_serves_identical_histories(upstream, chat_client, monkeypatch):
+    monkeypatch.setattr(server, "CHAT_CACHE_SIZE", 8)
+    hits = UPSTREAM.value(("cache_hit",))
+    with chat_client() as c:
+        with c.stream("POST", "/api/ai-chat", json=_ask("x y", stream=True)) as r:
+            list(r.iter_lines())
+        # The streamed miss was assembled and cached for buffered callers...
+        r = c.post("/api/ai-chat", json=_ask("x y"))
+        assert r.json()["choices"][0]["message"]["content"] == "echo: x y"
+        # ...and streamed callers get it replayed as one chunk
+        with c.stream("POST", "/api/ai-chat", json=_ask("x y", stream=True)) as r:
+            events = [line[6:] for line in r.iter_lines() if line.startswith("data: ")]
+        assert json.loads(events[0])["choices"][0]["delta"]["content"] == "echo: x y"
+        assert events[-1] == "[DONE]"
+        c.post("/api/ai-chat", json=_ask("other"))
+    assert len(upstream.calls) == 2
+    assert UPSTREAM.value(("cache_hit",)) == hits + 2
+
+
+def test_upstream_errors_map_to_http_errors(upstream, chat_client, monkeypatch):
+    with chat_client() as c:
+        assert c.post("/api/ai-chat", json=_ask("fail")).status_code == 503
+        assert c.post("/api/ai-chat", json=_ask("fail", stream=True)).status_code == 503
+
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    port = closed.getsockname()[1]
+    closed.close()
+    monkeypatch.setattr(server, "CHAT_UPSTREAM_URL", f"http://127.0.0.1:{port}/v1")
+    with chat_client() as c:
+        assert c.post("/api/ai-chat", json=_ask("hi")).status_code == 502
+        monkeypatch.delenv("CEREBRAS_API_KEY")
+        assert c.post("/api/ai-chat", json=_ask("hi")).status_code == 500
@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.ml.artifact import read_manifest
+from src.ml.compress import cap_depth, compare, compress, compress_estimator, main
+from src.ml.credit_model import CreditScoringModel
+from src.ml.synthetic import write_dataset
+
+
+def _walk(tree, x, depth):
+    node = 0
+    for _ in range(depth):
+        if tree.children_left[node] == -1:
+            break
+        go_left = x[tree.feature[node]] <= tree.threshold[node]
+        node = tree.children_left[node] if go_left else tree.children_right[node]
+    counts = tree.value[node, 0]
+    return counts / counts.sum()
+
+
+def _app(i):
+    from src.ml.credit_model import create_sample_application
+
+    return {**create_sample_application(), "grade": "ABCDEFG"[i % 7], "dti": float(i)}
+
+
+def test_depth_cap_matches_truncated_walk(trained_model):
+    est = trained_model.model
+    X = np.random.default_rng(0).uniform(0, 50, (100, est.n_features_in_)).astype(np.float32)
+    X[:, :-13] = X[:, :-13] > 25  # one-hot block
+    tree = est.estimators_[0].tree_
+    capped = cap_depth(tree, 4)
+    assert capped.max_depth == 4 and capped.node_count < tree.node_count
+    proba = capped.value[capped.apply(X), 0]
+    np.testing.assert_array_equal(proba / proba.sum(axis=1, keepdims=True),
+                                  [_walk(tree, x, 4) for x in X])
+
+    small = compress_estimator(est, n_trees=10, max_depth=4)
+    assert len(small.estimators_) == 10 and len(est.estimators_) == 100
+    assert est.estimators_[0].tree_ is tree  # source forest untouched
+    np.testing.assert_array_equal(compress_estimator(est).predict_proba(X), est.predict_proba(X))
+
+
+def test_compressed_artifact_loads_transparently(trained_model, tmp_path):
+    src = tmp_path / "model.pkl"
+    trained_model.save_model(str(src))
+
+    dst = tmp_path / "compact"
+    report = compress(str(src), str(dst), n_trees=30, max_depth=6, reps=3)
+    assert report["settings"]["quantized"] and report["delta"]["bytes_ratio"] < 0.5
+    assert read_manifest(str(dst))["compression"]["max_depth"] == 6
+
+    m = CreditScoringModel()
+    m.load_model(str(dst))  # float64 requested, stored precision wins
+    f = m.forest
+    assert f.precision == "float32" and f.n_trees == 30 and f.max_depth <= 6
+    assert f.feature.dtype == np.int16 and f.children.dtype == np.int32
+    assert isinstance(f.threshold.base, np.memmap)
+
+    expected = compress_estimator(trained_model.model, 30, 6)
+    X = trained_model.preprocess_many([_app(i) for i in range(50)])
+    np.testing.assert_allclose(m.predict_encoded(X), expected.predict_proba(X)[:, 1], atol=1e-6)
+    assert set(m.explain_prediction(_app(0))) == set(trained_model.feature_names)
+
+
+def test_quantization_alone_is_float32_close(trained_model, tmp_path):
+    src = tmp_path / "model.pkl"
+    trained_model.save_model(str(src))
+    compress(str(src), str(tmp_path / "q"), reps=1)
+    m = CreditScoringModel()
+    m.load_model(str(tmp_path / "q"))
+    rows = [_app(i) for i in range(100)]
+    np.testing.assert_allclose(m.predict_many(rows), trained_model.predict_many(rows), atol=1e-6)
+
+
+def test_cli_reports_quality_deltas(tmp_path, capsys):
+    data = tmp_path / "loans.csv"
+    write_dataset(str(data), 1500, seed=2)
+    src = tmp_path / "model.pkl"
+    m = CreditScoringModel()
+    m.train_from_csv(str(data), n_jobs=1)
+    m.save_model(str(src))
+
+    out = tmp_path / "report.json"
+    assert main([str(src), str(tmp_path / "small.pkl"), "--trees", "20", "--max-depth", "5",
+                 "--data", str(data), "--reps", "2", "--out", str(out)]) == 0
+    assert "decisions changed" in capsys.readouterr().out
+    report = json.loads(out.read_text())
+    assert report["compressed"]["n_trees"] == 20 and not report["settings"]["quantized"]
+    assert abs(report["delta"]["auc_delta"]) < 0.2
+    assert report["delta"]["auc_delta"] == pytest.approx(
+        report["compressed"]["auc"] - report["original"]["auc"])
+
+    assert report["delta"]["decision_thresholds"] == {"approve": 0.33, "reject": 0.67}
+
+    with pytest.raises(SystemExit):
+        main([str(src), str(tmp_path / "x")])
+
+
+def test_decisions_changed_uses_api_bands():
+    side = {"bytes": 1, "n_nodes": 1, "load_ms": 1.0, "latency_ms": {"row_1": 1.0},
+            "accuracy": 1.0, "auc": 1.0}
+    # 0.40 -> 0.45 stays CONDITIONAL across the 0.5 cutoff; 0.30 -> 0.35 leaves APPROVE
+    a = {**side, "_prob": np.array([0.40, 0.30, 0.90, 0.10])}
+    b = {**side, "_prob": np.array([0.60, 0.35, 0.95, 0.12])}
+    d = compare(a, b)
+    assert d["decisions_changed"] == 0.25
+    assert compare(a, b, (0.2, 0.5))["decisions_changed"] == 0.25  # 0.40 -> 0.60 rejects
@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.ml.credit_model import create_sample_application
+
+
+def _random_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n):
+        row = create_sample_application()
+        row["grade"] = rng.choice(list("ABCDEFGX"))
+        row["home_ownership"] = rng.choice(["RENT", "OWN", "MORTGAGE", "OTHER"])
+        row["purpose"] = rng.choice(["vacation", "debt_consolidation", "credit card", "car"])
+        row["dti"] = float(rng.uniform(0, 60))
+        row["payment_inc_ratio"] = float(rng.uniform(0, 25))
+        row["open_acc"] = int(rng.integers(0, 20))
+        row["revol_util"] = float(rng.uniform(0, 120))
+        rows.append(row)
+    return rows
+
+
+def test_encoder_matches_mapper_bitwise(trained_model):
+    rows = _random_rows(200)
+    expected = trained_model.preprocess_frame(rows).astype(np.float64)
+
+    assert np.array_equal(trained_model.preprocess_many(rows), expected)
+    for row, exp in zip(rows, expected):
+        assert np.array_equal(trained_model.preprocess(row)[0], exp)
+
+
+def test_encoder_writes_into_preallocated_buffer(trained_model):
+    enc = trained_model.encoder
+    rows = _random_rows(5, seed=1)
+    out = np.full((5, enc.n_features), 7.0)
+    enc.encode_many(rows, out=out)
+    assert np.array_equal(out, trained_model.preprocess_frame(rows))
+
+    row_buf = np.full((1, enc.n_features), 7.0)
+    enc.encode(rows[0], out=row_buf)
+    assert np.array_equal(row_buf, out[:1])
+    assert enc.n_features == len(trained_model.feature_names)
+
+
+def test_encode_columns_matches_rows(trained_model):
+    import pandas as pd
+    rows = _random_rows(200, seed=4)
+    frame = pd.DataFrame.from_records(rows)
+    expected = trained_model.preprocess_frame(rows).astype(np.float64)
+    assert np.array_equal(trained_model.encoder.encode_columns(frame), expected)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.ml.credit_model import create_sample_application
+
+
+def test_explain_many_matches_single_and_top_k(trained_model):
+    rows = [{**create_sample_application(), "dti": float(d)} for d in (5, 25, 45)]
+    batch = trained_model.explain_many(rows)
+    for row, expl in zip(rows, batch):
+        single = trained_model.explain_prediction(row)
+        assert list(single) == list(expl) == trained_model.feature_names
+        np.testing.assert_allclose(list(single.values()), list(expl.values()), atol=1e-12)
+
+    top = trained_model.explain_many(rows, top_k=3)
+    for full, t in zip(batch, top):
+        assert len(t) == 3
+        expected = sorted(full, key=lambda k: abs(full[k]), reverse=True)[:3]
+        assert list(t) == expected
+
+
+def test_explain_cache_reuses_rows(trained_model):
+    trained_model.enable_explain_cache(16)
+    try:
+        rows = [{**create_sample_application(), "dti": 12.0}] * 2
+        first = trained_model.explain_many(rows)
+        second = trained_model.explain_many(rows)
+        assert first == second
+        stats = trained_model.explain_cache.stats()
+        assert stats["size"] == 1 and stats["hits"] >= 2
+    finally:
+        trained_model.enable_explain_cache(0)
+
+
+def test_explain_endpoint_additivity(client):
+    r = client.post("/explain", json=create_sample_application())
+    assert r.status_code == 200, r.text
+    body = r.json()
+    total = body["base_value"] + sum(c["shap_value"] for c in body["contributions"])
+    assert total == pytest.approx(body["prob_default"], abs=1e-6)
+
+    r = client.post("/explain?top_k=2", json=create_sample_application())
+    contribs = r.json()["contributions"]
+    assert len(contribs) == 2
+    assert abs(contribs[0]["shap_value"]) >= abs(contribs[1]["shap_value"])
+
+
+def test_explain_batch_reports_invalid_records(client):
+    good = create_sample_application()
+    bad = {**good, "grade": "Z"}
+    r = client.post("/explain_batch?top_k=5", json=[good, bad, {**good, "dti": 30.0}])
+    assert r.status_code == 200, r.text
+    results = r.json()["results"]
+    assert [x["index"] for x in results] == [0, 1, 2]
+    assert results[1]["errors"] and results[1]["contributions"] is None
+    assert len(results[0]["contributions"]) == 5 and len(results[2]["contributions"]) == 5
+    single = client.post("/explain?top_k=5", json=good).json()
+    assert single["contributions"] == results[0]["contributions"]
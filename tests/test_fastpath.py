@@ -0,0 +1,74 @@
+import json
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+import src.api.server as server
+from src.api.fastpath import RowParser, compile_fields
+from src.ml.credit_model import create_sample_application
+
+
+def test_fast_check_accepts_plain_rows_and_defers_the_rest():
+    parser = RowParser(server.PredictIn)
+    row = {**create_sample_application(), "delinq_2yrs": 1.0, "dti": 3}
+    out = parser.fast(dict(row))
+    assert out["delinq_2yrs"] == 1 and type(out["delinq_2yrs"]) is int
+    assert out["dti"] == 3.0 and type(out["dti"]) is float
+    assert out == server.PredictIn.model_validate(row).model_dump()
+    for bad in ({"open_acc": "3"}, {"open_acc": True}, {"open_acc": 2.5}, {"open_acc": 1e20},
+                {"dti": -1.0},
+                {"short_emp": 2}, {"grade": "Z"}, {"purpose": 5}):
+        assert parser.fast({**row, **bad}) is None
+    assert parser.fast([row]) is None
+
+    class Count(BaseModel):
+        n: int
+
+    # pydantic refuses integral floats beyond int64 (int_parsing_size)
+    for n in (1e20, 2.0**63, -2.0**63):
+        assert RowParser(Count).fast({"n": n}) is None
+    assert RowParser(Count).fast({"n": -2.0**62}) == {"n": -2**62}
+
+
+def test_compile_fields_rejects_unsupported_models():
+    class WithDefault(BaseModel):
+        x: int = 1
+
+    class Nested(BaseModel):
+        x: Optional[int]
+
+    for model in (WithDefault, Nested):
+        with pytest.raises(ValueError):
+            compile_fields(model)
+
+
+@pytest.mark.parametrize("patch", [
+    {}, {"open_acc": "3"}, {"open_acc": True}, {"dti": 3}, {"delinq_2yrs": 2.0},
+    {"open_acc": 2.5}, {"dti": -1}, {"grade": "Z"}, {"home_ownership": None}, {"dti": None},
+    {"open_acc": 1e20},
+])
+def test_same_responses_as_predict(client, patch):
+    row = {k: v for k, v in {**create_sample_application(), **patch}.items() if v is not None}
+    slow, fast = client.post("/predict", json=row), client.post("/predict_fast", json=row)
+    assert (fast.status_code, fast.json()) == (slow.status_code, slow.json())
+    assert fast.headers["content-type"] == "application/json"
+
+
+@pytest.mark.parametrize("body,content_type", [
+    (b"{bad", "application/json"), (b"", "application/json"), (b"[1]", "application/json"),
+    (json.dumps(create_sample_application()).encode(), "text/plain"),
+    (json.dumps(create_sample_application()).encode(), "application/vnd.api+json"),
+])
+def test_same_body_handling_as_predict(client, body, content_type):
+    headers = {"content-type": content_type}
+    slow = client.post("/predict", content=body, headers=headers)
+    fast = client.post("/predict_fast", content=body, headers=headers)
+    assert (fast.status_code, fast.json()) == (slow.status_code, slow.json())
+
+
+def test_fast_route_is_instrumented(client):
+    client.post("/predict_fast", json=create_sample_application())
+    metrics = client.get("/metrics").text
+    for stage in ("validate", "predict_proba", "serialize"):
+        assert f'scoring_stage_duration_seconds_count{{route="/predict_fast",stage="{stage}"}}' in metrics
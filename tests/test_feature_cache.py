@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml import feature_cache
+from src.ml.credit_model import CreditScoringModel
+from src.ml.synthetic import write_dataset
+from src.utils.profiling import PhaseTimer
+
+
+@pytest.fixture()
+def loans_csv(tmp_path):
+    path = tmp_path / "loans.csv"
+    write_dataset(str(path), 1500, seed=5)
+    return path
+
+
+def _phases(timer):
+    return [r["phase"] for r in timer.report]
+
+
+def test_second_run_loads_cached_matrix(loans_csv, tmp_path):
+    cache = tmp_path / "cache"
+    first, t1 = CreditScoringModel(), PhaseTimer()
+    acc1 = first.train_from_csv(str(loans_csv), n_jobs=1, timer=t1, cache_dir=str(cache))
+    assert _phases(t1) == ["cache_load", "read", "encode", "cache_write", "fit", "evaluate"]
+
+    second, t2 = CreditScoringModel(), PhaseTimer()
+    acc2 = second.train_from_csv(str(loans_csv), n_jobs=1, timer=t2, cache_dir=str(cache))
+    assert _phases(t2) == ["cache_load", "fit", "evaluate"]
+    assert acc1 == acc2
+    assert second.feature_names == first.feature_names
+
+    rows = pd.read_csv(loans_csv)[first.features].head(100).to_dict("records")
+    np.testing.assert_array_equal(second.predict_many(rows), first.predict_many(rows))
+
+    # Legacy entry point shares the cache and the result
+    legacy = CreditScoringModel()
+    assert legacy.train_with_data(str(loans_csv), cache_dir=str(cache)) == acc1
+    assert len(list(cache.iterdir())) == 1
+
+
+def test_cached_arrays_are_mapped_column_major(loans_csv, tmp_path):
+    m = CreditScoringModel()
+    source = feature_cache.describe_source(str(loans_csv))
+    path = feature_cache.cache_path(str(tmp_path), source, m)
+    assert feature_cache.read_cache(path) is None
+
+    m.train_from_csv(str(loans_csv), n_jobs=1, cache_dir=str(tmp_path))
+    data = feature_cache.read_cache(path)
+    X = data["X_train"]
+    assert X.dtype == np.float32 and X.flags.f_contiguous and not X.flags.writeable
+    assert X.shape[1] == len(m.feature_names)
+    assert len(data["y_train"]) + len(data["y_test"]) == 1500
+    assert data["manifest"]["source"]["sha256"] == source["sha256"]
+    assert data["vocabularies"] == m.encoder.vocabularies()
+
+
+def test_key_tracks_source_contents_and_feature_config(loans_csv, tmp_path):
+    m = CreditScoringModel()
+    key = feature_cache.cache_path(str(tmp_path), feature_cache.describe_source(str(loans_csv)), m)
+
+    with open(loans_csv, "a") as f:
+        f.write("A,0.5,0,1,RENT,10.0,car,3.0,0,1,0,1,1,5,0,1,20.0,0\n")
+    changed = feature_cache.describe_source(str(loans_csv))
+    assert feature_cache.cache_path(str(tmp_path), changed, m) != key
+
+    m.numerical_cols = m.numerical_cols[:-1]
+    assert feature_cache.cache_path(str(tmp_path), changed, m) != \
+        feature_cache.cache_path(str(tmp_path), changed, CreditScoringModel())
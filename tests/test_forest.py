@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.ml.forest import FlatForest
+
+
+@pytest.fixture(scope="module")
+def design_matrix(trained_model):
+    rng = np.random.default_rng(7)
+    n, f = 2000, len(trained_model.feature_names)
+    X = rng.uniform(0, 1, (n, f))
+    X[:, :14] = rng.integers(0, 2, (n, 14))               # one-hot block
+    X[:, 14:] *= rng.choice([1, 10, 50, 100], f - 14)     # numeric ranges
+    return X
+
+
+def test_flat_forest_float64_matches_sklearn_exactly(trained_model, design_matrix):
+    forest = FlatForest.from_sklearn(trained_model.model)
+    expected = trained_model.model.predict_proba(design_matrix)[:, 1]
+    assert np.array_equal(forest.predict_positive(design_matrix), expected)
+    assert np.array_equal(forest.predict_positive(design_matrix[:1]), expected[:1])
+
+
+def test_flat_forest_float32_within_tolerance(trained_model, design_matrix):
+    forest = FlatForest.from_sklearn(trained_model.model, precision="float32")
+    expected = trained_model.model.predict_proba(design_matrix)[:, 1]
+    got = forest.predict_positive(design_matrix)
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, expected, atol=1e-5)
+
+
+def test_flat_forest_leaves_match_sklearn_apply(trained_model, design_matrix):
+    forest = FlatForest.from_sklearn(trained_model.model)
+    leaves = forest.apply(design_matrix[:50]) - forest.roots[:, None]
+    assert np.array_equal(leaves, trained_model.model.apply(design_matrix[:50]).T)
+
+
+def test_model_flat_backend(trained_model):
+    from src.ml.credit_model import create_sample_application
+    row = create_sample_application()
+    expected = trained_model.predict(row)
+    try:
+        trained_model.set_backend("flat")
+        assert trained_model.predict(row) == expected
+        assert trained_model.predict_many([row, row]).tolist() == [expected, expected]
+    finally:
+        trained_model.set_backend("sklearn")
+    with pytest.raises(ValueError):
+        trained_model.set_backend("onnx")
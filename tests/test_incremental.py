@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.ml.credit_model import CreditScoringModel
+from src.ml.incremental import main, retire
+
+
+@pytest.fixture()
+def model():
+    m = CreditScoringModel()
+    m.train_with_data()
+    return m
+
+
+@pytest.fixture(scope="module")
+def batch():
+    frame = CreditScoringModel()._create_synthetic_data().sample(1500, random_state=7)
+    frame.loc[frame.index[:150], "purpose"] = "wedding"        # unseen categories
+    frame.loc[frame.index[150:200], "home_ownership"] = "OTHER"
+    return frame
+
+
+def test_update_appends_trees_and_extends_vocabulary(model, batch):
+    rows = batch[model.features].head(200).to_dict("records")
+    rows = [dict(r, purpose="vacation", home_ownership="RENT") for r in rows]
+    before = model.predict_many(rows)
+
+    report = model.update_with_data(batch, n_trees=10, n_jobs=1)
+    assert report["added"] == 10 and report["n_trees"] == 110 and report["retired"] == 0
+    assert report["new_categories"] == {"home_ownership": ["OTHER"], "purpose": ["wedding"]}
+    assert 0.5 < report["accuracy"] <= 1.0
+    assert "purpose=wedding" in model.feature_names
+    assert model.model.n_features_in_ == len(model.feature_names) == model.encoder.n_features
+
+    # The original 100 trees score the wider encoding exactly as before
+    X = model.preprocess_many(rows)
+    old = np.mean([t.predict_proba(X)[:, 1] for t in model.model.estimators_[:100]], axis=0)
+    np.testing.assert_allclose(old, before, rtol=0, atol=1e-12)
+    assert model.predict(dict(rows[0], purpose="wedding")) >= 0.0
+
+    model.set_backend("flat")
+    np.testing.assert_array_equal(model.predict_many(rows), model.model.predict_proba(X)[:, 1])
+
+
+def test_retirement_policies(model, batch):
+    model.update_with_data(batch, n_trees=10, max_trees=50, n_jobs=1)
+    assert list(model.model.tree_generation_) == [0] * 40 + [1] * 10
+    model.update_with_data(batch, n_trees=10, max_age=0, n_jobs=1)
+    assert list(model.model.tree_generation_) == [2] * 10
+    assert model.model.n_estimators == 10
+    assert retire(model.model, max_trees=10) == 0
+
+    with pytest.raises(ValueError, match="max_trees"):
+        model.update_with_data(batch, n_trees=10, max_trees=5)
+    with pytest.raises(ValueError, match="every class"):
+        model.update_with_data(batch[batch["bad_loans"] == 0])
+
+
+def test_incremental_cli(model, batch, tmp_path, capsys):
+    src, data, out = tmp_path / "m.pkl", tmp_path / "batch.csv", tmp_path / "m2.pkl"
+    model.save_model(str(src))
+    batch.to_csv(data, index=False)
+    assert main([str(src), str(data), str(out), "--trees", "5", "--n-jobs", "1"]) == 0
+    assert "New purpose categories: wedding" in capsys.readouterr().out
+
+    updated = CreditScoringModel()
+    updated.load_model(str(out))
+    assert len(updated.model.estimators_) == 105
+    assert list(updated.model.tree_generation_) == [0] * 100 + [1] * 5
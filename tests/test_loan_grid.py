@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import src.api.server as server
+from src.api.server import monthly_payment
+from src.ml.credit_model import create_sample_application
+
+
+def _grid(**kw):
+    return {**create_sample_application(), "loan_amount_min": 1_000, "loan_amount_max": 40_000,
+            "loan_amount_steps": 6, "terms": [36, 60], **kw}
+
+
+def test_monthly_payment_broadcasts():
+    amounts, terms = np.array([0.0, 5_000.0, 20_000.0]), np.array([[12], [36], [0]])
+    grid = monthly_payment(amounts, terms, 0.18)
+    assert grid.shape == (3, 3)
+    assert grid[2].tolist() == [0.0, 0.0, 0.0] and grid[:, 0].tolist() == [0.0, 0.0, 0.0]
+    assert grid[1, 2] == pytest.approx(20_000 * 0.015 / (1 - 1.015 ** -36))
+    assert monthly_payment(12_000.0, 12, 0.0) == 1_000.0
+    assert isinstance(monthly_payment(12_000.0, 12, 0.18), float)
+
+
+@pytest.mark.parametrize("income", [None, 6_000.0])
+def test_grid_matches_predict_loan(client, income):
+    body = _grid(monthly_income=income) if income else _grid()
+    r = client.post("/predict_loan_grid", json=body)
+    assert r.status_code == 200
+    out = r.json()
+    assert len(out["loan_amounts"]) == 6 and out["terms"] == [36, 60]
+    base = create_sample_application()
+    for i, term in enumerate(out["terms"]):
+        for j, amount in enumerate(out["loan_amounts"]):
+            single = client.post("/predict_loan", json={
+                **base, "loan_amount": amount, "term": term, "monthly_income": income}).json()
+            assert out["prob_default"][i][j] == single["prob_default"]
+            assert out["decision"][i][j] == single["decision"]
+
+
+def test_max_approvable_is_the_approved_prefix(client, monkeypatch):
+    # [term][amount]; the 36-month row approves again at 5 after a rejection at 3
+    probs = np.array([[0.1, 0.2, 0.3, 0.9, 0.1, 0.1],
+                      [0.1, 0.1, 0.1, 0.2, 0.3, 0.9]])
+    monkeypatch.setattr(server, "THRESH_APPROVE", 0.33)
+    monkeypatch.setattr(server.model, "predict_many", lambda rows: probs.ravel())
+    out = client.post("/predict_loan_grid", json=_grid()).json()
+    amounts = out["loan_amounts"]
+    assert out["max_approvable"] == [amounts[2], amounts[4]]
+    assert (out["max_approvable_amount"], out["max_approvable_term"]) == (amounts[4], 60)
+
+    monkeypatch.setattr(server, "THRESH_APPROVE", 0.05)
+    out = client.post("/predict_loan_grid", json=_grid()).json()
+    assert out["max_approvable"] == [None, None] and out["max_approvable_term"] is None
+
+
+def test_grid_validation(client, monkeypatch):
+    assert client.post("/predict_loan_grid",
+                       json=_grid(loan_amount_min=5_000, loan_amount_max=1_000)).status_code == 422
+    assert client.post("/predict_loan_grid", json=_grid(terms=[])).status_code == 422
+    assert client.post("/predict_loan_grid", json=_grid(terms=[0])).status_code == 422
+    monkeypatch.setattr(server, "MAX_BATCH_SIZE", 10)
+    assert client.post("/predict_loan_grid", json=_grid()).status_code == 413
+
+
+def test_grid_survives_float32_overflow(client):
+    assert client.post("/predict_loan_grid", json=_grid(loan_amount_max=1e300)).status_code == 422
+    for kw in ({"monthly_income": 1e-300}, {"loan_amount_max": 3e38, "terms": [1]}):
+        r = client.post("/predict_loan_grid", json=_grid(**kw))
+        assert r.status_code == 200
+        assert r.json()["decision"][0][-1] in ("CONDITIONAL", "REJECT")
@@ -0,0 +1,77 @@
+import time
+
+from src.utils.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_and_render():
+    reg = MetricsRegistry()
+    h = reg.histogram("lat_seconds", "latency", ("route",), buckets=(0.001, 0.01))
+    h.observe(("/a",), 500_000)        # 0.5 ms
+    h.observe(("/a",), 5_000_000)      # 5 ms
+    h.observe(("/a",), 50_000_000)     # 50 ms
+    snap = h.snapshot(("/a",))
+    assert snap["count"] == 3
+    assert list(snap["buckets"].values()) == [1, 2, 3]
+    assert abs(snap["sum"] - 0.0555) < 1e-12
+
+    text = reg.render()
+    assert 'lat_seconds_bucket{route="/a",le="0.001"} 1' in text
+    assert 'lat_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'lat_seconds_count{route="/a"} 3' in text
+
+
+def test_observe_overhead_is_small():
+    h = Histogram("x", "x", ("stage",))
+    labels = ("preprocess",)
+    n = 100_000
+    t0 = time.perf_counter()
+    for i in range(n):
+        h.observe(labels, i)
+    per_call = (time.perf_counter() - t0) / n
+    assert per_call < 2e-6  # generous bound; typically a few hundred ns
+
+
+def test_metrics_endpoint(client):
+    payload = {
+        "delinq_2yrs": 0, "delinq_2yrs_zero": 1, "dti": 12, "emp_length_num": 1,
+        "grade": "C", "home_ownership": "RENT", "inq_last_6mths": 1,
+        "last_delinq_none": 1, "last_major_derog_none": 1, "open_acc": 3,
+        "payment_inc_ratio": 5, "pub_rec": 0, "pub_rec_zero": 1, "purpose": "car",
+        "revol_util": 20, "short_emp": 0, "sub_grade_num": 5,
+    }
+    client.post("/predict", json={**payload, "revol_util": 21.5})
+    client.post("/predict", json={**payload, "grade": "Q"})
+    text = client.get("/metrics").text
+
+    assert 'http_requests_total{route="/predict",method="POST",status="200"}' in text
+    assert 'http_requests_total{route="/predict",method="POST",status="422"}' in text
+    assert 'http_request_errors_total{route="/predict",kind="client"}' in text
+    assert 'http_request_duration_seconds_count{route="/predict"}' in text
+    for stage in ("validate", "preprocess", "predict_proba", "serialize"):
+        assert f'scoring_stage_duration_seconds_count{{route="/predict",stage="{stage}"}}' in text
+
+
+def test_streamed_latency_covers_the_body():
+    import asyncio
+
+    from fastapi import FastAPI
+    from starlette.responses import StreamingResponse
+    from starlette.testclient import TestClient
+
+    from src.api.instrumentation import LATENCY, InstrumentedRoute
+
+    app = FastAPI()
+    app.router.route_class = InstrumentedRoute
+
+    @app.get("/slow_stream")
+    async def slow_stream():
+        async def body():
+            for _ in range(3):
+                await asyncio.sleep(0.1)
+                yield b"x"
+        return StreamingResponse(body())
+
+    with TestClient(app) as c:
+        assert c.get("/slow_stream").content == b"xxx"
+    snap = LATENCY.snapshot(("/slow_stream",))
+    assert snap["count"] == 1 and snap["sum"] >= 0.3
@@ -0,0 +1,77 @@
+def _payload(**overrides):
+    payload = {
+        "delinq_2yrs": 0,
+        "delinq_2yrs_zero": 1,
+        "dti": 10,
+        "emp_length_num": 1,
+        "grade": "B",
+        "home_ownership": "RENT",
+        "inq_last_6mths": 1,
+        "last_delinq_none": 1,
+        "last_major_derog_none": 1,
+        "open_acc": 3,
+        "payment_inc_ratio": 5,
+        "pub_rec": 0,
+        "pub_rec_zero": 1,
+        "purpose": "credit card",
+        "revol_util": 20,
+        "short_emp": 0,
+        "sub_grade_num": 5,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_predict_batch_matches_single(client):
+    rows = [_payload(), _payload(grade="G", dti=45, revol_util=95), _payload(grade="A")]
+    r = client.post("/predict_batch", json=rows)
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [res["index"] for res in results] == [0, 1, 2]
+
+    for row, res in zip(rows, results):
+        single = client.post("/predict", json=row).json()
+        assert res["prob_default"] == single["prob_default"]
+        assert res["decision"] == single["decision"]
+
+
+def test_predict_batch_reports_row_errors(client):
+    rows = [_payload(), _payload(grade="Z"), {"dti": -1}, _payload(dti=30)]
+    r = client.post("/predict_batch", json=rows)
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert len(results) == 4
+
+    assert results[0]["errors"] is None and results[0]["decision"] is not None
+    assert results[1]["prob_default"] is None
+    assert any(e["loc"] == ["grade"] for e in results[1]["errors"])
+    assert results[2]["errors"]
+    assert 0.0 <= results[3]["prob_default"] <= 1.0
+
+
+def test_predict_batch_rejects_non_finite_rows(client):
+    import json
+
+    good = json.dumps(_payload())
+    body = f'[{good}, {good[:-1]}, "dti": 1e999}}, {good}]'
+    r = client.post("/predict_batch", content=body, headers={"content-type": "application/json"})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results[1]["prob_default"] is None
+    assert results[1]["errors"][0]["loc"] == ["dti"]
+    assert results[1]["errors"][0]["type"] == "finite_number"
+    assert results[0]["prob_default"] == results[2]["prob_default"] is not None
+
+    # Finite but past float32/int64: a row error, not a 500 for the batch
+    huge = [{**_payload(), "dti": 1e308}, {**_payload(), "open_acc": 10**40}]
+    r = client.post("/predict_batch", json=[_payload(), *huge])
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results[0]["prob_default"] is not None
+    assert [res["errors"][0]["loc"] for res in results[1:]] == [["dti"], ["open_acc"]]
+    assert {res["errors"][0]["type"] for res in results[1:]} == {"less_than_equal"}
+
+    single = client.post("/predict", content=f'{good[:-1]}, "dti": 1e999}}',
+                         headers={"content-type": "application/json"})
+    assert single.status_code == 422
+    assert single.json()["detail"][0]["input"] == "inf"
@@ -0,0 +1,122 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+from starlette.testclient import TestClient
+
+import src.api.server as server
+from src.api.prefork import WorkerTable, available_cpus, private_and_shared_kb
+from src.ml.credit_model import create_sample_application
+
+
+def test_worker_table_is_shared_across_fork():
+    table = WorkerTable(2)
+    pid = os.fork()
+    if pid == 0:
+        table.claim(1, generation=3)
+        table.set_state(1, "ready")
+        table.beat(1, requests=7)
+        os._exit(0)
+    os.waitpid(pid, 0)
+    (row,) = table.snapshot()
+    assert row["slot"] == 1 and row["pid"] == pid and row["generation"] == 3
+    assert row["state"] == "ready" and row["requests"] == 7
+
+
+def test_private_and_shared_kb():
+    mem = private_and_shared_kb()
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        pytest.skip("no smaps_rollup")
+    assert mem["private_kb"] > 0
+    assert private_and_shared_kb(2 ** 30) == {"private_kb": 0, "shared_kb": 0}
+
+
+def test_available_cpus_honours_cgroup_quota(tmp_path):
+    affinity = len(os.sched_getaffinity(0))
+    assert available_cpus(str(tmp_path)) == affinity            # no cgroup files
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert available_cpus(str(tmp_path)) == affinity
+    (tmp_path / "cpu.max").write_text("50000 100000\n")        # half a CPU -> 1
+    assert available_cpus(str(tmp_path)) == 1
+    (tmp_path / "cpu.max").unlink()
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert available_cpus(str(tmp_path)) == affinity
+
+
+def test_workers_route_outside_prefork():
+    with TestClient(server.app) as c:
+        body = c.get("/workers").json()
+    assert body["prefork"] is False and body["workers"] == []
+
+
+def _get(port, path):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=10) as r:
+        return json.loads(r.read())
+
+
+def _wait_for(port, check, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            table = _get(port, "/workers")["workers"]
+            if check(table):
+                return table
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise AssertionError("prefork workers did not reach the expected state")
+
+
+def test_prefork_serves_and_restarts_workers():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.api.prefork", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", "2", "--heartbeat-interval", "0.2", "--log-level", "warning"],
+        env={**os.environ, "PYTHONPATH": ".", "ADMIN_TOKEN": "t0ken"}, start_new_session=True,
+    )
+    try:
+        ready = lambda gen: lambda t: len(t) == 2 and all(
+            w["state"] == "ready" and w["generation"] == gen for w in t)
+        first = _wait_for(port, ready(0))
+        assert all(w["heartbeat_age_s"] < 5 for w in first)
+
+        req = urllib.request.Request(
+            f"http://127.0.0.1:{port}/predict", json.dumps(create_sample_application()).encode(),
+            {"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=10) as r:
+            assert "prob_default" in json.loads(r.read())
+
+        # Worker crash: the parent replaces it
+        os.kill(first[0]["pid"], signal.SIGKILL)
+        after_crash = _wait_for(port, lambda t: ready(0)(t) and first[0]["pid"] not in
+                                {w["pid"] for w in t})
+
+        # SIGHUP: rolling restart onto a new generation
+        proc.send_signal(signal.SIGHUP)
+        second = _wait_for(port, ready(1))
+        assert not {w["pid"] for w in second} & {w["pid"] for w in after_crash}
+
+        # /admin/reload on a worker is forwarded to the parent as a rolling restart
+        with urllib.request.urlopen(urllib.request.Request(
+                f"http://127.0.0.1:{port}/admin/reload", b"", {"X-Admin-Token": "t0ken"},
+                method="POST"), timeout=10) as r:
+            assert r.status == 202 and json.loads(r.read())["state"] == "rolling_restart"
+        _wait_for(port, ready(2))
+
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(60) == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
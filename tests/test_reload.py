@@ -0,0 +1,132 @@
+import copy
+import threading
+import time
+
+import src.api.server as server
+from src.api.reload import ModelReloader, model_fingerprint
+from src.ml.credit_model import CreditScoringModel, create_sample_application
+
+
+def _smaller_model(trained_model, n_trees=10):
+    m = copy.deepcopy(trained_model)
+    m.model.estimators_ = m.model.estimators_[:n_trees]
+    m.model.n_estimators = n_trees
+    return m
+
+
+def _load(path):
+    m = CreditScoringModel()
+    m.load_model(path)
+    return m
+
+
+def test_reloader_polls_and_swaps(trained_model, tmp_path):
+    path = str(tmp_path / "credit_model.pkl")
+    trained_model.save_model(path)
+
+    swapped = []
+    r = ModelReloader(path, _load, swapped.append, poll_seconds=0.05)
+    r.version = model_fingerprint(path)
+    r.start()
+    try:
+        _smaller_model(trained_model).save_model(path)
+        deadline = time.time() + 10
+        while not swapped and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        r.stop()
+
+    assert len(swapped) == 1
+    assert len(swapped[0].model.estimators_) == 10
+    assert swapped[0].version == model_fingerprint(path) == r.version
+    assert r.status["state"] == "reloaded"
+
+
+def test_reloader_keeps_old_model_on_failure(trained_model, tmp_path):
+    path = tmp_path / "credit_model.pkl"
+    trained_model.save_model(str(path))
+    swapped = []
+    r = ModelReloader(str(path), _load, swapped.append)
+    r.version = model_fingerprint(str(path))
+
+    assert r.reload(force=False, wait=True)["state"] == "unchanged"
+    path.write_bytes(b"not a model")
+    status = r.reload(wait=True)
+    assert status["state"] == "failed" and status["error"]
+    assert swapped == []
+
+
+def test_reloader_runs_one_reload_at_a_time(trained_model, tmp_path):
+    path = str(tmp_path / "credit_model.pkl")
+    trained_model.save_model(path)
+    started, release, loads = threading.Event(), threading.Event(), []
+
+    def slow_load(p):
+        loads.append(p)
+        started.set()
+        release.wait(10)
+        return _load(p)
+
+    r = ModelReloader(path, slow_load, lambda m: None)
+    assert r.reload()["state"] == "reloading"
+    assert started.wait(10)
+    assert [r.reload()["state"] for _ in range(5)] == ["busy"] * 5
+
+    waited = []
+    waiter = threading.Thread(target=lambda: waited.append(r.reload(wait=True)))
+    waiter.start()
+    time.sleep(0.1)
+    assert not waited  # queued behind the running reload
+    release.set()
+    waiter.join(10)
+    assert waited[0]["state"] == "reloaded" and len(loads) == 2
+
+
+def test_admin_endpoints_need_a_token(client, monkeypatch):
+    monkeypatch.setattr(server, "ADMIN_TOKEN", None)
+    assert client.post("/admin/reload").status_code == 403
+    monkeypatch.setattr(server, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/admin/reload").status_code == 403
+    assert client.get("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/reload", headers={"X-Admin-Token": "s3cret"}).status_code == 200
+
+
+def test_admin_reload_endpoint_and_version_header(client, monkeypatch):
+    monkeypatch.setattr(server, "ADMIN_TOKEN", "s3cret")
+    admin = {"X-Admin-Token": "s3cret"}
+    payload = {**create_sample_application(), "sub_grade_num": 1, "emp_length_num": 0}
+    before = client.post("/predict", json=payload)
+    version = before.headers["X-Model-Version"]
+    assert version
+    assert client.get("/healthz").headers["X-Model-Version"] == version
+
+    r = client.post("/admin/reload?wait=true&force=true", headers=admin)
+    assert r.status_code == 200
+    assert r.json()["state"] == "reloaded"
+
+    after = client.post("/predict", json=payload)
+    assert after.headers["X-Model-Version"] == version
+    assert after.json() == before.json()
+    assert client.get("/admin/reload", headers=admin).json()["current_version"] == version
+
+
+def test_reloader_poll_retries_while_busy(trained_model, tmp_path):
+    path = str(tmp_path / "credit_model.pkl")
+    trained_model.save_model(path)
+    swapped = []
+    r = ModelReloader(path, _load, swapped.append, poll_seconds=0.05)
+    r.version = model_fingerprint(path)
+
+    r._lock.acquire()  # a manual reload is running
+    r.start()
+    try:
+        _smaller_model(trained_model).save_model(path)
+        time.sleep(0.3)
+        assert swapped == []
+        r._lock.release()
+        deadline = time.time() + 10
+        while not swapped and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        r.stop()
+    assert len(swapped) == 1 and r.version == model_fingerprint(path)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.score import decide, score_file
+
+
+@pytest.fixture(scope="module")
+def portfolio(trained_model, tmp_path_factory):
+    root = tmp_path_factory.mktemp("score")
+    model_path = root / "model.pkl"
+    trained_model.save_model(str(model_path))
+    frame = trained_model._create_synthetic_data().head(53).drop(columns="bad_loans")
+    frame.insert(0, "loan_id", np.arange(len(frame)) + 1000)
+    frame.loc[5, "dti"] = np.nan          # incomplete row
+    frame.loc[7, "purpose"] = "boat"      # unknown category still scores
+    path = root / "loans.csv"
+    frame.to_csv(path, index=False)
+    return model_path, path, frame
+
+
+def test_score_file_matches_model(trained_model, portfolio, tmp_path):
+    model_path, path, frame = portfolio
+    out = tmp_path / "scores.csv"
+    seen = []
+    report = score_file(str(path), str(out), str(model_path), chunk_size=7,
+                        passthrough=["loan_id"], approve=0.3, reject=0.7,
+                        progress=lambda r: seen.append(r["rows"]))
+    assert report["rows"] == 53 and report["scored"] == 52 and report["chunks"] == 8
+    assert seen[-1] == 53 and report["rows_per_sec"] > 0
+
+    scores = pd.read_csv(out)
+    assert list(scores.columns) == ["loan_id", "prob_default", "decision"]
+    assert scores["loan_id"].tolist() == frame["loan_id"].tolist()
+    assert np.isnan(scores.loc[5, "prob_default"]) and pd.isna(scores.loc[5, "decision"])
+
+    complete = frame.drop(index=5)
+    expected = trained_model.predict_many(complete[trained_model.features].to_dict("records"))
+    got = scores.drop(index=5)
+    np.testing.assert_allclose(got["prob_default"], expected, rtol=0, atol=1e-12)
+    assert got["decision"].tolist() == decide(expected, 0.3, 0.7).tolist()
+
+
+def test_score_file_process_pool_keeps_order(portfolio, tmp_path):
+    model_path, path, _ = portfolio
+    single, pooled = tmp_path / "a.csv", tmp_path / "b.csv"
+    score_file(str(path), str(single), str(model_path), chunk_size=10)
+    score_file(str(path), str(pooled), str(model_path), chunk_size=10, workers=2)
+    assert single.read_text() == pooled.read_text()
+
+
+def test_decide_boundaries():
+    probs = np.array([0.33, 0.3300001, 0.66999, 0.67])
+    assert decide(probs, 0.33, 0.67).tolist() == ["APPROVE", "CONDITIONAL", "CONDITIONAL", "REJECT"]
+
+
+def test_score_file_parquet_round_trip(portfolio, tmp_path):
+    pytest.importorskip("pyarrow")
+    model_path, path, frame = portfolio
+    src = tmp_path / "loans.parquet"
+    frame.to_parquet(src, index=False)
+    csv_out, pq_out = tmp_path / "scores.csv", tmp_path / "scores.parquet"
+    score_file(str(path), str(csv_out), str(model_path), chunk_size=10, passthrough=["loan_id"])
+    report = score_file(str(src), str(pq_out), str(model_path), chunk_size=10,
+                        passthrough=["loan_id"])
+    assert report["rows"] == 53 and report["chunks"] == 6
+    pd.testing.assert_frame_equal(pd.read_parquet(pq_out), pd.read_csv(csv_out),
+                                  check_dtype=False)
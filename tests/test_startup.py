@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_serving_path_does_not_import_shap(trained_model, tmp_path):
+    model_path = tmp_path / "credit_model.pkl"
+    trained_model.save_model(str(model_path))
+
+    code = (
+        "import json, sys\n"
+        "from starlette.testclient import TestClient\n"
+        "from src.api.server import app, STARTUP_TIMINGS\n"
+        "with TestClient(app) as c:\n"
+        "    c.get('/healthz')\n"
+        "print(json.dumps({'shap': 'shap' in sys.modules, 'timings': STARTUP_TIMINGS}))\n"
+    )
+    env = {**os.environ, "MODEL_PATH": str(model_path), "PYTHONPATH": ROOT}
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["shap"] is False
+    assert result["timings"]["model_load_ms"] > 0
+    assert result["timings"]["import_ms"] > 0
+
+
+def test_explainer_built_lazily(trained_model):
+    from src.ml.credit_model import create_sample_application
+    expl = trained_model.explain_prediction(create_sample_application())
+    assert set(expl) == set(trained_model.feature_names)
+
+
+def test_legacy_pickle_with_shap_explainer_loads_without_shap(trained_model, tmp_path):
+    import joblib
+    import shap
+
+    model_path = tmp_path / "legacy.pkl"
+    joblib.dump({
+        "model": trained_model.model, "mapper": trained_model.mapper,
+        "explainer": shap.TreeExplainer(trained_model.model),
+        "features": trained_model.features, "numerical_cols": trained_model.numerical_cols,
+        "categorical_cols": trained_model.categorical_cols,
+        "feature_names": trained_model.feature_names,
+    }, model_path)
+
+    code = (
+        "import json, sys\n"
+        "from src.ml.credit_model import CreditScoringModel, create_sample_application\n"
+        "m = CreditScoringModel()\n"
+        f"m.load_model({str(model_path)!r})\n"
+        "print(json.dumps({'shap': 'shap' in sys.modules,\n"
+        "                  'prob': m.predict(create_sample_application())}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env={**os.environ, "PYTHONPATH": ROOT},
+        capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["shap"] is False
+    from src.ml.credit_model import create_sample_application
+    assert result["prob"] == trained_model.predict(create_sample_application())
+
+
+def test_pickle_loader_fits_joblib_internals(trained_model, tmp_path, monkeypatch):
+    import inspect
+
+    import numpy as np
+    from joblib import numpy_pickle
+
+    from src.ml.credit_model import _load_pickle
+
+    # _load_pickle skips shap through these; a joblib upgrade that changes them fails here
+    assert list(inspect.signature(numpy_pickle.NumpyUnpickler.__init__).parameters) == [
+        "self", "filename", "file_handle", "mmap_mode"]
+    assert list(inspect.signature(numpy_pickle._read_fileobject).parameters) == [
+        "fileobj", "filename", "mmap_mode"]
+
+    model_path = str(tmp_path / "credit_model.pkl")
+    trained_model.save_model(model_path)
+
+    class NewerUnpickler(numpy_pickle.NumpyUnpickler):
+        # A changed constructor for _load_pickle's subclass; joblib.load's own call still fits
+        def __init__(self, filename, file_handle, *args, **kwargs):
+            if type(self) is not NewerUnpickler:
+                raise TypeError("missing required argument: 'ensure_native_byte_order'")
+            super().__init__(filename, file_handle, *args, **kwargs)
+
+    monkeypatch.setattr(numpy_pickle, "NumpyUnpickler", NewerUnpickler)
+    data = _load_pickle(model_path)  # falls back to joblib.load
+    X = np.zeros((1, data["model"].n_features_in_))
+    assert np.array_equal(data["model"].predict_proba(X), trained_model.model.predict_proba(X))
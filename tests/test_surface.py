@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.api.server import SIMPLE_GRADES, _simple_features
+from src.ml.surface import RatioSurface
+
+
+def _probe_ratios(surface, n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    bps = np.array(surface.breakpoints)
+    picks = rng.choice(bps, n)
+    ratios = list(rng.uniform(0, 120, n)) + [0.0, 1e9]
+    for t in picks:   # exactly on, just below and just above split thresholds
+        ratios += [float(t), float(np.nextafter(t, -np.inf)), float(np.nextafter(t, np.inf)),
+                   float(np.float32(t))]
+    return ratios
+
+
+@pytest.mark.parametrize("backend,precision", [("sklearn", "float64"), ("flat", "float32")])
+def test_surface_is_exact(trained_model, backend, precision):
+    trained_model.set_backend(backend, precision)
+    try:
+        surface = RatioSurface.build(
+            trained_model, _simple_features, SIMPLE_GRADES, ["dti", "payment_inc_ratio"]
+        )
+        ratios = _probe_ratios(surface)
+        for grade in SIMPLE_GRADES:
+            rows = [_simple_features(grade, r) for r in ratios]
+            expected = trained_model.predict_encoded(trained_model.preprocess_many(rows))
+            got = [surface.lookup(grade, r) for r in ratios]
+            assert got == [float(v) for v in expected]
+        assert surface.lookup("Z", 1.0) is None
+    finally:
+        trained_model.set_backend("sklearn")
+
+
+def test_surface_matches_single_predict(trained_model):
+    surface = RatioSurface.build(
+        trained_model, _simple_features, SIMPLE_GRADES, ["dti", "payment_inc_ratio"]
+    )
+    for grade, ratio in [("A", 3.3), ("C", 20.0), ("G", 47.25), ("B", 0.0)]:
+        assert surface.lookup(grade, ratio) == trained_model.predict(_simple_features(grade, ratio))
@@ -0,0 +1,86 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.ml.credit_model import CreditScoringModel
+from src.ml.sweep import (
+    SharedArrays, candidates, halving_schedule, main, pareto_front, parse_grid, run_sweep,
+)
+from src.ml.synthetic import write_dataset
+
+
+@pytest.fixture(scope="module")
+def loans_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp("sweep") / "loans.csv"
+    write_dataset(str(path), 1200, seed=11)
+    return path
+
+
+def test_search_space_and_schedule():
+    grid = parse_grid(["max_depth=4,8,None", "max_features=sqrt,0.5"])
+    assert grid == {"max_depth": [4, 8, None], "max_features": ["sqrt", 0.5]}
+    assert len(candidates(grid)) == 6
+    sample = candidates(grid, n_random=4, seed=1)
+    assert len(sample) == 4 and all(c in candidates(grid) for c in sample)
+    with pytest.raises(ValueError, match="Unknown forest parameters"):
+        candidates({"depth": [1]})
+
+    assert halving_schedule(9, 10, 90, eta=3) == [(10, 9), (30, 3), (90, 1)]
+    assert halving_schedule(1, 10, 90) == [(90, 1)]
+
+
+def test_pareto_front():
+    def r(auc, ms, size):
+        return {"auc": auc, "latency_ms": {"flat_1": ms}, "size": {"pickle_bytes": size}}
+
+    results = [r(0.90, 1.0, 100), r(0.95, 2.0, 200), r(0.89, 1.5, 150), r(0.95, 2.0, 100)]
+    assert pareto_front(results) == [0, 3]
+
+
+def _sum_shared(spec):
+    arrays, handles = SharedArrays.attach(spec)
+    total = float(arrays["X"].sum()), bool(arrays["X"].flags.f_contiguous)
+    for h in handles:
+        h.close()
+    return total
+
+
+def test_shared_arrays_visible_to_workers():
+    X = np.asfortranarray(np.arange(12, dtype=np.float32).reshape(4, 3))
+    with SharedArrays({"X": X, "y": np.arange(4, dtype=np.int8)}) as shared:
+        with ProcessPoolExecutor(1) as pool:
+            assert pool.submit(_sum_shared, shared.spec()).result() == (66.0, True)
+
+
+@pytest.mark.parametrize("workers,resource", [(2, "trees"), (1, "data")])
+def test_run_sweep_prunes_and_measures(loans_csv, workers, resource):
+    configs = candidates(parse_grid(["max_depth=2,6,None", "min_samples_leaf=1,10"]))
+    budgets = (2, 6) if resource == "trees" else (0.4, 1.0)
+    report = run_sweep(CreditScoringModel(), str(loans_csv), configs, workers=workers,
+                       resource=resource, min_resource=budgets[0], max_resource=budgets[1],
+                       eta=3, cv=2)
+    assert [r["configs"] for r in report["schedule"]] == [6, 2]
+    pruned = [c for c in report["configs"] if c["pruned_at"] is not None]
+    assert len(pruned) == 4 and all(len(c["rungs"]) == 1 for c in pruned)
+
+    finals = [c["final"] for c in report["configs"] if "final" in c]
+    assert len(finals) == 3
+    for f in finals:
+        assert 0.5 < f["auc"] <= 1.0 and 0.0 < f["accuracy"] <= 1.0
+        assert f["latency_ms"]["flat_1"] > 0 and f["size"]["pickle_bytes"] > 0
+        if resource == "trees":
+            assert f["params"]["n_estimators"] == 6 and f["size"]["n_trees"] == 6
+    assert report["best"]["auc"] == max(f["auc"] for f in finals)
+    assert report["frontier"] and set(report["frontier"]) <= {f["index"] for f in finals}
+
+
+def test_sweep_cli_saves_best(loans_csv, tmp_path, capsys):
+    out, best = tmp_path / "sweep.json", tmp_path / "best.pkl"
+    assert main([str(loans_csv), "--grid", "max_depth=3,None", "--min-resource", "2",
+                 "--max-resource", "4", "--cv", "2", "--out", str(out),
+                 "--save-best", str(best)]) == 0
+    assert "cost/quality frontier" in capsys.readouterr().out
+    m = CreditScoringModel()
+    m.load_model(str(best))
+    assert len(m.model.estimators_) == 4
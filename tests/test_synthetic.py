@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.synthetic import COLUMNS, chunk_rng, generate, generate_chunk, main, write_dataset
+
+
+def test_chunks_are_reproducible_and_independent():
+    full = generate(2500, seed=7, chunk_size=1000)
+    assert len(full) == 2500 and list(full.columns) == COLUMNS
+    # Chunk 2 regenerated on its own is the tail of the full run
+    tail = generate_chunk(500, chunk_rng(7, 2))
+    pd.testing.assert_frame_equal(full.iloc[2000:].reset_index(drop=True), tail)
+    assert not generate(2500, seed=8, chunk_size=1000).equals(full)
+
+
+def test_compact_dtypes_and_plain_frames():
+    compact = generate(1000, profile="lending")
+    assert str(compact["purpose"].dtype) == "category"
+    assert compact["short_emp"].dtype == np.int8 and compact["open_acc"].dtype == np.int16
+    assert compact["dti"].dtype == np.float32
+    assert set(compact["purpose"].cat.categories) == {
+        "car", "credit_card", "debt_consolidation", "home_improvement", "medical", "small_business"
+    }
+    assert 0.05 < compact["bad_loans"].mean() < 0.95
+
+    plain = generate(1000, profile="lending", compact=False)
+    assert plain["purpose"].dtype == object and plain["dti"].dtype == np.float64
+    assert plain["open_acc"].dtype == np.int64
+    np.testing.assert_array_equal(plain["dti"], compact["dti"].astype(np.float64))
+    assert (plain["purpose"] == compact["purpose"].astype(object)).all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_write_dataset_same_rows_for_any_worker_count(tmp_path, workers):
+    expected = generate(2300, seed=3, chunk_size=500, compact=False)
+
+    single = tmp_path / "loans.csv"
+    report = write_dataset(str(single), 2300, seed=3, chunk_size=500, workers=workers)
+    assert report["rows"] == 2300 and report["chunks"] == 5
+    got = pd.read_csv(single)
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False, atol=1e-5)
+
+    parts = tmp_path / "parts"
+    write_dataset(str(parts), 2300, seed=3, chunk_size=500, workers=workers, fmt="csv")
+    files = sorted(parts.iterdir())
+    assert [f.name for f in files] == [f"part-{i:05d}.csv" for i in range(5)]
+    pd.testing.assert_frame_equal(pd.concat(map(pd.read_csv, files), ignore_index=True), got)
+
+
+def test_cli_writes_trainable_csv(tmp_path, capsys):
+    out = tmp_path / "loans.csv"
+    assert main([str(out), "--rows", "1_200", "--chunk-size", "500", "--quiet"]) == 0
+    assert "Wrote 1,200 rows in 3 chunk(s)" in capsys.readouterr().out
+    from src.ml.credit_model import CreditScoringModel
+
+    assert 0.5 < CreditScoringModel().train_from_csv(str(out), n_jobs=1) <= 1.0
+
+
+def test_cli_directory_defaults_to_csv(tmp_path, capsys):
+    parts = tmp_path / "corpus"
+    assert main([str(parts), "--rows", "1_000", "--chunk-size", "500", "--quiet"]) == 0
+    assert sorted(f.name for f in parts.iterdir()) == ["part-00000.csv", "part-00001.csv"]
+
+
+def test_parquet_without_pyarrow_fails_clearly(tmp_path, capsys):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        pytest.skip("pyarrow is installed")
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "corpus"), "--rows", "10", "--format", "parquet", "--quiet"])
+    assert "needs pyarrow" in capsys.readouterr().err
+    assert not (tmp_path / "corpus").exists()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.ml.credit_model import CreditScoringModel
+from src.ml.training import main, read_training_csv
+from src.utils.profiling import PhaseTimer
+
+
+@pytest.fixture(scope="module")
+def loans_csv(tmp_path_factory):
+    frame = CreditScoringModel()._create_synthetic_data().head(1500).copy()
+    frame.insert(0, "member_id", np.arange(len(frame)))   # extra column, not read
+    frame.loc[3, "dti"] = np.nan
+    frame.loc[4, "open_acc"] = np.nan
+    frame.loc[5, "purpose"] = np.nan
+    path = tmp_path_factory.mktemp("train") / "loans.csv"
+    frame.to_csv(path, index=False)
+    return path, frame
+
+
+def test_read_training_csv_uses_compact_dtypes(loans_csv):
+    path, frame = loans_csv
+    m = CreditScoringModel()
+    data = read_training_csv(str(path), m)
+    assert len(data) == len(frame) - 3
+    assert list(data.columns) == m.features + ["bad_loans"]
+    assert str(data["grade"].dtype) == "category"
+    assert data["dti"].dtype == np.float32
+    assert str(data["short_emp"].dtype) == "Int8" and str(data["open_acc"].dtype) == "Int16"
+
+
+def test_train_from_csv_matches_legacy_training(loans_csv):
+    path, frame = loans_csv
+    legacy = CreditScoringModel()
+    acc_legacy = legacy.train_with_data(str(path))
+
+    compact = CreditScoringModel()
+    timer = PhaseTimer()
+    acc = compact.train_from_csv(str(path), n_jobs=2, timer=timer)
+
+    assert acc == acc_legacy
+    assert compact.feature_names == legacy.feature_names
+    assert compact.model.n_jobs is None
+    rows = frame.drop(index=[3, 4, 5])[legacy.features].head(200).to_dict("records")
+    np.testing.assert_array_equal(compact.predict_many(rows), legacy.predict_many(rows))
+    np.testing.assert_array_equal(compact.preprocess_frame(rows), legacy.preprocess_frame(rows))
+
+    assert [r["phase"] for r in timer.report] == ["read", "encode", "fit", "evaluate"]
+    assert all(r["seconds"] >= 0 and r["peak_rss_mb"] > 0 for r in timer.report)
+    assert "peak RSS MB" in timer.format()
+
+
+def test_training_cli(loans_csv, tmp_path, capsys):
+    path, _ = loans_csv
+    out = tmp_path / "model.pkl"
+    assert main([str(path), str(out), "--n-jobs", "1"]) == 0
+    assert "Holdout accuracy" in capsys.readouterr().out
+    m = CreditScoringModel()
+    m.load_model(str(out))
+    assert m.encoder is not None and m.is_trained
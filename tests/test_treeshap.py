@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.ml.forest import FlatForest
+from src.ml.treeshap import TreeShap
+
+
+@pytest.fixture(scope="module")
+def design_matrix(trained_model):
+    rng = np.random.default_rng(11)
+    n, f = 60, len(trained_model.feature_names)
+    X = rng.uniform(0, 1, (n, f))
+    X[:, :14] = rng.integers(0, 2, (n, 14))
+    X[:, 14:] *= rng.choice([1, 10, 50, 100], f - 14)
+    return X
+
+
+def test_treeshap_matches_shap(trained_model, design_matrix):
+    shap = pytest.importorskip("shap")
+    explainer = shap.TreeExplainer(trained_model.model)
+    expected = explainer.shap_values(design_matrix, check_additivity=False)[1]
+    native = TreeShap.from_sklearn(trained_model.model)
+    np.testing.assert_allclose(native.shap_values(design_matrix), expected, atol=1e-6)
+    np.testing.assert_allclose(native.shap_values(design_matrix[:1]), expected[:1], atol=1e-6)
+    assert native.expected_value == pytest.approx(explainer.expected_value[1], abs=1e-9)
+
+
+def test_treeshap_additivity_and_row_chunking(trained_model, design_matrix):
+    native = TreeShap.from_sklearn(trained_model.model, dtype=np.float32)
+    native.max_work = 1  # one row per chunk
+    phi = native.shap_values(design_matrix)
+    probs = trained_model.model.predict_proba(design_matrix)[:, 1]
+    np.testing.assert_allclose(phi.sum(axis=1) + native.expected_value, probs, atol=1e-6)
+
+
+def test_treeshap_requires_covers(trained_model):
+    arrays = FlatForest.from_sklearn(trained_model.model).to_arrays()
+    arrays.pop("cover")
+    forest = FlatForest.from_arrays(**arrays, max_depth=1, n_features=28)
+    with pytest.raises(ValueError):
+        TreeShap(forest)
+
+
+def test_model_explanations_use_native_treeshap(trained_model):
+    from src.ml.credit_model import create_sample_application
+    trained_model.explain_prediction(create_sample_application())
+    assert isinstance(trained_model.explainer, TreeShap)